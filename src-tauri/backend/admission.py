@@ -0,0 +1,214 @@
+"""
+EchoTranscribe Backend - Controle de admissão por memória
+Reserva a memória estimada de cada transcrição e segura as que não cabem no orçamento, em vez de levar a máquina ao swap
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+# Intervalo (segundos) entre as verificações de quem aguarda memória: a RSS
+# cai sem aviso (modelos despejados, coleta de lixo) e o cancelamento precisa ser visto
+WAIT_POLL_SECONDS = 0.5
+
+# Transcrições que cabem no orçamento passam à frente das que aguardam
+# memória, exceto das que já aguardam há mais que isso (evita que uma
+# transcrição grande espere para sempre atrás de uma sequência de pequenas)
+MAX_OVERTAKEN_SECONDS = 30.0
+
+
+def current_rss_bytes() -> Optional[int]:
+    """Memória residente do processo (None se não for possível medir)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().rss
+    except Exception:
+        return None
+
+
+def physical_memory_bytes() -> Optional[int]:
+    """Memória física total da máquina (None se não for possível medir)"""
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+
+        return psutil.virtual_memory().total
+    except Exception:
+        return None
+
+
+class Reservation:
+    """Memória reservada por uma transcrição, devolvida (uma única vez) por release()"""
+
+    def __init__(self, admission: "MemoryAdmission", nbytes: int, waited: float):
+        self.nbytes = nbytes
+        # Segundos aguardados até a admissão
+        self.waited = waited
+        self._admission = admission
+        self._released = False
+
+    def release(self):
+        self._admission._release(self)
+
+
+class MemoryAdmission:
+    """
+    Orçamento de memória (RSS) das transcrições em andamento.
+
+    Cada transcrição reserva a memória estimada antes de ir para um worker
+    e a devolve ao terminar. Uma reserva só é admitida se a memória prevista
+    (a maior entre a RSS atual e a RSS ociosa somada às reservas ativas,
+    mais a nova reserva) couber em `budget_bytes`; as demais aguardam no
+    event loop. As que cabem passam à frente das que aguardam, a menos que
+    alguma destas já espere há mais de MAX_OVERTAKEN_SECONDS. Sem nenhuma
+    reserva ativa a transcrição é sempre admitida, para que uma estimativa
+    maior que o orçamento não a bloqueie para sempre.
+
+    `budget_bytes=None` desativa o controle (as reservas só são contadas).
+    """
+
+    def __init__(
+        self,
+        budget_bytes: Optional[int],
+        rss: Callable[[], Optional[int]] = current_rss_bytes
+    ):
+        self.budget_bytes = budget_bytes
+        self._rss = rss
+        self._lock = threading.Lock()
+        self._reserved = 0
+        self._active = 0
+        # RSS medida sem nenhuma reserva ativa (pesos dos modelos, bibliotecas, caches)
+        self._idle_rss = rss() or 0
+        # (event loop, evento, início) de cada espera, por ordem de chegada
+        self._waiting: deque = deque()
+        self._admitted = 0
+        self._delayed = 0
+
+    def _projected_locked(self, rss: Optional[int]) -> int:
+        return max(rss or 0, self._idle_rss + self._reserved)
+
+    def _fits_locked(self, nbytes: int) -> bool:
+        if self.budget_bytes is None or self._active == 0:
+            return True
+        return self._projected_locked(self._rss()) + nbytes <= self.budget_bytes
+
+    def _may_enter_locked(self, waiter: tuple, nbytes: int) -> bool:
+        if not self._fits_locked(nbytes):
+            return False
+        now = time.monotonic()
+        for other in self._waiting:
+            if other is waiter:
+                return True
+            if now - other[2] > MAX_OVERTAKEN_SECONDS:
+                return False
+        return True
+
+    def _wake_locked(self):
+        """Acorda as esperas (as reservas são devolvidas nas threads do pool)"""
+        for loop, event, _ in self._waiting:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # Event loop já encerrado
+                pass
+
+    def has_room(self, nbytes: int) -> bool:
+        """Se `nbytes` caberiam agora no orçamento (sem reservar nem aguardar)"""
+        with self._lock:
+            if self.budget_bytes is None:
+                return True
+            return self._projected_locked(self._rss()) + nbytes <= self.budget_bytes
+
+    async def admit(
+        self,
+        nbytes: int,
+        check: Optional[Callable[[], None]] = None,
+        description: str = ""
+    ) -> Reservation:
+        """
+        Aguarda, sem bloquear o event loop nem ocupar um worker, até `nbytes`
+        caberem no orçamento e os reserva até Reservation.release(). `check`
+        é chamado a cada verificação e pode lançar uma exceção para desistir
+        da espera (cancelamento).
+        """
+        nbytes = max(0, int(nbytes))
+        started = time.monotonic()
+        waiter = (asyncio.get_running_loop(), asyncio.Event(), started)
+        logged = False
+        with self._lock:
+            self._waiting.append(waiter)
+        try:
+            while True:
+                waiter[1].clear()
+                if check is not None:
+                    check()
+                with self._lock:
+                    if self._may_enter_locked(waiter, nbytes):
+                        self._waiting.remove(waiter)
+                        if self._active == 0:
+                            self._idle_rss = self._rss() or self._idle_rss
+                        self._reserved += nbytes
+                        self._active += 1
+                        self._admitted += 1
+                        if logged:
+                            self._delayed += 1
+                        # Outra espera pode caber também
+                        self._wake_locked()
+                        break
+                    if not logged:
+                        logger.info(
+                            f"Aguardando memória para {description or 'transcrição'}: "
+                            f"{nbytes / 2**20:.0f} MB estimados, {self._reserved / 2**20:.0f} MB "
+                            f"reservados, orçamento de {self.budget_bytes / 2**20:.0f} MB"
+                        )
+                        logged = True
+                try:
+                    await asyncio.wait_for(waiter[1].wait(), WAIT_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+        except BaseException:
+            with self._lock:
+                self._waiting.remove(waiter)
+                self._wake_locked()
+            raise
+        return Reservation(self, nbytes, time.monotonic() - started)
+
+    def _release(self, reservation: Reservation):
+        with self._lock:
+            if reservation._released:
+                return
+            reservation._released = True
+            self._reserved -= reservation.nbytes
+            self._active -= 1
+            self._wake_locked()
+
+    def stats(self) -> dict:
+        with self._lock:
+            rss = self._rss()
+            return {
+                "enabled": self.budget_bytes is not None,
+                "budget_bytes": self.budget_bytes,
+                "rss_bytes": rss,
+                "idle_rss_bytes": self._idle_rss,
+                "reserved_bytes": self._reserved,
+                "projected_bytes": self._projected_locked(rss),
+                "active": self._active,
+                "waiting": len(self._waiting),
+                "admitted": self._admitted,
+                "delayed": self._delayed
+            }
@@ -0,0 +1,106 @@
+"""
+EchoTranscribe Backend - Processamento de áudio
+Decodificação, detecção de voz e detecção de idioma, compartilhadas entre os endpoints
+"""
+
+import logging
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# Taxa de amostragem esperada pelo Whisper
+SAMPLING_RATE = 16000
+
+# Tamanho da janela usada pelo Whisper (e pela detecção de idioma)
+WINDOW_SECONDS = 30
+
+
+def load_audio(audio_file):
+    """
+    Decodifica o arquivo (caminho ou objeto de arquivo) uma única vez para
+    PCM mono float32 a 16 kHz.
+
+    O array resultante é repassado para a detecção de idioma e para a
+    transcrição, evitando que o faster-whisper decodifique o arquivo de novo.
+    """
+    from faster_whisper import decode_audio
+
+    return decode_audio(audio_file, sampling_rate=SAMPLING_RATE)
+
+
+def probe_duration(file_path: Union[str, BinaryIO]) -> Optional[float]:
+    """Lê a duração (em segundos) do cabeçalho do arquivo (caminho ou arquivo aberto), sem decodificar o áudio"""
+    try:
+        import av
+
+        with av.open(file_path) as container:
+            if container.duration:
+                return container.duration / av.time_base
+    except Exception as e:
+        logger.debug(f"Não foi possível obter a duração de {file_path}: {e}")
+    return None
+
+
+def remove_silence(audio, vad_options: dict) -> Tuple[object, List[dict]]:
+    """
+    Executa o VAD (Silero) e mantém apenas as regiões com fala
+
+    Returns:
+        (áudio só com as regiões de fala, lista de regiões em amostras)
+        Se não houver fala, o áudio retornado é vazio.
+    """
+    from faster_whisper.vad import VadOptions, get_speech_timestamps, collect_chunks
+
+    speech_chunks = get_speech_timestamps(audio, VadOptions(**vad_options))
+    if not speech_chunks:
+        return audio[:0], []
+    return collect_chunks(audio, speech_chunks), speech_chunks
+
+
+def restore_timestamps(segments: Iterable, speech_chunks: List[dict]) -> Iterable:
+    """Converte os timestamps dos segmentos e palavras para a linha do tempo original"""
+    from faster_whisper.transcribe import restore_speech_timestamps
+
+    return restore_speech_timestamps(segments, speech_chunks, SAMPLING_RATE)
+
+
+def speech_position(speech_chunks: List[dict], seconds: float) -> int:
+    """Posição (em amostras) no áudio só com fala correspondente a `seconds` do áudio original"""
+    position = int(seconds * SAMPLING_RATE)
+    return sum(
+        max(0, min(chunk["end"], position) - chunk["start"]) for chunk in speech_chunks
+    )
+
+
+def shift_segments(segments: Iterable, offset: float) -> Iterator:
+    """Desloca os timestamps dos segmentos e das palavras em `offset` segundos"""
+    for segment in segments:
+        words = segment.words
+        if words:
+            words = [
+                word._replace(start=word.start + offset, end=word.end + offset) for word in words
+            ]
+        yield segment._replace(start=segment.start + offset, end=segment.end + offset, words=words)
+
+
+def detect_language(whisper_model, audio) -> Tuple[str, float]:
+    """
+    Detecta o idioma usando apenas a primeira janela de 30 segundos do áudio
+
+    Returns:
+        (código do idioma, probabilidade da detecção)
+    """
+    if not whisper_model.model.is_multilingual:
+        return "en", 1.0
+
+    feature_extractor = whisper_model.feature_extractor
+    window = audio[: WINDOW_SECONDS * SAMPLING_RATE]
+    features = feature_extractor(window)[:, : feature_extractor.nb_max_frames]
+
+    encoder_output = whisper_model.encode(features)
+    # Lista de (token do idioma, probabilidade), ordenada da mais provável
+    results = whisper_model.model.detect_language(encoder_output)[0]
+    language_token, probability = results[0]
+
+    # Remover marcadores "<|" e "|>" do token
+    return language_token[2:-2], probability
@@ -0,0 +1,389 @@
+"""
+EchoTranscribe Backend - Decodificação em lote entre requisições
+Junta janelas de 30 segundos de todas as transcrições em andamento e as passa pelo encoder e decoder de uma vez
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from audio_processing import SAMPLING_RATE, WINDOW_SECONDS
+from chunking import find_quietest_point
+from metrics import StageTimer
+
+logger = logging.getLogger(__name__)
+
+# As janelas são cortadas no ponto mais silencioso entre 25 ± 5 segundos do início
+WINDOW_CUT_SECONDS = WINDOW_SECONDS - 5
+WINDOW_CUT_RADIUS_SECONDS = 5
+
+# Mesmos padrões do faster-whisper
+NO_SPEECH_THRESHOLD = 0.6
+LOG_PROB_THRESHOLD = -1.0
+MAX_INITIAL_TIMESTAMP = 1.0
+PREPEND_PUNCTUATIONS = "\"'“¿([{-"
+APPEND_PUNCTUATIONS = "\"'.。,，!！?？:：”)]}、"
+
+
+def can_batch(decoding_options: dict) -> bool:
+    """
+    Janelas só podem ser decodificadas independentemente (e, portanto, em
+    lote) sem condicionamento no texto anterior e sem nova tentativa com
+    outra temperatura.
+    """
+    temperature = decoding_options.get("temperature", 0.0)
+    single_temperature = not isinstance(temperature, (list, tuple)) or len(temperature) == 1
+    return single_temperature and not decoding_options.get("condition_on_previous_text", False)
+
+
+class _Window:
+    def __init__(self, features: np.ndarray, prompt: List[int], keep_encoder_output: bool):
+        self.features = features
+        self.prompt = prompt
+        self.keep_encoder_output = keep_encoder_output
+        self.enqueued_at = time.monotonic()
+        self.future: Future = Future()
+
+
+class _Group:
+    """Janelas pendentes que podem ir no mesmo lote (mesmo modelo e opções)"""
+
+    def __init__(self, whisper_model, generate_options: dict):
+        self.whisper_model = whisper_model
+        self.generate_options = generate_options
+        self.windows: List[_Window] = []
+
+
+class DecodeBatcher:
+    """
+    Fila única de janelas, consumida por uma thread que monta lotes de até
+    `max_batch_size` janelas, esperando no máximo `max_wait_ms` pela
+    chegada de outras janelas depois da primeira.
+
+    Cada lote passa uma vez pelo encoder e uma vez pelo decoder do
+    CTranslate2; os resultados voltam para quem enviou cada janela.
+    """
+
+    def __init__(self, max_batch_size: int, max_wait_ms: float):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self._groups: "dict[tuple, _Group]" = {}
+        self._condition = threading.Condition()
+        self._closed = False
+        self._batches = 0
+        self._windows = 0
+        self._thread = threading.Thread(target=self._run, name="whisper-batcher", daemon=True)
+        self._thread.start()
+
+    def decode(
+        self,
+        whisper_model,
+        features: List[np.ndarray],
+        prompt: List[int],
+        generate_options: dict,
+        keep_encoder_output: bool = False
+    ) -> List[Tuple[object, Optional[np.ndarray]]]:
+        """
+        Decodifica as janelas (mel de 80 x 3000) e aguarda os resultados.
+
+        Returns:
+            (WhisperGenerationResult, saída do encoder ou None) de cada janela
+        """
+        key = (id(whisper_model), tuple(sorted(
+            (name, tuple(value) if isinstance(value, list) else value)
+            for name, value in generate_options.items()
+        )))
+        windows = [_Window(f, prompt, keep_encoder_output) for f in features]
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Decodificação em lote encerrada")
+            group = self._groups.get(key)
+            if group is None:
+                group = self._groups[key] = _Group(whisper_model, generate_options)
+            group.windows.extend(windows)
+            self._condition.notify_all()
+
+        return [window.future.result() for window in windows]
+
+    def _next_batch(self) -> Optional[Tuple[_Group, List[_Window]]]:
+        with self._condition:
+            while True:
+                if self._closed:
+                    return None
+                if self._groups:
+                    # Grupo com a janela mais antiga primeiro
+                    key, group = min(
+                        self._groups.items(), key=lambda item: item[1].windows[0].enqueued_at
+                    )
+                    deadline = group.windows[0].enqueued_at + self.max_wait
+                    remaining = deadline - time.monotonic()
+                    if len(group.windows) >= self.max_batch_size or remaining <= 0:
+                        batch = group.windows[: self.max_batch_size]
+                        group.windows = group.windows[self.max_batch_size:]
+                        if not group.windows:
+                            del self._groups[key]
+                        return group, batch
+                    self._condition.wait(remaining)
+                else:
+                    self._condition.wait()
+
+    def _run(self):
+        while True:
+            next_batch = self._next_batch()
+            if next_batch is None:
+                return
+            group, windows = next_batch
+            try:
+                results = self._decode_batch(group, windows)
+            except BaseException as e:
+                for window in windows:
+                    window.future.set_exception(e)
+                continue
+
+            with self._condition:
+                self._batches += 1
+                self._windows += len(windows)
+            for window, result in zip(windows, results):
+                window.future.set_result(result)
+
+    def _decode_batch(self, group: _Group, windows: List[_Window]) -> list:
+        import ctranslate2
+
+        model = group.whisper_model.model
+        keep_encoder_output = any(window.keep_encoder_output for window in windows)
+
+        features = np.ascontiguousarray(np.stack([window.features for window in windows]))
+        encoder_output = model.encode(
+            ctranslate2.StorageView.from_array(features),
+            # A saída do encoder precisa estar na CPU para ser repartida entre as janelas
+            to_cpu=keep_encoder_output
+        )
+        results = model.generate(
+            encoder_output,
+            [window.prompt for window in windows],
+            **group.generate_options
+        )
+
+        encoder_array = np.array(encoder_output) if keep_encoder_output else None
+        return [
+            (
+                result,
+                encoder_array[index:index + 1] if window.keep_encoder_output else None
+            )
+            for index, (window, result) in enumerate(zip(windows, results))
+        ]
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                "enabled": True,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "pending_windows": sum(len(g.windows) for g in self._groups.values()),
+                "batches": self._batches,
+                "windows": self._windows,
+                "average_batch_size": self._windows / self._batches if self._batches else 0.0,
+            }
+
+    def close(self):
+        """Encerra a thread; janelas pendentes recebem erro"""
+        with self._condition:
+            self._closed = True
+            pending = [w for g in self._groups.values() for w in g.windows]
+            self._groups.clear()
+            self._condition.notify_all()
+        for window in pending:
+            window.future.set_exception(RuntimeError("Decodificação em lote encerrada"))
+
+
+def plan_windows(audio: np.ndarray) -> List[Tuple[int, int]]:
+    """Divide o áudio em janelas de até 30 segundos cortadas em pontos de silêncio"""
+    total = len(audio)
+    window = WINDOW_SECONDS * SAMPLING_RATE
+    cut = WINDOW_CUT_SECONDS * SAMPLING_RATE
+    radius = WINDOW_CUT_RADIUS_SECONDS * SAMPLING_RATE
+
+    windows = []
+    start = 0
+    while total - start > window:
+        end = min(find_quietest_point(audio, start + cut, radius), start + window)
+        windows.append((start, end))
+        start = end
+    if start < total:
+        windows.append((start, total))
+    return windows
+
+
+def _split_by_timestamps(tokens: List[int], tokenizer, time_offset: float, duration: float) -> List[dict]:
+    """Separa os tokens de uma janela em segmentos pelos tokens de timestamp"""
+    timestamp_begin = tokenizer.timestamp_begin
+    consecutive = [
+        i for i in range(1, len(tokens))
+        if tokens[i] >= timestamp_begin and tokens[i - 1] >= timestamp_begin
+    ]
+    single_timestamp_ending = (
+        len(tokens) >= 2 and tokens[-2] < timestamp_begin <= tokens[-1]
+    )
+
+    if not consecutive:
+        timestamps = [token for token in tokens if token >= timestamp_begin]
+        if timestamps and timestamps[-1] != timestamp_begin:
+            duration = (timestamps[-1] - timestamp_begin) * 0.02
+        return [dict(start=time_offset, end=time_offset + duration, tokens=tokens)]
+
+    slices = list(consecutive)
+    if single_timestamp_ending:
+        slices.append(len(tokens))
+
+    segments = []
+    last_slice = 0
+    for current_slice in slices:
+        sliced = tokens[last_slice:current_slice]
+        segments.append(dict(
+            start=time_offset + (sliced[0] - timestamp_begin) * 0.02,
+            end=time_offset + (sliced[-1] - timestamp_begin) * 0.02,
+            tokens=sliced,
+        ))
+        last_slice = current_slice
+
+    remaining = tokens[last_slice:]
+    if not single_timestamp_ending and any(token < timestamp_begin for token in remaining):
+        # Trecho final sem timestamp de fechamento: vai até o fim da janela
+        # (o faster-whisper recomeçaria a próxima janela daqui; janelas em lote são fixas)
+        segments.append(dict(
+            start=time_offset + (remaining[0] - timestamp_begin) * 0.02,
+            end=time_offset + duration,
+            tokens=remaining,
+        ))
+    return segments
+
+
+def transcribe_batched(
+    whisper_model,
+    audio: np.ndarray,
+    batcher: DecodeBatcher,
+    language: str,
+    beam_size: int = 5,
+    best_of: int = 5,
+    temperature=0.0,
+    word_timestamps: bool = False,
+    timer: Optional[StageTimer] = None,
+    **_ignored
+) -> Iterator:
+    """
+    Transcreve o áudio em janelas independentes enviadas ao `batcher`,
+    produzindo os segmentos na ordem do áudio (como WhisperModel.transcribe).
+
+    Só deve ser usado quando `can_batch` aceitar as opções de decodificação.
+    `timer`, se informado, recebe o tempo de extração de features,
+    decodificação (incluindo a espera pelo lote) e alinhamento das palavras.
+    """
+    from ctranslate2 import StorageView
+    from faster_whisper.tokenizer import Tokenizer
+    from faster_whisper.transcribe import Segment, Word, get_compression_ratio
+
+    tokenizer = Tokenizer(
+        whisper_model.hf_tokenizer,
+        whisper_model.model.is_multilingual,
+        task="transcribe",
+        language=language,
+    )
+    prompt = list(tokenizer.sot_sequence)
+    timer = timer or StageTimer()
+    feature_extractor = whisper_model.feature_extractor
+    hop_length = feature_extractor.hop_length
+
+    if isinstance(temperature, (list, tuple)):
+        temperature = temperature[0]
+    if temperature > 0:
+        sampling = {
+            "beam_size": 1,
+            "num_hypotheses": best_of,
+            "sampling_topk": 0,
+            "sampling_temperature": temperature,
+        }
+    else:
+        sampling = {"beam_size": beam_size}
+    generate_options = {
+        "max_length": whisper_model.max_length,
+        "return_scores": True,
+        "return_no_speech_prob": True,
+        "suppress_blank": True,
+        "suppress_tokens": [-1],
+        "max_initial_timestamp_index": int(round(MAX_INITIAL_TIMESTAMP / 0.02)),
+        **sampling,
+    }
+
+    windows = plan_windows(audio)
+    logger.info(f"Áudio dividido em {len(windows)} janela(s) para decodificação em lote")
+
+    segment_id = 0
+    last_speech_timestamp = 0.0
+    # Enviar poucas janelas por vez limita a memória com áudios longos
+    for group_start in range(0, len(windows), batcher.max_batch_size):
+        group = windows[group_start:group_start + batcher.max_batch_size]
+        with timer.stage("feature_extraction"):
+            features = [
+                feature_extractor(audio[start:end])[:, : feature_extractor.nb_max_frames]
+                for start, end in group
+            ]
+        with timer.stage("encode_decode"):
+            results = batcher.decode(
+                whisper_model, features, prompt, generate_options,
+                keep_encoder_output=word_timestamps
+            )
+
+        for (start, end), (result, encoder_output) in zip(group, results):
+            tokens = result.sequences_ids[0]
+            avg_logprob = result.scores[0] * len(tokens) / (len(tokens) + 1)
+            if result.no_speech_prob > NO_SPEECH_THRESHOLD and avg_logprob < LOG_PROB_THRESHOLD:
+                continue
+
+            time_offset = start / SAMPLING_RATE
+            num_frames = (end - start) // hop_length
+            current_segments = _split_by_timestamps(
+                tokens, tokenizer, time_offset, (end - start) / SAMPLING_RATE
+            )
+            for segment in current_segments:
+                segment["seek"] = start // hop_length
+
+            if word_timestamps:
+                with timer.stage("word_alignment"):
+                    whisper_model.add_word_timestamps(
+                        current_segments,
+                        tokenizer,
+                        StorageView.from_array(np.ascontiguousarray(encoder_output)),
+                        num_frames,
+                        PREPEND_PUNCTUATIONS,
+                        APPEND_PUNCTUATIONS,
+                        last_speech_timestamp=last_speech_timestamp,
+                    )
+                word_ends = [w["end"] for s in current_segments for w in s["words"]]
+                if word_ends:
+                    last_speech_timestamp = word_ends[-1]
+
+            for segment in current_segments:
+                text = tokenizer.decode(segment["tokens"])
+                if segment["start"] == segment["end"] or not text.strip():
+                    continue
+                segment_id += 1
+                yield Segment(
+                    id=segment_id,
+                    seek=segment["seek"],
+                    start=segment["start"],
+                    end=segment["end"],
+                    text=text,
+                    tokens=segment["tokens"],
+                    temperature=temperature,
+                    avg_logprob=avg_logprob,
+                    compression_ratio=get_compression_ratio(text.strip()),
+                    no_speech_prob=result.no_speech_prob,
+                    words=(
+                        [Word(**word) for word in segment["words"]] if word_timestamps else None
+                    ),
+                )
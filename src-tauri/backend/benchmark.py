@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+EchoTranscribe Backend - Benchmark
+Mede latência, fator de tempo real, vazão e pico de memória do backend com áudio sintético
+
+Cada combinação de modelo e tipo de computação roda em um processo próprio
+(o pico de memória é por processo e a configuração é lida na importação do
+main.py), com os caches de resultado e de áudio desativados. Dentro dele
+são medidos, para cada duração, formato, perfil e nível de concorrência:
+
+    inprocess  run_transcription chamado direto, sem HTTP nem pool
+    http       POST /transcribe em um servidor uvicorn local
+    batch      POST /transcribe-batch com um arquivo por nível de concorrência
+
+Exemplos:
+    python benchmark.py --stub --output resultados.json
+    python benchmark.py --models tiny,base --compute-types int8,float32 \\
+        --durations 10,60,300 --concurrency 1,4 --baseline anterior.json
+    python benchmark.py --calibrate --models tiny,base,small,medium \\
+        --profiles fast,balanced,accurate --concurrency 1 --modes inprocess
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+import uuid
+from pathlib import Path
+from typing import List
+
+from benchmarking import (
+    AV_CODECS, StubWhisperModel, encode_audio, p50_changes, run_concurrently, summarize,
+    synthetic_speech
+)
+
+# Versão do formato do arquivo de resultados
+RESULTS_VERSION = 1
+
+MODES = ("inprocess", "http", "batch")
+
+
+# --- Cliente HTTP ----------------------------------------------------------
+
+def multipart_body(files: List[tuple]) -> tuple:
+    """Corpo multipart/form-data para [(campo, nome do arquivo, conteúdo)]"""
+    boundary = uuid.uuid4().hex
+    body = io.BytesIO()
+    for field, filename, content in files:
+        body.write(f"--{boundary}\r\n".encode())
+        body.write(
+            f'Content-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+            "Content-Type: application/octet-stream\r\n\r\n".encode()
+        )
+        body.write(content)
+        body.write(b"\r\n")
+    body.write(f"--{boundary}--\r\n".encode())
+    return body.getvalue(), f"multipart/form-data; boundary={boundary}"
+
+
+def post(url: str, files: List[tuple], timeout: float) -> dict:
+    body, content_type = multipart_body(files)
+    request = urllib.request.Request(
+        url, data=body, method="POST", headers={"Content-Type": content_type}
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        raise RuntimeError(f"HTTP {e.code}: {e.read()[:200]!r}") from None
+
+
+class LocalServer:
+    """Servidor uvicorn do app em uma thread, em uma porta livre"""
+
+    def __init__(self, app, port: int):
+        import uvicorn
+
+        self.url = f"http://127.0.0.1:{port}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError("Servidor do benchmark não iniciou")
+            time.sleep(0.05)
+        return self
+
+    def __exit__(self, *_exc):
+        self._server.should_exit = True
+        self._thread.join()
+
+
+# --- Execução dos cenários (processo filho) --------------------------------
+
+def run_worker(config: dict) -> dict:
+    """Mede todos os cenários de um modelo e tipo de computação"""
+    import main
+    from model_registry import ModelRegistry
+
+    # Apenas avisos e erros do backend, para não misturar com o progresso
+    logging.getLogger().setLevel(logging.WARNING)
+
+    model = config["model"]
+    if config["stub"]:
+        # Mesmo orçamento e contabilidade do registro real, sem carregar pesos
+        main.model_registry = ModelRegistry(
+            lambda spec: StubWhisperModel(config["stub_rtf"]),
+            main.model_registry.memory_budget_bytes,
+            describer=main.describe_model
+        )
+
+    scenarios = []
+    with tempfile.TemporaryDirectory(prefix="echo-benchmark-") as workdir, \
+            LocalServer(main.app, main.find_available_port(8100, 100)) as server:
+        for duration in config["durations"]:
+            audio = synthetic_speech(duration)
+            for audio_format in config["formats"]:
+                content = encode_audio(audio, audio_format)
+                path = Path(workdir) / f"audio-{duration:g}s.{audio_format}"
+                path.write_bytes(content)
+                filename = path.name
+
+                for profile in config["profiles"]:
+                    query = {"model": model, "profile": profile, "use_cache": "false"}
+                    if config["language"]:
+                        query["language"] = config["language"]
+                    query_string = urllib.parse.urlencode(query)
+                    params = main.TranscriptionParameters(
+                        language=config["language"] or None, use_cache=False, profile=profile
+                    )
+
+                    tasks = {
+                        "inprocess": lambda: main.run_transcription(str(path), model, params),
+                        "http": lambda: post(
+                            f"{server.url}/transcribe?{query_string}",
+                            [("file", filename, content)],
+                            config["timeout"]
+                        ),
+                    }
+
+                    for mode in config["modes"]:
+                        for concurrency in config["concurrency"]:
+                            if mode == "batch":
+                                # Uma requisição com `concurrency` arquivos
+                                files = [("files", filename, content)] * concurrency
+                                url = f"{server.url}/transcribe-batch?{query_string}"
+                                task = lambda: _check_batch(post(url, files, config["timeout"]))
+                                requests = config["requests"]
+                                audio_seconds = duration * concurrency
+                                parallel = 1
+                            else:
+                                task = tasks[mode]
+                                requests = max(config["requests"], concurrency)
+                                audio_seconds = duration
+                                parallel = concurrency
+
+                            for _ in range(config["warmup"]):
+                                task()
+                            latencies, errors, wall_time = run_concurrently(
+                                task, requests, parallel
+                            )
+                            result = {
+                                "mode": mode,
+                                "model": model,
+                                "compute_type": config["compute_type"],
+                                "stub": config["stub"],
+                                "audio_seconds": duration,
+                                "format": audio_format,
+                                "file_bytes": len(content),
+                                "profile": profile,
+                                "concurrency": concurrency,
+                                **summarize(latencies, len(errors), audio_seconds, wall_time),
+                            }
+                            if errors:
+                                result["error_samples"] = errors[:3]
+                            scenarios.append(result)
+                            print(_describe(result), file=sys.stderr)
+    return {"scenarios": scenarios}
+
+
+def _check_batch(response: dict):
+    if response["failed"]:
+        raise RuntimeError(f"{response['failed']} arquivo(s) falharam no lote")
+
+
+def _describe(result: dict) -> str:
+    latency = result["latency_seconds"]
+    p50 = f"{latency['p50'] * 1000:.0f} ms" if latency["p50"] is not None else "-"
+    rtf = f"{result['real_time_factor']:.3f}" if result["real_time_factor"] is not None else "-"
+    return (
+        f"{result['mode']:>9} {result['model']}/{result['compute_type']} "
+        f"{result['audio_seconds']:g}s {result['format']} {result['profile']} "
+        f"x{result['concurrency']}: p50 {p50}, RTF {rtf}, erros {result['errors']}"
+    )
+
+
+# --- Orquestração (processo principal) -------------------------------------
+
+def environment_info() -> dict:
+    from importlib.metadata import PackageNotFoundError, version
+
+    packages = {}
+    for package in ("faster-whisper", "ctranslate2", "av", "numpy", "fastapi", "uvicorn"):
+        try:
+            packages[package] = version(package)
+        except PackageNotFoundError:
+            packages[package] = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "packages": packages,
+    }
+
+
+def run_configuration(args, model: str, compute_type: str) -> List[dict]:
+    """Executa os cenários de um modelo e tipo de computação em um processo filho"""
+    config = {
+        "model": model,
+        "compute_type": compute_type,
+        "stub": args.stub,
+        "stub_rtf": args.stub_rtf,
+        "durations": args.durations,
+        "formats": args.formats,
+        "profiles": args.profiles,
+        "modes": args.modes,
+        "concurrency": args.concurrency,
+        "requests": args.requests,
+        "warmup": args.warmup,
+        "language": args.language,
+        "timeout": args.timeout,
+    }
+    env = {
+        **os.environ,
+        "ECHO_TRANSCRIBE_COMPUTE_TYPE": compute_type,
+        "ECHO_TRANSCRIBE_RESULT_CACHE_MB": "0",
+        "ECHO_TRANSCRIBE_PCM_CACHE_MB": "0",
+        "ECHO_TRANSCRIBE_CHECKPOINT_SECONDS": "0",
+        # Só a calibração grava a velocidade medida, usada pelo modelo "auto"
+        "ECHO_TRANSCRIBE_SPEED_STATS": "1" if args.calibrate else "0",
+        "ECHO_TRANSCRIBE_PRELOAD_MODELS": "",
+        # Cabe o maior nível de concorrência sem respostas 503
+        "ECHO_TRANSCRIBE_QUEUE_SIZE": str(max(args.concurrency) * 2),
+    }
+    if args.stub:
+        # O modelo simulado não implementa a decodificação em lote
+        env["ECHO_TRANSCRIBE_BATCH_SIZE"] = "1"
+
+    process = subprocess.run(
+        [sys.executable, str(Path(__file__).resolve()), "--worker", json.dumps(config)],
+        env=env,
+        cwd=str(Path(__file__).resolve().parent),
+        stdout=subprocess.PIPE,
+    )
+    if process.returncode != 0:
+        print(f"❌ {model}/{compute_type} falhou (código {process.returncode})", file=sys.stderr)
+        return [{
+            "model": model,
+            "compute_type": compute_type,
+            "error": f"processo encerrou com código {process.returncode}",
+        }]
+    return json.loads(process.stdout.decode().strip().splitlines()[-1])["scenarios"]
+
+
+def compare_with_baseline(results: List[dict], baseline_path: Path):
+    """Imprime a variação da latência p50 em relação a um resultado anterior"""
+    baseline_results = json.loads(baseline_path.read_text())["results"]
+    print(f"\n📊 Comparação com {baseline_path}")
+    for result, change in p50_changes(results, baseline_results):
+        marker = "⚠️" if change > 10 else "  "
+        print(f"{marker} {_describe(result)} ({change:+.1f}% p50)")
+
+
+def parse_list(cast):
+    return lambda value: [cast(item.strip()) for item in value.split(",") if item.strip()]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark do backend do EchoTranscribe com áudio sintético"
+    )
+    parser.add_argument("--models", type=parse_list(str), default=["base"])
+    parser.add_argument("--compute-types", type=parse_list(str), default=["int8"])
+    parser.add_argument("--durations", type=parse_list(float), default=[10.0, 60.0],
+                        help="Durações do áudio em segundos")
+    parser.add_argument("--formats", type=parse_list(str), default=["wav"],
+                        help=f"wav ou, com PyAV, {', '.join(AV_CODECS)}")
+    parser.add_argument("--profiles", type=parse_list(str), default=["balanced"])
+    parser.add_argument("--modes", type=parse_list(str), default=list(MODES))
+    parser.add_argument("--concurrency", type=parse_list(int), default=[1, 4])
+    parser.add_argument("--requests", type=int, default=8,
+                        help="Requisições medidas por cenário (no mínimo a concorrência)")
+    parser.add_argument("--warmup", type=int, default=1,
+                        help="Requisições não medidas antes de cada cenário")
+    parser.add_argument("--language", default="en",
+                        help="Idioma fixo; vazio ativa a detecção automática")
+    parser.add_argument("--timeout", type=float, default=3600.0)
+    parser.add_argument("--stub", action="store_true",
+                        help="Usar um modelo simulado, sem baixar pesos "
+                             "(o faster-whisper ainda decodifica o áudio)")
+    parser.add_argument("--stub-rtf", type=float, default=0.05,
+                        help="Fator de tempo real do modelo simulado")
+    parser.add_argument("--calibrate", action="store_true",
+                        help="Gravar a velocidade medida em ~/.echo-transcribe/speed.json "
+                             "(modelo auto e /models); use --concurrency 1")
+    parser.add_argument("--output", type=Path, help="Arquivo JSON de resultados")
+    parser.add_argument("--baseline", type=Path, help="Resultado anterior para comparação")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.calibrate and args.stub:
+        parser.error("--calibrate mede o modelo real e não pode ser usado com --stub")
+    invalid_modes = set(args.modes) - set(MODES)
+    if invalid_modes:
+        parser.error(f"Modos inválidos: {', '.join(sorted(invalid_modes))}")
+    invalid_formats = set(args.formats) - {"wav", *AV_CODECS}
+    if invalid_formats:
+        parser.error(f"Formatos inválidos: {', '.join(sorted(invalid_formats))}")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.worker:
+        # Resultado na última linha da saída padrão; logs vão para a saída de erro
+        print(json.dumps(run_worker(json.loads(args.worker))))
+        return
+
+    started_at = time.time()
+    results = []
+    for model in args.models:
+        for compute_type in args.compute_types:
+            print(f"🏁 {model}/{compute_type}", file=sys.stderr)
+            results.extend(run_configuration(args, model, compute_type))
+
+    report = {
+        "version": RESULTS_VERSION,
+        "started_at": started_at,
+        "finished_at": time.time(),
+        "environment": environment_info(),
+        "arguments": {
+            key: value for key, value in vars(args).items()
+            if key not in ("worker", "output", "baseline")
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2, default=str)
+    if args.output:
+        args.output.write_text(output)
+        print(f"📝 Resultados salvos em {args.output}", file=sys.stderr)
+    else:
+        print(output)
+
+    if args.baseline:
+        compare_with_baseline(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+"""
+EchoTranscribe Backend - Medições do benchmark
+Áudio sintético, modelo simulado e estatísticas usados pelo benchmark.py
+"""
+
+import io
+import math
+import statistics
+import sys
+import threading
+import time
+import wave
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+SAMPLING_RATE = 16000
+
+# Formatos que exigem o PyAV para codificar (WAV usa apenas a biblioteca padrão)
+AV_CODECS = {
+    "flac": ("flac", "flac"),
+    "mp3": ("mp3", "mp3"),
+    "ogg": ("ogg", "libvorbis"),
+    "m4a": ("mp4", "aac"),
+}
+
+
+# --- Áudio sintético -------------------------------------------------------
+
+def synthetic_speech(seconds: float, seed: int = 0) -> np.ndarray:
+    """
+    Sinal com estrutura parecida com fala: "sílabas" de harmônicos com
+    frequência fundamental variável, separadas por pausas curtas e longas.
+    """
+    rng = np.random.default_rng(seed)
+    total = int(seconds * SAMPLING_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    position = 0
+    while position < total:
+        length = int(rng.uniform(0.15, 0.4) * SAMPLING_RATE)
+        t = np.arange(min(length, total - position)) / SAMPLING_RATE
+        f0 = rng.uniform(90, 250)
+        syllable = sum(np.sin(2 * np.pi * f0 * k * t) / k for k in range(1, 6))
+        envelope = np.sin(np.pi * np.linspace(0, 1, len(t))) ** 2
+        audio[position:position + len(t)] = 0.3 * syllable * envelope
+        position += len(t)
+        # Pausas entre palavras e, de vez em quando, entre frases
+        pause = 1.0 if rng.random() < 0.1 else rng.uniform(0.03, 0.15)
+        position += int(pause * SAMPLING_RATE)
+    audio += rng.standard_normal(total).astype(np.float32) * 0.003
+    return np.clip(audio, -1.0, 1.0)
+
+
+def encode_audio(audio: np.ndarray, audio_format: str) -> bytes:
+    """Codifica o áudio mono de 16 kHz no formato pedido"""
+    pcm = (audio * 32767).astype("<i2")
+    if audio_format == "wav":
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(SAMPLING_RATE)
+            wav.writeframes(pcm.tobytes())
+        return buffer.getvalue()
+
+    import av
+
+    container_format, codec = AV_CODECS[audio_format]
+    buffer = io.BytesIO()
+    with av.open(buffer, "w", format=container_format) as container:
+        stream = container.add_stream(codec, rate=SAMPLING_RATE)
+        stream.layout = "mono"
+        frame = av.AudioFrame.from_ndarray(pcm.reshape(1, -1), format="s16", layout="mono")
+        frame.sample_rate = SAMPLING_RATE
+        for packet in stream.encode(frame):
+            container.mux(packet)
+        for packet in stream.encode(None):
+            container.mux(packet)
+    return buffer.getvalue()
+
+
+# --- Modelo simulado -------------------------------------------------------
+
+StubSegment = namedtuple("StubSegment", "id seek start end text tokens words")
+StubWord = namedtuple("StubWord", "start end word probability")
+
+
+class _StubCTranslate2Model:
+    is_multilingual = False
+    compute_type = "stub"
+
+
+class StubWhisperModel:
+    """
+    Substitui o WhisperModel sem baixar pesos: "decodifica" o áudio em
+    `rtf` × sua duração (dormindo, como o CTranslate2, sem segurar o GIL)
+    e devolve um segmento a cada 5 segundos.
+    """
+
+    def __init__(self, rtf: float):
+        self.rtf = rtf
+        self.model = _StubCTranslate2Model()
+
+    def transcribe(self, audio, language=None, word_timestamps=False, **_options):
+        duration = len(audio) / SAMPLING_RATE
+
+        def segments():
+            start = 0.0
+            index = 0
+            while start < duration:
+                end = min(duration, start + 5.0)
+                time.sleep((end - start) * self.rtf)
+                words = None
+                if word_timestamps:
+                    words = [
+                        StubWord(start + i * (end - start) / 4, start + (i + 1) * (end - start) / 4,
+                                 " palavra", 0.9)
+                        for i in range(4)
+                    ]
+                index += 1
+                yield StubSegment(index, 0, start, end, " palavra" * 4, [], words)
+                start = end
+
+        return segments(), None
+
+
+# --- Estatísticas ----------------------------------------------------------
+
+def percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Percentil por interpolação linear (None para lista vazia)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * fraction
+    lower, upper = math.floor(position), math.ceil(position)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """Pico de memória residente deste processo até agora"""
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux informa em KB; macOS, em bytes
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+
+        return psutil.Process().memory_info().peak_wset
+    except (ImportError, AttributeError):
+        return None
+
+
+def summarize(latencies: List[float], errors: int, audio_seconds: float, wall_time: float) -> dict:
+    """Percentis de latência, fator de tempo real e vazão de um cenário"""
+    completed = len(latencies)
+    return {
+        "requests": completed + errors,
+        "errors": errors,
+        "latency_seconds": {
+            "mean": statistics.fmean(latencies) if latencies else None,
+            "min": min(latencies, default=None),
+            "p50": percentile(latencies, 0.50),
+            "p90": percentile(latencies, 0.90),
+            "p99": percentile(latencies, 0.99),
+            "max": max(latencies, default=None),
+        },
+        # Latência de cada requisição dividida pela duração do seu áudio
+        "real_time_factor": (
+            statistics.fmean(latencies) / audio_seconds if latencies and audio_seconds else None
+        ),
+        "throughput": {
+            "requests_per_second": completed / wall_time if wall_time else None,
+            "audio_seconds_per_second": completed * audio_seconds / wall_time if wall_time else None,
+        },
+        "wall_time_seconds": wall_time,
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+
+
+def run_concurrently(task: Callable[[], None], requests: int, concurrency: int):
+    """Executa `task` `requests` vezes com `concurrency` em paralelo; devolve latências e erros"""
+    latencies: List[float] = []
+    errors = []
+    lock = threading.Lock()
+
+    def timed():
+        start_time = time.perf_counter()
+        try:
+            task()
+        except Exception as e:
+            with lock:
+                errors.append(str(e))
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start_time)
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for future in [executor.submit(timed) for _ in range(requests)]:
+            future.result()
+    return latencies, errors, time.perf_counter() - wall_start
+
+
+def scenario_key(result: dict) -> tuple:
+    return tuple(
+        result.get(field) for field in
+        ("mode", "model", "compute_type", "stub", "audio_seconds", "format", "profile", "concurrency")
+    )
+
+
+def p50_changes(results: List[dict], baseline_results: List[dict]) -> List[Tuple[dict, float]]:
+    """Variação (%) da latência p50 de cada cenário presente também no resultado anterior"""
+    baseline = {
+        scenario_key(result): result
+        for result in baseline_results
+        if "latency_seconds" in result
+    }
+    changes = []
+    for result in results:
+        previous = baseline.get(scenario_key(result))
+        if previous is None or "latency_seconds" not in result:
+            continue
+        current_p50 = result["latency_seconds"]["p50"]
+        previous_p50 = previous["latency_seconds"]["p50"]
+        if not current_p50 or not previous_p50:
+            continue
+        changes.append((result, (current_p50 / previous_p50 - 1) * 100))
+    return changes
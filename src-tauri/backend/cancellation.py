@@ -0,0 +1,71 @@
+"""
+EchoTranscribe Backend - Cancelamento de transcrições
+Sinais verificados pela thread da transcrição entre um segmento e outro
+"""
+
+import threading
+from typing import Dict, Optional
+
+
+class TranscriptionCancelled(Exception):
+    """Lançada na thread da transcrição quando ela é cancelada"""
+
+
+class CancelToken:
+    """
+    Sinal de cancelamento de uma transcrição.
+
+    O cancelamento é cooperativo: a decodificação de um segmento não é
+    interrompida, mas a transcrição para antes de começar o próximo.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        """Lança TranscriptionCancelled se a transcrição foi cancelada"""
+        if self._event.is_set():
+            raise TranscriptionCancelled("Transcrição cancelada")
+
+
+class CancellationRegistry:
+    """Tokens das transcrições em andamento, pelo ID da requisição"""
+
+    def __init__(self):
+        self._tokens: Dict[str, CancelToken] = {}
+        self._lock = threading.Lock()
+
+    def register(self, request_id: str) -> CancelToken:
+        """Cria o token da requisição (ValueError se o ID já estiver em uso)"""
+        with self._lock:
+            if request_id in self._tokens:
+                raise ValueError(f"ID de requisição já em uso: {request_id}")
+            token = self._tokens[request_id] = CancelToken()
+            return token
+
+    def unregister(self, request_id: str):
+        with self._lock:
+            self._tokens.pop(request_id, None)
+
+    def get(self, request_id: str) -> Optional[CancelToken]:
+        with self._lock:
+            return self._tokens.get(request_id)
+
+    def cancel(self, request_id: str) -> bool:
+        """Cancela a transcrição; False se não houver nenhuma com esse ID"""
+        token = self.get(request_id)
+        if token is None:
+            return False
+        token.cancel()
+        return True
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tokens)
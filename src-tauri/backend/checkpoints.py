@@ -0,0 +1,189 @@
+"""
+EchoTranscribe Backend - Checkpoints de transcrições longas
+Segmentos já decodificados gravados em JSONL (só acréscimo), para retomar a transcrição após uma interrupção
+"""
+
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Versão do formato; checkpoints de outra versão são descartados
+CHECKPOINT_VERSION = 1
+
+
+class Checkpoint:
+    """
+    Checkpoint aberto de uma transcrição.
+
+    A primeira linha do arquivo é o cabeçalho (modelo, parâmetros, origem
+    do áudio e idioma); cada linha seguinte é um segmento, com as palavras,
+    gravado assim que é decodificado.
+    """
+
+    def __init__(self, store: "CheckpointStore", key: str, header: dict, segments: List[dict]):
+        self.key = key
+        self.header = header
+        # Segmentos recuperados de uma execução anterior
+        self.segments = segments
+        self._store = store
+        self._file = open(store._path(key), "a", encoding="utf-8")
+
+    @property
+    def resume_at(self) -> float:
+        """Fim (em segundos) do último segmento gravado; a decodificação continua daqui"""
+        return self.segments[-1]["end"] if self.segments else 0.0
+
+    def append(self, segment: dict):
+        """Grava um segmento; após o flush ele sobrevive à queda do processo"""
+        self._file.write(json.dumps(segment, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+        self._store._release(self.key)
+
+    def discard(self):
+        """Fecha e remove o checkpoint (a transcrição terminou)"""
+        self.close()
+        self._store.discard(self.key)
+
+
+class CheckpointStore:
+    """
+    Checkpoints em disco, um arquivo .jsonl por transcrição, endereçados
+    pela mesma chave do cache de resultados.
+
+    Repetir a transcrição do mesmo áudio com os mesmos parâmetros retoma o
+    checkpoint existente. Checkpoints sem atividade há mais de
+    `max_age_seconds` são removidos.
+    """
+
+    suffix = ".jsonl"
+
+    def __init__(self, directory: Path, max_age_seconds: float):
+        self.directory = Path(directory)
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._open_keys = set()
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def _release(self, key: str):
+        with self._lock:
+            self._open_keys.discard(key)
+
+    def _read(self, path: Path) -> Optional[tuple]:
+        """
+        Lê (cabeçalho, segmentos) do arquivo. Uma última linha incompleta
+        (queda durante a gravação) é removida do arquivo.
+        """
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        header = None
+        segments = []
+        valid_bytes = 0
+        for line in data.split(b"\n"):
+            if not line:
+                break
+            try:
+                item = json.loads(line)
+            except ValueError:
+                break
+            if header is None:
+                header = item
+            else:
+                segments.append(item)
+            valid_bytes += len(line) + 1
+
+        if header is None or header.get("version") != CHECKPOINT_VERSION:
+            return None
+        if valid_bytes < len(data):
+            with open(path, "r+b") as f:
+                f.truncate(valid_bytes)
+        return header, segments
+
+    def open(self, key: str, header: dict) -> Optional[Checkpoint]:
+        """
+        Abre o checkpoint da transcrição, recuperando os segmentos já gravados
+        (o cabeçalho original é mantido). Retorna None se o mesmo checkpoint
+        já estiver aberto por outra transcrição em andamento.
+        """
+        with self._lock:
+            if key in self._open_keys:
+                return None
+            self._open_keys.add(key)
+
+        try:
+            path = self._path(key)
+            existing = self._read(path)
+            if existing is not None:
+                header, segments = existing
+                logger.info(
+                    f"Retomando transcrição do checkpoint a partir de "
+                    f"{segments[-1]['end'] if segments else 0.0:.1f}s ({len(segments)} segmento(s))"
+                )
+            else:
+                header = {"version": CHECKPOINT_VERSION, "created_at": time.time(), **header}
+                segments = []
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(json.dumps(header, ensure_ascii=False) + "\n")
+            return Checkpoint(self, key, header, segments)
+        except Exception:
+            self._release(key)
+            raise
+
+    def discard(self, key: str):
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Não foi possível remover o checkpoint {key}: {e}")
+
+    def interrupted(self) -> List[dict]:
+        """
+        Cabeçalhos (com a chave em `key`) das transcrições interrompidas que
+        não estão em andamento; os checkpoints expirados ou inválidos são removidos
+        """
+        now = time.time()
+        pending = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            key = path.stem
+            with self._lock:
+                if key in self._open_keys:
+                    continue
+            try:
+                expired = now - path.stat().st_mtime > self.max_age_seconds
+            except OSError:
+                continue
+            existing = None if expired else self._read(path)
+            if existing is None:
+                self.discard(key)
+                continue
+            header, segments = existing
+            resume_at = segments[-1]["end"] if segments else 0.0
+            pending.append({**header, "key": key, "resume_at": resume_at})
+        return pending
+
+    def stats(self) -> dict:
+        count = 0
+        size_bytes = 0
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                size_bytes += path.stat().st_size
+            except OSError:
+                continue
+            count += 1
+        with self._lock:
+            active = len(self._open_keys)
+        return {"checkpoints": count, "active": active, "size_bytes": size_bytes}
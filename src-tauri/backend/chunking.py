@@ -0,0 +1,145 @@
+"""
+EchoTranscribe Backend - Transcrição de áudios longos em blocos
+Divide o áudio em blocos sobrepostos nos pontos de silêncio, decodifica em paralelo e junta o resultado
+"""
+
+import logging
+from concurrent.futures import Executor
+from typing import Iterator, List, Tuple
+
+import numpy as np
+
+from audio_processing import SAMPLING_RATE
+
+logger = logging.getLogger(__name__)
+
+# Tamanho do quadro usado para medir a energia ao procurar silêncios
+ENERGY_FRAME_SECONDS = 0.1
+
+# Distância máxima (em segundos) entre o corte ideal e o ponto de silêncio escolhido
+SILENCE_SEARCH_SECONDS = 15.0
+
+
+def find_quietest_point(audio: np.ndarray, center: int, radius: int) -> int:
+    """Retorna a amostra de menor energia em [center - radius, center + radius]"""
+    frame = int(ENERGY_FRAME_SECONDS * SAMPLING_RATE)
+    start = max(0, center - radius)
+    end = min(len(audio), center + radius)
+    window = audio[start:end]
+    n_frames = len(window) // frame
+    if n_frames == 0:
+        return center
+
+    frames = window[: n_frames * frame].reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(frames.astype(np.float32) ** 2, axis=1))
+    return start + int(np.argmin(energy)) * frame + frame // 2
+
+
+def plan_chunks(
+    audio: np.ndarray,
+    chunk_seconds: float,
+    overlap_seconds: float
+) -> List[Tuple[int, int, int, int]]:
+    """
+    Planeja os blocos do áudio.
+
+    Cada bloco é (início, fim, início próprio, fim próprio) em amostras:
+    [início, fim) é o trecho decodificado, que inclui a sobreposição com os
+    vizinhos, e [início próprio, fim próprio) é o trecho pelo qual o bloco
+    responde na junção. Os cortes caem no ponto mais silencioso perto de
+    cada múltiplo de `chunk_seconds`.
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * SAMPLING_RATE)
+    overlap = int(overlap_seconds * SAMPLING_RATE)
+    radius = min(int(SILENCE_SEARCH_SECONDS * SAMPLING_RATE), chunk // 4)
+
+    cuts = [0]
+    while total - cuts[-1] > chunk + chunk // 2:
+        cuts.append(find_quietest_point(audio, cuts[-1] + chunk, radius))
+    cuts.append(total)
+
+    chunks = []
+    for own_start, own_end in zip(cuts, cuts[1:]):
+        chunks.append((
+            max(0, own_start - overlap),
+            min(total, own_end + overlap),
+            own_start,
+            own_end
+        ))
+    return chunks
+
+
+def _decode_chunk(whisper_model, audio: np.ndarray, transcribe_kwargs: dict) -> list:
+    segments, _ = whisper_model.transcribe(audio, **transcribe_kwargs)
+    # Consumir o gerador dentro da thread do bloco
+    return list(segments)
+
+
+def owned_segments(segments: list, start: int, own_start: int, own_end: int, is_last: bool):
+    """
+    Desloca os timestamps do bloco para a linha do tempo do áudio e mantém
+    apenas as palavras (ou segmentos, sem palavras) cujo ponto médio cai no
+    trecho próprio do bloco, eliminando o que foi repetido na sobreposição.
+    """
+    offset = start / SAMPLING_RATE
+    own_start_s = own_start / SAMPLING_RATE
+    own_end_s = own_end / SAMPLING_RATE
+
+    def owned(begin: float, end: float) -> bool:
+        middle = (begin + end) / 2
+        return own_start_s <= middle and (middle < own_end_s or is_last)
+
+    for segment in segments:
+        if segment.words:
+            words = [
+                word._replace(start=word.start + offset, end=word.end + offset)
+                for word in segment.words
+            ]
+            kept = [word for word in words if owned(word.start, word.end)]
+            if not kept:
+                continue
+            text = segment.text if len(kept) == len(words) else "".join(w.word for w in kept)
+            yield segment._replace(
+                start=kept[0].start,
+                end=kept[-1].end,
+                text=text,
+                words=kept
+            )
+        else:
+            begin, end = segment.start + offset, segment.end + offset
+            if owned(begin, end):
+                yield segment._replace(start=begin, end=end)
+
+
+def transcribe_chunked(
+    whisper_model,
+    audio: np.ndarray,
+    executor: Executor,
+    chunk_seconds: float,
+    overlap_seconds: float,
+    **transcribe_kwargs
+) -> Iterator:
+    """
+    Decodifica os blocos em paralelo no `executor` e produz os segmentos já
+    unidos, na ordem do áudio, à medida que cada bloco termina.
+
+    `transcribe_kwargs` deve fixar o idioma para que todos os blocos usem o mesmo.
+    """
+    chunks = plan_chunks(audio, chunk_seconds, overlap_seconds)
+    logger.info(
+        f"Áudio de {len(audio) / SAMPLING_RATE:.0f}s dividido em {len(chunks)} bloco(s)"
+    )
+
+    futures = [
+        executor.submit(_decode_chunk, whisper_model, audio[start:end], transcribe_kwargs)
+        for start, end, _, _ in chunks
+    ]
+    try:
+        for index, (future, (start, _, own_start, own_end)) in enumerate(zip(futures, chunks)):
+            is_last = index == len(chunks) - 1
+            yield from owned_segments(future.result(), start, own_start, own_end, is_last)
+    finally:
+        # Se o consumidor parar antes do fim, não iniciar os blocos restantes
+        for future in futures:
+            future.cancel()
@@ -0,0 +1,199 @@
+"""
+EchoTranscribe Backend - Configurações do servidor
+Os valores podem ser sobrescritos por variáveis de ambiente ECHO_TRANSCRIBE_*
+"""
+
+import json
+import logging
+import os
+from pathlib import Path
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Lê um inteiro de uma variável de ambiente, usando o padrão se inválido"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    """Lê um número real de uma variável de ambiente, usando o padrão se inválido"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        return default
+
+
+def _env_choice(name: str, default: str, choices) -> str:
+    """Lê um valor de uma variável de ambiente, usando o padrão se não estiver entre as opções"""
+    value = os.environ.get(name, "").strip().lower()
+    if not value:
+        return default
+    if value not in choices:
+        logger.warning(f"{name}={value} inválido, usando {default}")
+        return default
+    return value
+
+
+def _env_paths(name: str, default: List[Path]) -> List[Path]:
+    """Lê uma lista de diretórios separados por os.pathsep; vazio desativa a lista"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return [Path(item).expanduser() for item in value.split(os.pathsep) if item.strip()]
+
+
+def _user_media_dirs() -> List[Path]:
+    """
+    Pastas de músicas, downloads e área de trabalho do usuário que existem,
+    com os nomes localizados do XDG (~/.config/user-dirs.dirs) no Linux
+    """
+    home = Path.home()
+    dirs = {"XDG_MUSIC_DIR": "Music", "XDG_DOWNLOAD_DIR": "Downloads", "XDG_DESKTOP_DIR": "Desktop"}
+    folders = {key: home / name for key, name in dirs.items()}
+
+    user_dirs = Path(os.environ.get("XDG_CONFIG_HOME") or home / ".config") / "user-dirs.dirs"
+    try:
+        lines = user_dirs.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeDecodeError):
+        lines = []
+    for line in lines:
+        key, _, value = line.partition("=")
+        if key.strip() in folders and value.strip():
+            folders[key.strip()] = Path(value.strip().strip('"').replace("$HOME", str(home)))
+    for key in folders:
+        if os.environ.get(key):
+            folders[key] = Path(os.environ[key])
+
+    result = []
+    for folder in folders.values():
+        # A pasta pessoal inteira nunca entra no padrão (XDG aponta para ela quando a pasta não existe)
+        if folder.is_dir() and folder.resolve() != home.resolve() and folder not in result:
+            result.append(folder)
+    return result
+
+
+def _env_list(name: str, default: List[str]) -> List[str]:
+    """Lê uma lista de valores separados por vírgula; vazio desativa a lista"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+def _env_json(name: str) -> dict:
+    """Lê um objeto JSON de uma variável de ambiente, retornando {} se ausente ou inválido"""
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return {}
+    try:
+        data = json.loads(value)
+    except ValueError:
+        logger.warning(f"{name} não é um JSON válido, ignorando")
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+CPU_COUNT = os.cpu_count() or 1
+
+# Pool de inferência: cada worker executa uma transcrição por vez.
+# O CTranslate2 já usa várias threads por chamada, então o padrão é
+# um worker a cada 4 núcleos.
+INFERENCE_WORKERS = max(1, _env_int("ECHO_TRANSCRIBE_WORKERS", max(1, CPU_COUNT // 4)))
+
+# Quantidade de transcrições que podem aguardar na fila além das que estão em execução
+INFERENCE_QUEUE_SIZE = max(0, _env_int("ECHO_TRANSCRIBE_QUEUE_SIZE", 8))
+
+# Valor (em segundos) do cabeçalho Retry-After quando a fila está cheia
+RETRY_AFTER_SECONDS = max(1, _env_int("ECHO_TRANSCRIBE_RETRY_AFTER", 5))
+
+# Orçamento de memória (MB) para os modelos mantidos carregados ao mesmo tempo
+MODEL_CACHE_MEMORY_MB = max(0, _env_int("ECHO_TRANSCRIBE_MODEL_CACHE_MB", 2048))
+
+# Tamanho máximo (MB) do cache de resultados em disco; 0 desativa o cache
+RESULT_CACHE_MB = max(0, _env_int("ECHO_TRANSCRIBE_RESULT_CACHE_MB", 256))
+
+# Tamanho máximo (MB) do cache de áudio decodificado (PCM 16 kHz, ~115 MB por hora); 0 desativa
+PCM_CACHE_MB = max(0, _env_int("ECHO_TRANSCRIBE_PCM_CACHE_MB", 1024))
+
+# Áudios a partir desta duração (segundos) são divididos em blocos decodificados
+# em paralelo; 0 desativa a divisão automática
+LONG_AUDIO_THRESHOLD_SECONDS = max(0.0, _env_float("ECHO_TRANSCRIBE_LONG_AUDIO_SECONDS", 1200.0))
+
+# Tamanho aproximado de cada bloco e sobreposição entre blocos vizinhos (segundos)
+CHUNK_SECONDS = max(30.0, _env_float("ECHO_TRANSCRIBE_CHUNK_SECONDS", 300.0))
+CHUNK_OVERLAP_SECONDS = max(0.0, _env_float("ECHO_TRANSCRIBE_CHUNK_OVERLAP_SECONDS", 2.0))
+
+# Quantidade de blocos decodificados ao mesmo tempo
+CHUNK_WORKERS = max(1, _env_int("ECHO_TRANSCRIBE_CHUNK_WORKERS", max(1, CPU_COUNT // 4)))
+
+# Tipos de computação (quantização) aceitos pelo CTranslate2
+COMPUTE_TYPES = {
+    "default", "auto", "int8", "int8_float32", "int8_float16", "int8_bfloat16",
+    "int16", "float16", "bfloat16", "float32"
+}
+
+# Opções usadas ao carregar os modelos. int8 reduz pela metade a latência em CPU
+# com perda mínima de precisão. Cada worker do pool de inferência precisa de um
+# worker do CTranslate2 para decodificar em paralelo, e as threads de CPU são
+# divididas entre eles.
+DEVICE = _env_choice("ECHO_TRANSCRIBE_DEVICE", "auto", {"auto", "cpu", "cuda"})
+COMPUTE_TYPE = _env_choice("ECHO_TRANSCRIBE_COMPUTE_TYPE", "int8", COMPUTE_TYPES)
+NUM_WORKERS = max(1, _env_int("ECHO_TRANSCRIBE_NUM_WORKERS", INFERENCE_WORKERS))
+CPU_THREADS = max(0, _env_int("ECHO_TRANSCRIBE_CPU_THREADS", max(1, CPU_COUNT // NUM_WORKERS)))
+
+# Sobrescritas por modelo, em JSON, por exemplo:
+# ECHO_TRANSCRIBE_MODEL_OPTIONS='{"medium": {"compute_type": "int8_float32", "cpu_threads": 8}}'
+MODEL_OPTIONS = _env_json("ECHO_TRANSCRIBE_MODEL_OPTIONS")
+
+# Uploads de até este tamanho (MB) são decodificados direto da memória;
+# os maiores são gravados em disco e lidos via mmap
+UPLOAD_SPILL_MB = max(0, _env_int("ECHO_TRANSCRIBE_UPLOAD_SPILL_MB", 32))
+
+# Diretórios cujos arquivos podem ser transcritos pelo caminho local, sem upload
+# (separados por os.pathsep); vazio desativa o acesso a arquivos locais. O padrão
+# são as pastas de músicas, downloads e área de trabalho, não a pasta pessoal inteira
+ALLOWED_LOCAL_DIRS = _env_paths("ECHO_TRANSCRIBE_ALLOWED_DIRS", _user_media_dirs())
+
+# Decodificação em lote: janelas de 30 s de todas as transcrições em andamento
+# são agrupadas em lotes de até BATCH_SIZE janelas, esperando no máximo
+# BATCH_WAIT_MS pela chegada de outras. 1 desativa o agrupamento.
+DECODE_BATCH_SIZE = max(1, _env_int("ECHO_TRANSCRIBE_BATCH_SIZE", 1))
+DECODE_BATCH_WAIT_MS = max(0.0, _env_float("ECHO_TRANSCRIBE_BATCH_WAIT_MS", 50.0))
+
+# Modelos carregados e aquecidos em segundo plano na inicialização (separados
+# por vírgula); só os já baixados são carregados. Vazio desativa.
+PRELOAD_MODELS = _env_list("ECHO_TRANSCRIBE_PRELOAD_MODELS", ["base"])
+
+# Contexto (segundos) decodificado antes e depois de cada trecho retranscrito;
+# as palavras do contexto são descartadas na junção
+RETRANSCRIBE_PADDING_SECONDS = max(0.0, _env_float("ECHO_TRANSCRIBE_RETRANSCRIBE_PADDING", 2.0))
+
+# Transcrições de áudios a partir desta duração (segundos) gravam cada segmento
+# em um checkpoint e, se interrompidas, são retomadas de onde pararam; 0 desativa
+CHECKPOINT_MIN_SECONDS = max(0.0, _env_float("ECHO_TRANSCRIBE_CHECKPOINT_SECONDS", 600.0))
+
+# Checkpoints sem atividade há mais deste tempo (horas) são descartados
+CHECKPOINT_MAX_AGE_HOURS = max(1.0, _env_float("ECHO_TRANSCRIBE_CHECKPOINT_MAX_AGE_HOURS", 168.0))
+
+# Registra a velocidade de cada transcrição (usada pelo modelo "auto" e por /models);
+# 0 desativa o registro, mantendo as medições já gravadas
+SPEED_STATS_ENABLED = _env_int("ECHO_TRANSCRIBE_SPEED_STATS", 1) > 0
+
+# Sem prazo informado, o modelo "auto" escolhe o mais preciso previsto para
+# terminar em até esta fração da duração do áudio
+AUTO_MAX_RTF = max(0.01, _env_float("ECHO_TRANSCRIBE_AUTO_MAX_RTF", 0.5))
+
+# Orçamento de memória (MB, RSS do processo) das transcrições simultâneas: as que
+# não cabem aguardam na fila em vez de levar a máquina ao swap. 0 usa 60% da
+# memória física; negativo desativa o controle
+MEMORY_BUDGET_MB = _env_int("ECHO_TRANSCRIBE_MEMORY_BUDGET_MB", 0)
@@ -0,0 +1,137 @@
+"""
+EchoTranscribe Backend - Pool de inferência
+Executa as transcrições fora do event loop, com uma fila de tamanho limitado
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+
+
+class QueueFullError(Exception):
+    """Lançada quando não há vagas no pool nem na fila de espera"""
+
+
+class InferencePool:
+    """
+    Pool de threads para executar a inferência do Whisper.
+
+    O CTranslate2 libera o GIL durante a inferência, então threads permitem
+    paralelismo real sem duplicar os pesos do modelo em vários processos.
+    O número de tarefas aceitas (em execução + na fila) é limitado; acima
+    disso `submit` lança QueueFullError imediatamente.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="whisper-worker"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def stats(self) -> dict:
+        """Retorna o estado atual do pool"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "running": self._running,
+                "queued": self._pending - self._running,
+            }
+
+    def _reserve(self):
+        with self._lock:
+            if self._pending >= self.capacity:
+                raise QueueFullError(
+                    f"Fila de transcrição cheia ({self._pending}/{self.capacity})"
+                )
+            self._pending += 1
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._pending -= 1
+
+    def _wrap(self, fn: Callable[..., Any]) -> Callable[[], Any]:
+        def runner():
+            with self._lock:
+                self._running += 1
+            try:
+                return fn()
+            finally:
+                with self._lock:
+                    self._running -= 1
+        return runner
+
+    def _dispatch(self, call: Callable[[], Any], on_done: Optional[Callable[[], None]]):
+        future = self._executor.submit(self._wrap(call))
+        future.add_done_callback(self._release)
+        if on_done is not None:
+            future.add_done_callback(lambda _future: on_done())
+        return future
+
+    async def _admit_and_run(
+        self,
+        admit: Callable[[], Awaitable[Callable[[], None]]],
+        call: Callable[[], Any]
+    ) -> Any:
+        try:
+            on_done = await admit()
+        except BaseException:
+            self._release()
+            raise
+        try:
+            future = self._dispatch(call, on_done)
+        except BaseException:
+            self._release()
+            on_done()
+            raise
+        return await asyncio.wrap_future(future)
+
+    def submit(
+        self,
+        fn: Callable[..., Any],
+        *args,
+        admit: Optional[Callable[[], Awaitable[Callable[[], None]]]] = None,
+        **kwargs
+    ) -> "asyncio.Future":
+        """
+        Agenda `fn` em uma thread do pool e devolve um future do asyncio.
+
+        A vaga é reservada imediatamente (QueueFullError se não houver) e só
+        é liberada quando a função termina de fato, mesmo que quem aguardava
+        o resultado seja cancelado.
+
+        Com `admit`, a função só vai para uma thread depois que a corrotina
+        `admit()` termina (a espera por memória, por exemplo): enquanto isso
+        a tarefa ocupa uma vaga na fila, mas não um worker, e as seguintes
+        podem passar à frente. `admit()` devolve a função chamada quando
+        `fn` termina ou é descartada sem rodar.
+        """
+        self._reserve()
+        call = functools.partial(fn, *args, **kwargs)
+        if admit is not None:
+            return asyncio.ensure_future(self._admit_and_run(admit, call))
+        try:
+            future = self._dispatch(call, None)
+        except BaseException:
+            self._release()
+            raise
+        return asyncio.wrap_future(future)
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Executa `fn` em uma thread do pool e aguarda o resultado"""
+        return await self.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait: bool = False):
+        """Encerra o pool, cancelando as tarefas que ainda não começaram"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
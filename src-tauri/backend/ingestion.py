@@ -0,0 +1,140 @@
+"""
+EchoTranscribe Backend - Recebimento de uploads
+Lê o upload em blocos assíncronos direto para a memória, transbordando para um arquivo mapeado em memória se for grande
+"""
+
+import asyncio
+import hashlib
+import io
+import logging
+import mmap
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Tamanho de cada leitura do upload
+READ_CHUNK_BYTES = 1024 * 1024
+
+
+class UploadedAudio:
+    """
+    Conteúdo de um upload: em memória (`data`) ou, acima do limite, em um
+    arquivo temporário (`path`) que é lido via mmap na decodificação.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        audio_hash: str,
+        size: int,
+        data: Optional[bytes] = None,
+        path: Optional[str] = None
+    ):
+        self.filename = filename
+        self.audio_hash = audio_hash
+        self.size = size
+        self.data = data
+        self.path = path
+
+    @property
+    def in_memory(self) -> bool:
+        return self.path is None
+
+    @contextmanager
+    def open(self) -> Iterator[BinaryIO]:
+        """Arquivo somente leitura para o decodificador, sem copiar o conteúdo"""
+        if self.path is None:
+            yield io.BytesIO(self.data)
+            return
+
+        with open(self.path, "rb") as f:
+            if self.size == 0:
+                # mmap não aceita arquivos vazios
+                yield f
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                yield mapped
+
+    def close(self):
+        """Libera o conteúdo e remove o arquivo de transbordo, se houver"""
+        self.data = None
+        if self.path is not None:
+            try:
+                os.unlink(self.path)
+                logger.info(f"Arquivo temporário removido: {self.path}")
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning(f"Erro ao remover arquivo temporário {self.path}: {e}")
+            self.path = None
+
+
+AudioSource = Union[str, UploadedAudio]
+
+
+@contextmanager
+def open_audio_source(source: AudioSource) -> Iterator[Union[str, BinaryIO]]:
+    """Caminho ou arquivo aceito pelo decodificador para um arquivo em disco ou um upload"""
+    if isinstance(source, UploadedAudio):
+        with source.open() as f:
+            yield f
+    else:
+        yield source
+
+
+async def ingest_upload(
+    file,
+    spill_bytes: int,
+    spill_dir: Path,
+    suffix: str = ""
+) -> UploadedAudio:
+    """
+    Lê o upload em blocos assíncronos calculando o hash SHA-256.
+
+    Uploads de até `spill_bytes` ficam em memória; os maiores são gravados
+    em um arquivo temporário em `spill_dir` (fora do event loop).
+    `spill_bytes=0` sempre grava em disco.
+    """
+    loop = asyncio.get_running_loop()
+    digest = hashlib.sha256()
+    buffer = bytearray()
+    spill_file = None
+    size = 0
+
+    try:
+        if spill_bytes <= 0:
+            spill_file = tempfile.NamedTemporaryFile(delete=False, suffix=suffix, dir=str(spill_dir))
+        while True:
+            chunk = await file.read(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            digest.update(chunk)
+            size += len(chunk)
+
+            if spill_file is None and size > spill_bytes:
+                spill_file = tempfile.NamedTemporaryFile(
+                    delete=False, suffix=suffix, dir=str(spill_dir)
+                )
+                chunk = bytes(buffer) + chunk
+                buffer = bytearray()
+
+            if spill_file is None:
+                buffer += chunk
+            else:
+                await loop.run_in_executor(None, spill_file.write, chunk)
+    except BaseException:
+        if spill_file is not None:
+            spill_file.close()
+            os.unlink(spill_file.name)
+        raise
+
+    if spill_file is None:
+        return UploadedAudio(file.filename, digest.hexdigest(), size, data=bytes(buffer))
+
+    spill_file.close()
+    logger.info(f"Arquivo temporário criado: {spill_file.name}")
+    return UploadedAudio(file.filename, digest.hexdigest(), size, path=spill_file.name)
@@ -0,0 +1,252 @@
+"""
+EchoTranscribe Backend - Jobs de transcrição em lote
+Os arquivos de todos os jobs são distribuídos entre os workers, dos mais curtos para os mais longos
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from cancellation import CancelToken, TranscriptionCancelled
+
+logger = logging.getLogger(__name__)
+
+# Taxa usada para estimar a duração quando o arquivo não pôde ser inspecionado (128 kbps)
+FALLBACK_BYTES_PER_SECOND = 16000
+
+
+class JobFile:
+    """Um arquivo dentro de um job"""
+
+    def __init__(
+        self,
+        index: int,
+        filename: str,
+        path: str,
+        temporary: bool = False,
+        duration: Optional[float] = None,
+        audio_hash: Optional[str] = None
+    ):
+        self.index = index
+        self.filename = filename
+        self.path = path
+        self.temporary = temporary
+        self.duration = duration
+        self.audio_hash = audio_hash
+        self.status = "pending"
+        self.result: Optional[dict] = None
+        self.error: Optional[str] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    @property
+    def estimated_duration(self) -> float:
+        """Duração usada na ordenação (estimada pelo tamanho se desconhecida)"""
+        if self.duration is not None:
+            return self.duration
+        try:
+            return os.path.getsize(self.path) / FALLBACK_BYTES_PER_SECOND
+        except OSError:
+            return float("inf")
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "error", "cancelled")
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        data = {
+            "index": self.index,
+            "filename": self.filename,
+            "status": self.status,
+            "duration": self.duration,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+        if include_result and self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+class BatchJob:
+    """Um conjunto de arquivos transcritos com as mesmas opções"""
+
+    def __init__(self, files: List[JobFile], options: dict):
+        self.id = uuid.uuid4().hex
+        self.files = files
+        self.options = options
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.cancelled = False
+        # Verificado pelas transcrições em andamento do job
+        self.cancel_token = CancelToken()
+        self.done = asyncio.Event()
+        self._subscribers: List[asyncio.Queue] = []
+
+    @property
+    def status(self) -> str:
+        if self.done.is_set():
+            return "cancelled" if self.cancelled else "completed"
+        if self.cancelled:
+            return "cancelling"
+        if any(f.status != "pending" for f in self.files):
+            return "running"
+        return "pending"
+
+    def counts(self) -> Dict[str, int]:
+        counts = {"pending": 0, "processing": 0, "completed": 0, "error": 0, "cancelled": 0}
+        for job_file in self.files:
+            counts[job_file.status] += 1
+        return counts
+
+    def to_dict(self, include_results: bool = True) -> dict:
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at,
+            "options": self.options,
+            "total_files": len(self.files),
+            **self.counts(),
+            "files": [f.to_dict(include_results) for f in self.files],
+        }
+
+    def subscribe(self) -> asyncio.Queue:
+        """Fila que recebe (evento, dados) a cada mudança de estado do job"""
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        if queue in self._subscribers:
+            self._subscribers.remove(queue)
+
+    def publish(self, event: str, data: dict):
+        for queue in self._subscribers:
+            queue.put_nowait((event, data))
+
+
+class JobManager:
+    """
+    Agenda os arquivos de todos os jobs em uma fila de prioridade única.
+
+    `workers` tarefas consomem a fila; cada arquivo é processado por
+    `process_file`, que deve executar a transcrição e retornar o resultado.
+    """
+
+    def __init__(
+        self,
+        process_file: Callable[[BatchJob, JobFile], Awaitable[dict]],
+        workers: int,
+        max_finished_jobs: int = 100
+    ):
+        self._process_file = process_file
+        self.workers = workers
+        self.max_finished_jobs = max_finished_jobs
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._sequence = itertools.count()
+
+    def _ensure_workers(self):
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        self._tasks = [task for task in self._tasks if not task.done()]
+        while len(self._tasks) < self.workers:
+            self._tasks.append(asyncio.ensure_future(self._worker()))
+
+    def create_job(self, files: List[JobFile], options: dict) -> BatchJob:
+        """Cria o job e coloca seus arquivos na fila, do mais curto para o mais longo"""
+        self._ensure_workers()
+        job = BatchJob(files, options)
+        self._jobs[job.id] = job
+        self._prune()
+
+        for job_file in files:
+            if job_file.finished:
+                continue
+            priority = (job_file.estimated_duration, next(self._sequence))
+            self._queue.put_nowait((priority, job, job_file))
+
+        logger.info(f"Job {job.id} criado com {len(files)} arquivo(s)")
+        self._check_done(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[BatchJob]:
+        return self._jobs.get(job_id)
+
+    def list(self) -> List[BatchJob]:
+        return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> Optional[BatchJob]:
+        """Cancela os arquivos pendentes; os que já estão em execução param no próximo segmento"""
+        job = self._jobs.get(job_id)
+        if job is None or job.done.is_set():
+            return job
+
+        job.cancelled = True
+        job.cancel_token.cancel()
+        for job_file in job.files:
+            if job_file.status == "pending":
+                self._finish_file(job, job_file, "cancelled")
+        logger.info(f"Job {job.id} cancelado")
+        self._check_done(job)
+        return job
+
+    def _prune(self):
+        """Descarta os jobs finalizados mais antigos acima do limite"""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done.is_set()]
+        for job_id in finished[: max(0, len(finished) - self.max_finished_jobs)]:
+            del self._jobs[job_id]
+
+    def _finish_file(self, job: BatchJob, job_file: JobFile, status: str):
+        job_file.status = status
+        job_file.finished_at = time.time()
+        if job_file.temporary:
+            try:
+                os.unlink(job_file.path)
+            except OSError:
+                pass
+        job.publish("file", job_file.to_dict())
+
+    def _check_done(self, job: BatchJob):
+        if not job.done.is_set() and all(f.finished for f in job.files):
+            job.finished_at = time.time()
+            job.done.set()
+            job.publish("job", job.to_dict(include_results=False))
+
+    async def _worker(self):
+        while True:
+            _, job, job_file = await self._queue.get()
+            try:
+                if job_file.status != "pending":
+                    continue
+
+                job_file.status = "processing"
+                job_file.started_at = time.time()
+                job.publish("file", job_file.to_dict())
+
+                try:
+                    job_file.result = await self._process_file(job, job_file)
+                    status = "completed"
+                except TranscriptionCancelled:
+                    status = "cancelled"
+                except Exception as e:
+                    job_file.error = getattr(e, "detail", None) or str(e)
+                    logger.error(f"Erro ao transcrever {job_file.filename}: {job_file.error}")
+                    status = "error"
+
+                self._finish_file(job, job_file, status)
+                self._check_done(job)
+            finally:
+                self._queue.task_done()
+
+    def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
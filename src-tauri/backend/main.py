@@ -5,19 +5,64 @@ Author: paladini (https://github.com/paladini)
 Repository: https://github.com/paladini/echo-transcribe
 """
 
-import os
 import asyncio
-import tempfile
-import shutil
+import bisect
 import socket
+import time
+import json
+import uuid
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, Dict, List, Literal, NamedTuple, Optional, Tuple
+
+# Referência para o relatório de tempo de inicialização
+STARTUP_BEGAN = time.perf_counter()
+
+# O NumPy fica fora do carregamento adiado (warmup.py): os módulos de áudio
+# (chunking, batching, pcm_cache, splicing, word_columns) o usam em nível de
+# módulo, e ele custa ~85 ms de ~1,2 s de importação (o FastAPI sozinho leva
+# ~0,9 s), contra segundos do faster-whisper/CTranslate2
+import numpy as np
 import uvicorn
-from fastapi import FastAPI, UploadFile, File, HTTPException, BackgroundTasks
+from fastapi import (
+    FastAPI, UploadFile, File, HTTPException, BackgroundTasks, Depends, Header, Request
+)
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
 import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from audio_processing import (
+    SAMPLING_RATE, load_audio, detect_language, probe_duration, remove_silence,
+    restore_timestamps, shift_segments, speech_position
+)
+from config import (
+    INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE, RETRY_AFTER_SECONDS, MODEL_CACHE_MEMORY_MB,
+    RESULT_CACHE_MB, PCM_CACHE_MB, LONG_AUDIO_THRESHOLD_SECONDS, CHUNK_SECONDS,
+    CHUNK_OVERLAP_SECONDS, CHUNK_WORKERS, DEVICE, COMPUTE_TYPE, COMPUTE_TYPES, CPU_THREADS,
+    NUM_WORKERS, MODEL_OPTIONS, UPLOAD_SPILL_MB, ALLOWED_LOCAL_DIRS, DECODE_BATCH_SIZE,
+    DECODE_BATCH_WAIT_MS, PRELOAD_MODELS, RETRANSCRIBE_PADDING_SECONDS, CHECKPOINT_MIN_SECONDS,
+    CHECKPOINT_MAX_AGE_HOURS, SPEED_STATS_ENABLED, AUTO_MAX_RTF, MEMORY_BUDGET_MB
+)
+from admission import MemoryAdmission, physical_memory_bytes
+from batching import DecodeBatcher, can_batch, transcribe_batched
+from cancellation import CancelToken, CancellationRegistry, TranscriptionCancelled
+from checkpoints import CheckpointStore
+from chunking import transcribe_chunked
+from inference_pool import InferencePool, QueueFullError
+from ingestion import AudioSource, UploadedAudio, ingest_upload, open_audio_source
+from jobs import JobManager, BatchJob, JobFile
+from metrics import CONTENT_TYPE, RTF_BUCKETS, Histogram, StageTimer, render_samples
+from model_registry import ModelRegistry
+from pcm_cache import PcmCache
+from result_cache import ResultCache, make_cache_key, file_sha256
+from speed_stats import SpeedStats
+from splicing import (
+    merge_ranges, segments_text, snap_to_segments, splice_transcript, transcribe_range
+)
+from warmup import WARMUP_SECONDS, ModelWarmer, synthetic_clip
+from word_columns import COLUMNAR_MEDIA_TYPE, to_columns, wants_columnar
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -55,13 +100,105 @@ class TranscriptionResponse(BaseModel):
     confidence: Optional[float] = None
     processing_time: Optional[float] = None
     detected_language: Optional[str] = None
+    language_probability: Optional[float] = None
     word_timestamps: Optional[List[dict]] = None
+    audio_duration: Optional[float] = None
+    skipped_duration: Optional[float] = None  # Silêncio ignorado pelo VAD (segundos)
+    from_cache: bool = False
+    timings: Optional[Dict[str, float]] = None  # Segundos gastos em cada etapa
+    # Palavras em colunas, no lugar de word_timestamps, com Accept: COLUMNAR_MEDIA_TYPE
+    words: Optional[dict] = None
+    # Identificador do resultado salvo, usado para retranscrever trechos
+    result_id: Optional[str] = None
+    # Modelo e perfil usados (os escolhidos, com model=auto)
+    model: Optional[str] = None
+    profile: Optional[str] = None
+
+# Perfis de decodificação: trocam precisão por velocidade
+DECODING_PROFILES = {
+    # Busca gulosa e sem alinhamento por palavra: prévias interativas
+    "fast": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "word_timestamps": False,
+        "condition_on_previous_text": False
+    },
+    "balanced": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": 0.0,
+        "word_timestamps": True,  # Habilitar timestamps por palavra
+        "condition_on_previous_text": False
+    },
+    # Feixe maior e nova tentativa com temperatura mais alta quando a decodificação falha
+    "accurate": {
+        "beam_size": 8,
+        "best_of": 5,
+        "temperature": [0.0, 0.2, 0.4, 0.6, 0.8, 1.0],
+        "word_timestamps": True,
+        "condition_on_previous_text": True
+    }
+}
+
+DecodingProfile = Literal["fast", "balanced", "accurate"]
+
+class TranscriptionParameters(BaseModel):
+    """
+    Parâmetros de transcrição comuns a todos os endpoints (recebidos como query params)
+    
+    Args:
+        language: Código do idioma (opcional, auto-detecta se não especificado)
+        auto_detect_language: Se deve detectar automaticamente o idioma
+        use_cache: Se deve reutilizar um resultado já calculado para o mesmo áudio
+        vad_*: Pré-processamento com VAD (vad_filter=true decodifica apenas as regiões com fala)
+        long_audio: Divide o áudio em blocos decodificados em paralelo
+            (None decide automaticamente pela duração)
+        profile: Perfil de decodificação (fast, balanced ou accurate)
+        word_timestamps: Gera os timestamps por palavra (None segue o perfil)
+    """
+    language: Optional[str] = None
+    auto_detect_language: bool = True
+    use_cache: bool = True
+    vad_filter: bool = False
+    vad_threshold: float = 0.5
+    vad_min_speech_ms: int = 250
+    vad_min_silence_ms: int = 2000
+    vad_speech_pad_ms: int = 400
+    long_audio: Optional[bool] = None
+    profile: DecodingProfile = "balanced"
+    word_timestamps: Optional[bool] = None
+    
+    def decoding_options(self) -> dict:
+        """Parâmetros de decodificação do perfil, com as sobrescritas da requisição"""
+        options = dict(DECODING_PROFILES[self.profile])
+        if self.word_timestamps is not None:
+            options["word_timestamps"] = self.word_timestamps
+        return options
+    
+    def vad_options(self) -> Optional[dict]:
+        """Opções para o VAD, ou None se o filtro estiver desativado"""
+        if not self.vad_filter:
+            return None
+        return {
+            "threshold": self.vad_threshold,
+            "min_speech_duration_ms": self.vad_min_speech_ms,
+            "min_silence_duration_ms": self.vad_min_silence_ms,
+            "speech_pad_ms": self.vad_speech_pad_ms
+        }
 
 class ModelInfo(BaseModel):
     name: str
     size: str
     description: str
     available: bool
+    compute_type: Optional[str] = None
+    loaded: bool = False
+    warm: bool = False
+    # Fator de tempo real por perfil: {real_time_factor, samples}; samples=0 é uma estimativa
+    speed: Dict[str, dict] = {}
+    # Tempo medido de carregamento do modelo (segundos)
+    load_seconds: Optional[float] = None
 
 class BatchTranscriptionResponse(BaseModel):
     results: List[dict]
@@ -74,9 +211,36 @@ class BatchTranscriptionRequest(BaseModel):
     model: str
     language: Optional[str] = None
 
+class LocalFileRequest(BaseModel):
+    path: str
+
+class TimeRange(BaseModel):
+    start: float  # segundos
+    end: float
+
+class RetranscribeRequest(BaseModel):
+    ranges: List[TimeRange]
+    # Arquivo original, necessário apenas se o áudio não estiver mais no cache
+    path: Optional[str] = None
+    # Contexto decodificado em volta de cada trecho (None usa o padrão da configuração)
+    padding: Optional[float] = None
+
+class DirectoryJobRequest(TranscriptionParameters):
+    directory: str
+    recursive: bool = False
+    model: str = "base"
+
 # Variáveis globais
 MODELS_DIR = Path.home() / ".echo-transcribe" / "models"
 TEMP_DIR = Path.home() / ".echo-transcribe" / "temp"
+RESULTS_DIR = Path.home() / ".echo-transcribe" / "results"
+PCM_DIR = Path.home() / ".echo-transcribe" / "pcm"
+CHECKPOINTS_DIR = Path.home() / ".echo-transcribe" / "checkpoints"
+SPEED_STATS_PATH = Path.home() / ".echo-transcribe" / "speed.json"
+
+# Formatos de áudio aceitos
+ALLOWED_EXTENSIONS = {'.mp3', '.wav', '.flac', '.m4a', '.ogg', '.webm'}
+
 
 # Criar diretórios se não existirem
 MODELS_DIR.mkdir(parents=True, exist_ok=True)
@@ -110,41 +274,76 @@ AVAILABLE_MODELS = [
     )
 ]
 
+# Modelo que escolhe, pela velocidade medida, o mais preciso que termina no prazo
+AUTO_MODEL = "auto"
+
 def check_model_availability():
     """Verifica quais modelos estão disponíveis localmente"""
     for model in AVAILABLE_MODELS:
         model_path = MODELS_DIR / f"whisper-{model.name}"
         model.available = model_path.exists()
 
-# Variável para armazenar o modelo carregado
-current_model = None
-current_model_name = None
-
-def load_whisper_model(model_name: str):
-    """Carrega o modelo Whisper especificado"""
-    global current_model, current_model_name
+class ModelSpec(NamedTuple):
+    """Modelo e opções de carregamento; é a chave do registro de modelos"""
+    name: str
+    device: str
+    compute_type: str
+    cpu_threads: int
+    num_workers: int
     
+    def __str__(self) -> str:
+        return f"{self.name} ({self.compute_type})"
+
+@lru_cache(maxsize=None)
+def model_spec(model_name: str) -> ModelSpec:
+    """Opções de carregamento do modelo: configuração do servidor com as sobrescritas do modelo"""
+    overrides = MODEL_OPTIONS.get(model_name) or {}
+    compute_type = str(overrides.get("compute_type", COMPUTE_TYPE)).lower()
+    if compute_type not in COMPUTE_TYPES:
+        logger.warning(f"compute_type {compute_type} inválido para {model_name}, usando {COMPUTE_TYPE}")
+        compute_type = COMPUTE_TYPE
+    try:
+        cpu_threads = max(0, int(overrides.get("cpu_threads", CPU_THREADS)))
+        num_workers = max(1, int(overrides.get("num_workers", NUM_WORKERS)))
+    except (TypeError, ValueError):
+        logger.warning(f"Opções inválidas para {model_name}: {overrides}")
+        cpu_threads, num_workers = CPU_THREADS, NUM_WORKERS
+    return ModelSpec(
+        name=model_name,
+        device=str(overrides.get("device", DEVICE)),
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        num_workers=num_workers
+    )
+
+def load_whisper_model(spec: ModelSpec):
+    """Carrega o modelo Whisper especificado (use model_registry.acquire para obter modelos)"""
+    model_name = spec.name
     try:
         # Importar faster-whisper apenas quando necessário
         from faster_whisper import WhisperModel
         
-        if current_model_name == model_name and current_model is not None:
-            logger.info(f"Modelo {model_name} já carregado")
-            return current_model
-            
-        logger.info(f"Carregando modelo {model_name}...")
+        logger.info(
+            f"Carregando modelo {model_name} ({spec.compute_type}, {spec.cpu_threads} thread(s), "
+            f"{spec.num_workers} worker(s))..."
+        )
         model_path = MODELS_DIR / f"whisper-{model_name}"
+        load_options = {
+            "device": spec.device,
+            "compute_type": spec.compute_type,
+            "cpu_threads": spec.cpu_threads,
+            "num_workers": spec.num_workers
+        }
         
         if not model_path.exists():
             # Baixar modelo se não existir
             logger.info(f"Baixando modelo {model_name}...")
-            current_model = WhisperModel(model_name, download_root=str(MODELS_DIR))
+            whisper_model = WhisperModel(model_name, download_root=str(MODELS_DIR), **load_options)
         else:
-            current_model = WhisperModel(str(model_path))
+            whisper_model = WhisperModel(str(model_path), **load_options)
             
-        current_model_name = model_name
         logger.info(f"Modelo {model_name} carregado com sucesso")
-        return current_model
+        return whisper_model
         
     except ImportError:
         logger.error("faster-whisper não está instalado")
@@ -159,6 +358,166 @@ def load_whisper_model(model_name: str):
             detail=f"Erro ao carregar modelo: {str(e)}"
         )
 
+def estimate_model_memory(spec: ModelSpec, whisper_model) -> int:
+    """Estima a memória ocupada pelo modelo a partir do tamanho dos pesos em disco"""
+    model_name = spec.name
+    model_path = MODELS_DIR / f"whisper-{model_name}"
+    if model_path.is_dir():
+        return sum(f.stat().st_size for f in model_path.rglob("*") if f.is_file())
+    
+    # Modelo baixado no cache do Hugging Face: usar o tamanho anunciado
+    for model in AVAILABLE_MODELS:
+        if model.name == model_name:
+            value, unit = model.size.split()
+            return int(float(value) * (1024 ** 3 if unit == "GB" else 1024 ** 2))
+    return 0
+
+def describe_model(spec: ModelSpec, whisper_model) -> dict:
+    """Opções com que o modelo foi carregado, para /models/loaded"""
+    # O CTranslate2 informa o tipo efetivo (pode diferir do pedido se o hardware não suportar)
+    compute_type = getattr(getattr(whisper_model, "model", None), "compute_type", None)
+    return {
+        "name": spec.name,
+        "device": spec.device,
+        "compute_type": compute_type if isinstance(compute_type, str) else spec.compute_type,
+        "cpu_threads": spec.cpu_threads,
+        "num_workers": spec.num_workers
+    }
+
+# Memória de trabalho da inferência (ativações, buffers do decodificador) em relação aos pesos
+MODEL_WORKING_MEMORY_RATIO = 0.5
+
+# Sem a duração, o áudio decodificado é estimado pelo tamanho do arquivo
+# (PCM float32 a 16 kHz ocupa ~4x um arquivo comprimido a 128 kbps)
+PCM_BYTES_PER_FILE_BYTE = 4
+
+def transcription_memory_budget() -> Optional[int]:
+    """Orçamento de memória das transcrições; None se desativado ou se a memória física for desconhecida"""
+    if MEMORY_BUDGET_MB < 0:
+        return None
+    if MEMORY_BUDGET_MB > 0:
+        return MEMORY_BUDGET_MB * 1024 * 1024
+    total = physical_memory_bytes()
+    return int(total * 0.6) if total else None
+
+def estimate_request_memory(
+    spec: ModelSpec,
+    audio_seconds: Optional[float],
+    file_bytes: Optional[int],
+    vad: bool = False
+) -> int:
+    """
+    Memória que a transcrição vai ocupar além da já residente: o áudio
+    decodificado, a memória de trabalho do modelo e, se ele não estiver
+    carregado, os pesos
+    """
+    if audio_seconds is not None:
+        pcm_bytes = audio_seconds * SAMPLING_RATE * 4
+    else:
+        pcm_bytes = (file_bytes or 0) * PCM_BYTES_PER_FILE_BYTE
+    if vad:
+        # O VAD mantém uma segunda cópia, só com as regiões de fala
+        pcm_bytes *= 2
+    weights = estimate_model_memory(spec, None)
+    model_bytes = weights * MODEL_WORKING_MEMORY_RATIO
+    if not model_registry.is_loaded(spec):
+        model_bytes += weights
+    return int(pcm_bytes + model_bytes)
+
+# Modelos carregados, mantidos em memória com despejo LRU
+model_registry = ModelRegistry(
+    load_whisper_model,
+    memory_budget_bytes=MODEL_CACHE_MEMORY_MB * 1024 * 1024,
+    memory_estimator=estimate_model_memory,
+    describer=describe_model
+)
+
+# Cache em disco dos resultados já transcritos
+result_cache = ResultCache(RESULTS_DIR, RESULT_CACHE_MB * 1024 * 1024)
+
+# Cache em disco do áudio já decodificado, para repetir a transcrição sem decodificar
+pcm_cache = PcmCache(PCM_DIR, PCM_CACHE_MB * 1024 * 1024)
+
+# Segmentos das transcrições longas, para retomá-las após uma interrupção
+checkpoint_store = CheckpointStore(CHECKPOINTS_DIR, CHECKPOINT_MAX_AGE_HOURS * 3600)
+
+# Admissão das transcrições pelo orçamento de memória: as que não cabem aguardam
+memory_admission = MemoryAdmission(transcription_memory_budget())
+
+# Velocidade medida de cada modelo nesta máquina (modelo "auto" e /models)
+speed_stats = SpeedStats(SPEED_STATS_PATH)
+
+# Gravação do cache de áudio fora do caminho da transcrição
+pcm_cache_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pcm-cache")
+
+# Pool de threads onde a inferência é executada, fora do event loop
+inference_pool = InferencePool(INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE)
+
+# Transcrições em andamento, canceláveis pelo ID da requisição (cabeçalho X-Request-ID)
+active_transcriptions = CancellationRegistry()
+
+# Intervalo (segundos) entre as verificações de desconexão do cliente
+DISCONNECT_POLL_SECONDS = 0.5
+
+CANCELLED_DETAIL = "Transcrição cancelada"
+
+# Threads que decodificam os blocos de áudios longos em paralelo
+chunk_executor = ThreadPoolExecutor(max_workers=CHUNK_WORKERS, thread_name_prefix="whisper-chunk")
+
+def warm_up_model(whisper_model):
+    """Decodifica um clipe sintético curto para que a primeira transcrição não pague a inicialização"""
+    segments, _ = whisper_model.transcribe(
+        synthetic_clip(), language="en", **DECODING_PROFILES["balanced"]
+    )
+    list(segments)
+
+async def run_warmup_job(spec: ModelSpec, load_and_warm: Callable[[], None]):
+    """
+    Carrega e aquece um modelo na inicialização como uma transcrição: numa
+    vaga do pool de inferência e dentro do orçamento de memória, sem
+    disputar workers nem memória com as transcrições dos usuários
+    """
+    admit = admission_gate(
+        lambda: estimate_request_memory(spec, WARMUP_SECONDS, None),
+        CancelToken(),
+        f"pré-carregamento de {spec}"
+    )
+    await inference_pool.submit(load_and_warm, admit=admit)
+
+# Pré-carregamento na inicialização e estado de aquecimento de cada modelo
+model_warmer = ModelWarmer(model_registry, warm_up_model, run_warmup_job)
+
+# Segundos desde a importação do módulo até a API aceitar requisições
+startup_time: Optional[float] = None
+
+# Encerramento do backend em andamento: as transcrições interrompidas por ele
+# mantêm o checkpoint, para serem retomadas na próxima inicialização
+shutting_down = False
+
+# Métricas expostas em /metrics
+stage_seconds = Histogram(
+    "echo_transcribe_stage_seconds",
+    "Tempo gasto em cada etapa da transcrição",
+    ["stage", "model"]
+)
+real_time_factor = Histogram(
+    "echo_transcribe_real_time_factor",
+    "Tempo de processamento dividido pela duração do áudio",
+    ["model"],
+    buckets=RTF_BUCKETS
+)
+
+def record_timings(model_name: str, timer: StageTimer) -> Dict[str, float]:
+    """Registra o tempo das etapas nas métricas e devolve o detalhamento para a resposta"""
+    for stage, seconds in timer.timings.items():
+        stage_seconds.observe(seconds, stage=stage, model=model_name)
+    return dict(timer.timings)
+
+# Agrupa janelas de 30 s de todas as transcrições em lotes (None se desativado)
+decode_batcher = (
+    DecodeBatcher(DECODE_BATCH_SIZE, DECODE_BATCH_WAIT_MS) if DECODE_BATCH_SIZE > 1 else None
+)
+
 @app.get("/")
 async def root():
     """Endpoint raiz para verificar se a API está funcionando"""
@@ -167,307 +526,1777 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Endpoint de health check"""
-    return {"status": "healthy", "timestamp": asyncio.get_event_loop().time()}
+    return {
+        "status": "healthy",
+        "timestamp": asyncio.get_event_loop().time(),
+        "startup_time": startup_time,
+        "inference": inference_pool.stats(),
+        "result_cache": result_cache.stats(),
+        "pcm_cache": pcm_cache.stats(),
+        "checkpoints": {"enabled": CHECKPOINT_MIN_SECONDS > 0, **checkpoint_store.stats()},
+        "speed": {"enabled": SPEED_STATS_ENABLED, **speed_stats.stats()},
+        # Memória do processo e reservas das transcrições admitidas
+        "memory": memory_admission.stats(),
+        # Modelos prontos para transcrever sem carregamento nem aquecimento
+        "readiness": {
+            **model_warmer.stats(),
+            "warm_models": [spec.name for spec in model_warmer.warm_keys()]
+        },
+        "batching": decode_batcher.stats() if decode_batcher is not None else {"enabled": False},
+        # Permite ao cliente enviar caminhos locais (/transcribe-path) em vez do arquivo
+        "local_files": {
+            "enabled": bool(ALLOWED_LOCAL_DIRS),
+            "allowed_dirs": [str(directory) for directory in ALLOWED_LOCAL_DIRS]
+        }
+    }
 
 @app.get("/models", response_model=List[ModelInfo])
 async def get_models():
-    """Lista todos os modelos disponíveis"""
+    """
+    Lista todos os modelos disponíveis, com o tipo de computação usado por
+    cada um e a velocidade medida nesta máquina (fator de tempo real por perfil)
+    """
     check_model_availability()
-    return AVAILABLE_MODELS
+    loaded = {model["name"]: model for model in model_registry.stats()["models"]}
+    warm = {spec.name for spec in model_warmer.warm_keys()}
+    models = []
+    for model in AVAILABLE_MODELS:
+        info = loaded.get(model.name)
+        compute_type = info["compute_type"] if info else model_spec(model.name).compute_type
+        speed = {}
+        for profile in DECODING_PROFILES:
+            rtf, samples = speed_stats.estimate(model.name, compute_type, profile)
+            speed[profile] = {"real_time_factor": rtf, "samples": samples}
+        models.append(model.model_copy(update={
+            "compute_type": compute_type,
+            "loaded": info is not None,
+            "warm": model.name in warm,
+            "speed": speed,
+            "load_seconds": speed_stats.load_seconds(model.name, compute_type)
+        }))
+    return models
 
-@app.post("/transcribe", response_model=TranscriptionResponse)
-async def transcribe_audio(
-    background_tasks: BackgroundTasks,
-    file: UploadFile = File(...),
-    model: str = "base",
-    language: Optional[str] = None,
-    auto_detect_language: bool = True
-):
+@app.get("/models/loaded")
+async def get_loaded_models():
+    """Lista os modelos carregados em memória, com uso de memória e estatísticas do cache"""
+    return model_registry.stats()
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Métricas no formato de texto do Prometheus: etapas, fator de tempo real, fila, caches e memória"""
+    inference = inference_pool.stats()
+    registry = model_registry.stats()
+    caches = {"result": result_cache.stats(), "pcm": pcm_cache.stats(), "model": registry}
+    # Caches em disco desativados não têm contadores
+    caches = {name: stats for name, stats in caches.items() if stats.get("enabled", True)}
+    
+    lines = stage_seconds.render() + real_time_factor.render()
+    lines += render_samples(
+        "echo_transcribe_inference_running", "Transcrições em execução no pool", "gauge",
+        [({}, inference["running"])]
+    )
+    lines += render_samples(
+        "echo_transcribe_inference_queued", "Transcrições aguardando um worker", "gauge",
+        [({}, inference["queued"])]
+    )
+    lines += render_samples(
+        "echo_transcribe_inference_capacity", "Vagas do pool (workers + fila)", "gauge",
+        [({}, inference["workers"] + inference["max_queue"])]
+    )
+    lines += render_samples(
+        "echo_transcribe_cache_hits_total", "Consultas atendidas pelo cache", "counter",
+        [({"cache": name}, stats["hits"]) for name, stats in caches.items()]
+    )
+    lines += render_samples(
+        "echo_transcribe_cache_misses_total", "Consultas não atendidas pelo cache", "counter",
+        [({"cache": name}, stats["misses"]) for name, stats in caches.items()]
+    )
+    lines += render_samples(
+        "echo_transcribe_cache_hit_ratio", "Fração das consultas atendidas pelo cache", "gauge",
+        [
+            ({"cache": name}, stats["hits"] / (stats["hits"] + stats["misses"]))
+            for name, stats in caches.items() if stats["hits"] + stats["misses"]
+        ]
+    )
+    lines += render_samples(
+        "echo_transcribe_cache_size_bytes", "Espaço ocupado em disco pelo cache", "gauge",
+        [({"cache": name}, stats["size_bytes"]) for name, stats in caches.items() if name != "model"]
+    )
+    lines += render_samples(
+        "echo_transcribe_model_memory_bytes", "Memória estimada de cada modelo carregado", "gauge",
+        [
+            ({"model": model["name"], "compute_type": model["compute_type"]}, model["memory_bytes"])
+            for model in registry["models"]
+        ]
+    )
+    lines += render_samples(
+        "echo_transcribe_model_memory_budget_bytes", "Orçamento de memória dos modelos", "gauge",
+        [({}, registry["memory_budget_bytes"])]
+    )
+    memory = memory_admission.stats()
+    if memory["rss_bytes"] is not None:
+        lines += render_samples(
+            "echo_transcribe_memory_rss_bytes", "Memória residente do processo", "gauge",
+            [({}, memory["rss_bytes"])]
+        )
+    lines += render_samples(
+        "echo_transcribe_memory_reserved_bytes", "Memória reservada pelas transcrições admitidas",
+        "gauge", [({}, memory["reserved_bytes"])]
+    )
+    lines += render_samples(
+        "echo_transcribe_memory_waiting", "Transcrições aguardando memória", "gauge",
+        [({}, memory["waiting"])]
+    )
+    if decode_batcher is not None:
+        lines += render_samples(
+            "echo_transcribe_batch_pending_windows", "Janelas aguardando a decodificação em lote",
+            "gauge", [({}, decode_batcher.stats()["pending_windows"])]
+        )
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=CONTENT_TYPE)
+
+# Campos do resultado salvo que só servem à retranscrição de trechos
+INTERNAL_RESULT_KEYS = ("segments", "audio_hash")
+
+def public_result(result: dict) -> dict:
+    """Resultado sem os campos internos, para respostas que repassam o dict inteiro"""
+    return {key: value for key, value in result.items() if key not in INTERNAL_RESULT_KEYS}
+
+def run_transcription(
+    source: AudioSource,
+    model_name: str,
+    params: TranscriptionParameters,
+    on_segment: Optional[Callable[[dict], None]] = None,
+    cache_key: Optional[str] = None,
+    audio_hash: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+    cancel_token: Optional[CancelToken] = None
+) -> dict:
     """
-    Transcreve um arquivo de áudio
+    Executa a transcrição de forma síncrona (chamada dentro do pool de inferência)
+
+    `source` é o caminho de um arquivo ou um upload recebido em memória.
+    Se `on_segment` for informado, ele é chamado para cada segmento assim
+    que o segmento é decodificado. Se `cache_key` for informado, o
+    resultado é salvo no cache de resultados. Com `audio_hash` (implícito
+    em uploads), o áudio decodificado é lido do/salvo no cache de áudio.
+    `timer` acumula o tempo de cada etapa, incluindo as anteriores à chamada.
+    Áudios longos com `cache_key` gravam um checkpoint a cada segmento e,
+    se interrompidos, continuam do último segmento gravado.
+    Com `cancel_token` cancelado, lança TranscriptionCancelled antes do
+    próximo segmento, liberando o worker. Cancelada ou com erro, a
+    transcrição descarta o checkpoint (exceto durante o encerramento).
+    A espera pela memória acontece antes, fora do worker (admission_gate).
+
+    Returns:
+        dict com text, processing_time, detected_language, language_probability,
+        word_timestamps, audio_duration, skipped_duration e timings
+    """
+    timer = timer or StageTimer()
+    timer.end("queue_wait")
+    cancel_token = cancel_token or CancelToken()
+    # Cancelada enquanto aguardava na fila
+    cancel_token.check()
+    if audio_hash is None and isinstance(source, UploadedAudio):
+        audio_hash = source.audio_hash
     
-    Args:
-        file: Arquivo de áudio (MP3, WAV, FLAC, M4A)
-        model: Nome do modelo a ser usado (tiny, base, small, medium)
-        language: Código do idioma (opcional, auto-detecta se não especificado)
-        auto_detect_language: Se deve detectar automaticamente o idioma
+    # Obter o modelo do cache (carregando se necessário); ele não é removido
+    # da memória enquanto esta transcrição estiver em andamento
+    spec = model_spec(model_name)
+    try:
+        was_loaded = model_registry.is_loaded(spec)
+        load_started = time.perf_counter()
+        with model_registry.acquire(spec) as whisper_model:
+            load_seconds = time.perf_counter() - load_started
+            timer.add("model_load", load_seconds)
+            result = transcribe_with_model(
+                whisper_model, model_name, source, params, on_segment, audio_hash, timer,
+                cancel_token, checkpoint_key=cache_key
+            )
+    except Exception:
+        # Cancelada pelo usuário, ou com um erro que se repetiria a cada
+        # inicialização: não retomar. Só uma queda ou o encerramento do
+        # backend deixam o checkpoint para depois
+        if cache_key is not None and not shutting_down:
+            checkpoint_store.discard(cache_key)
+        raise
+    model_warmer.mark_warm(spec)
+    
+    if result["audio_duration"]:
+        real_time_factor.observe(
+            result["processing_time"] / result["audio_duration"], model=model_name
+        )
+    if SPEED_STATS_ENABLED:
+        if not was_loaded:
+            speed_stats.observe_load(model_name, spec.compute_type, load_seconds)
+        speed_stats.observe(
+            model_name, spec.compute_type, params.profile,
+            result["processing_time"], result["audio_duration"]
+        )
+    result["timings"] = record_timings(model_name, timer)
+    result["model"] = model_name
+    result["profile"] = params.profile
+    
+    result["audio_hash"] = audio_hash
+    if cache_key is not None and result_cache.enabled:
+        result["result_id"] = cache_key
+        result_cache.put(cache_key, result)
+    if cache_key is not None:
+        # Transcrição concluída: o checkpoint não é mais necessário
+        checkpoint_store.discard(cache_key)
+    return result
+
+def decode_source(source: AudioSource, audio_hash: Optional[str] = None):
+    """Decodifica o áudio, reaproveitando o cache de áudio quando o hash é conhecido"""
+    if audio_hash is None and isinstance(source, UploadedAudio):
+        audio_hash = source.audio_hash
+    
+    if audio_hash is not None:
+        audio = pcm_cache.get(audio_hash)
+        if audio is not None:
+            logger.info("Áudio decodificado lido do cache")
+            return audio
+    
+    with open_audio_source(source) as audio_file:
+        audio = load_audio(audio_file)
+    
+    if audio_hash is not None and pcm_cache.enabled:
+        pcm_cache_writer.submit(pcm_cache.put, audio_hash, audio)
+    return audio
+
+def transcribe_with_model(
+    whisper_model,
+    model_name: str,
+    source: AudioSource,
+    params: TranscriptionParameters,
+    on_segment: Optional[Callable[[dict], None]] = None,
+    audio_hash: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+    cancel_token: Optional[CancelToken] = None,
+    checkpoint_key: Optional[str] = None
+) -> dict:
     """
+    Transcreve o arquivo com um modelo já carregado
+
+    Com `checkpoint_key`, áudios a partir de CHECKPOINT_MIN_SECONDS gravam
+    cada segmento no checkpoint e retomam a decodificação após o último
+    segmento de um checkpoint existente.
+    """
+    timer = timer or StageTimer()
+    cancel_token = cancel_token or CancelToken()
+    language = params.language
+    vad_options = params.vad_options()
+    decoding_options = params.decoding_options()
+    # Realizar transcrição
+    logger.info(f"Iniciando transcrição com modelo {model_name} (perfil {params.profile})")
+    start_time = time.monotonic()
     
-    # Validar formato do arquivo
-    allowed_extensions = {'.mp3', '.wav', '.flac', '.m4a', '.ogg', '.webm'}
-    file_extension = Path(file.filename).suffix.lower()
+    # Decodificar o áudio uma única vez; o mesmo array é usado nas duas etapas
+    with timer.stage("audio_decode"):
+        audio = decode_source(source, audio_hash)
+    audio_duration = len(audio) / SAMPLING_RATE
+    cancel_token.check()
     
-    if file_extension not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Formato de arquivo não suportado: {file_extension}. "
-                   f"Formatos aceitos: {', '.join(allowed_extensions)}"
+    # Remover o silêncio antes de decodificar, se solicitado
+    speech_chunks = None
+    if vad_options is not None:
+        with timer.stage("vad"):
+            audio, speech_chunks = remove_silence(audio, vad_options)
+        logger.info(
+            f"VAD: {len(audio) / SAMPLING_RATE:.1f}s de fala em {audio_duration:.1f}s de áudio"
         )
+    skipped_duration = audio_duration - len(audio) / SAMPLING_RATE
     
-    # Validar modelo
-    valid_models = [m.name for m in AVAILABLE_MODELS]
-    if model not in valid_models:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Modelo inválido: {model}. Modelos disponíveis: {', '.join(valid_models)}"
+    # Se auto_detect_language for True e language não foi especificado, detectar idioma
+    detected_language = None
+    language_probability = None
+    if params.auto_detect_language and not language and len(audio) > 0:
+        logger.info("Detectando idioma automaticamente...")
+        # Usar apenas os primeiros 30 segundos para detecção de idioma
+        with timer.stage("language_detection"):
+            detected_language, language_probability = detect_language(whisper_model, audio)
+        logger.info(f"Idioma detectado: {detected_language} ({language_probability:.2f})")
+    
+    long_audio = params.long_audio
+    if long_audio is None:
+        long_audio = (
+            LONG_AUDIO_THRESHOLD_SECONDS > 0
+            and len(audio) / SAMPLING_RATE >= LONG_AUDIO_THRESHOLD_SECONDS
         )
     
-    # Criar arquivo temporário
-    temp_file = None
+    # Áudios longos gravam cada segmento decodificado em um checkpoint
+    checkpoint = None
+    if (
+        checkpoint_key is not None
+        and CHECKPOINT_MIN_SECONDS > 0
+        and audio_duration >= CHECKPOINT_MIN_SECONDS
+    ):
+        checkpoint = checkpoint_store.open(checkpoint_key, {
+            "model": model_name,
+            "params": params.model_dump(),
+            "audio_hash": audio_hash,
+            "path": source if isinstance(source, str) else None,
+            "audio_duration": audio_duration
+        })
+    
+    segments = []
     try:
-        # Salvar arquivo temporário
-        temp_file = tempfile.NamedTemporaryFile(
-            delete=False, 
-            suffix=file_extension,
-            dir=str(TEMP_DIR)
-        )
-        
-        # Copiar conteúdo do upload para o arquivo temporário
-        shutil.copyfileobj(file.file, temp_file)
-        temp_file.close()
-        
-        logger.info(f"Arquivo temporário criado: {temp_file.name}")
-        
-        # Carregar modelo
-        whisper_model = load_whisper_model(model)
-        
-        # Realizar transcrição
-        logger.info(f"Iniciando transcrição com modelo {model}")
-        start_time = asyncio.get_event_loop().time()
-        
-        # Se auto_detect_language for True e language não foi especificado, detectar idioma
-        detected_language = None
-        if auto_detect_language and not language:
-            logger.info("Detectando idioma automaticamente...")
-            # Usar apenas os primeiros 30 segundos para detecção de idioma
-            segments, info = whisper_model.transcribe(
-                temp_file.name,
-                language=None,  # Deixar o modelo detectar
-                beam_size=1,    # Usar beam size menor para ser mais rápido
-                best_of=1,
-                temperature=0.0,
-                condition_on_previous_text=False,
-                word_timestamps=False
+        # Ao retomar um checkpoint, decodificar apenas o que vem depois do último segmento gravado
+        resume_sample = 0
+        if checkpoint is not None and checkpoint.resume_at > 0:
+            resume_sample = (
+                speech_position(speech_chunks, checkpoint.resume_at) if speech_chunks
+                else int(checkpoint.resume_at * SAMPLING_RATE)
             )
-            detected_language = info.language
-            logger.info(f"Idioma detectado: {detected_language}")
+        pending_audio = audio[resume_sample:]
         
         # Transcrição completa com idioma detectado ou especificado
         final_language = language or detected_language
-        segments, info = whisper_model.transcribe(
-            temp_file.name,
-            language=final_language,
-            beam_size=5,
-            best_of=5,
-            temperature=0.0,
-            word_timestamps=True,  # Habilitar timestamps por palavra
-            condition_on_previous_text=False
-        )
+        if len(pending_audio) == 0:
+            # Nenhuma fala encontrada pelo VAD: não há o que decodificar
+            segments = []
+        elif decode_batcher is not None and can_batch(decoding_options):
+            # Janelas independentes, decodificadas junto com as de outras requisições
+            if final_language is None:
+                with timer.stage("language_detection"):
+                    final_language, _ = detect_language(whisper_model, audio)
+            segments = transcribe_batched(
+                whisper_model,
+                pending_audio,
+                decode_batcher,
+                final_language,
+                timer=timer,
+                **decoding_options
+            )
+        elif long_audio:
+            # Todos os blocos precisam usar o mesmo idioma
+            if final_language is None:
+                with timer.stage("language_detection"):
+                    final_language, _ = detect_language(whisper_model, audio)
+            segments = transcribe_chunked(
+                whisper_model,
+                pending_audio,
+                chunk_executor,
+                CHUNK_SECONDS,
+                CHUNK_OVERLAP_SECONDS,
+                language=final_language,
+                **decoding_options
+            )
+        else:
+            # O faster-whisper calcula as features aqui; encoder, decoder e
+            # alinhamento das palavras rodam à medida que os segmentos são lidos
+            with timer.stage("feature_extraction"):
+                segments, info = whisper_model.transcribe(
+                    pending_audio,
+                    language=final_language,
+                    **decoding_options
+                )
+        
+        if resume_sample:
+            segments = shift_segments(segments, resume_sample / SAMPLING_RATE)
+        if speech_chunks:
+            # Levar os timestamps de volta para a linha do tempo original
+            segments = restore_timestamps(segments, speech_chunks)
         
         # Concatenar segmentos e coletar timestamps
-        transcription_text = ""
         word_timestamps = []
+        transcript_segments = []
         
-        for segment in segments:
-            transcription_text += segment.text + " "
-            # Coletar timestamps de palavras se disponíveis
-            if hasattr(segment, 'words') and segment.words:
-                for word in segment.words:
-                    word_timestamps.append({
-                        "word": word.word,
-                        "start": word.start,
-                        "end": word.end,
-                        "probability": getattr(word, 'probability', None)
+        def add_segment(text: str, start: float, end: float, segment_words: List[dict]):
+            word_timestamps.extend(segment_words)
+            transcript_segments.append({"text": text, "start": start, "end": end})
+            if on_segment is not None:
+                on_segment({
+                    "text": text,
+                    "start": start,
+                    "end": end,
+                    "words": segment_words,
+                    "progress": min(1.0, end / audio_duration) if audio_duration else None,
+                    "detected_language": detected_language,
+                    "language_probability": language_probability
+                })
+        
+        if checkpoint is not None:
+            # Segmentos decodificados antes da interrupção
+            for saved in checkpoint.segments:
+                add_segment(saved["text"], saved["start"], saved["end"], saved["words"])
+        
+        # Decodificação dos segmentos (as etapas medidas dentro dela são descontadas)
+        cancel_token.check()
+        with timer.stage("encode_decode"):
+            for segment in segments:
+                # Coletar timestamps de palavras se disponíveis
+                segment_words = []
+                if hasattr(segment, 'words') and segment.words:
+                    for word in segment.words:
+                        segment_words.append({
+                            "word": word.word,
+                            "start": word.start,
+                            "end": word.end,
+                            "probability": getattr(word, 'probability', None)
+                        })
+                add_segment(segment.text, segment.start, segment.end, segment_words)
+                if checkpoint is not None:
+                    checkpoint.append({
+                        "text": segment.text,
+                        "start": segment.start,
+                        "end": segment.end,
+                        "words": segment_words
                     })
+                
+                # Parar antes de decodificar o próximo segmento
+                cancel_token.check()
+    finally:
+        # Fechar o gerador interrompe a decodificação (e descarta os blocos pendentes)
+        close = getattr(segments, "close", None)
+        if close is not None:
+            close()
+        # Os segmentos já gravados ficam no checkpoint até a conclusão
+        if checkpoint is not None:
+            checkpoint.close()
+    
+    processing_time = time.monotonic() - start_time
+    logger.info(f"Transcrição concluída em {processing_time:.2f} segundos")
+    
+    return {
+        "text": segments_text(transcript_segments),
+        "processing_time": processing_time,
+        "detected_language": detected_language,
+        "language_probability": language_probability,
+        "word_timestamps": word_timestamps,
+        "segments": transcript_segments,
+        "audio_duration": audio_duration,
+        "skipped_duration": skipped_duration
+    }
+
+def run_retranscription(
+    base: dict,
+    audio: Optional[np.ndarray],
+    path: Optional[str],
+    model_name: str,
+    params: TranscriptionParameters,
+    ranges: List[tuple],
+    padding: float,
+    cache_key: str,
+    timer: StageTimer,
+    cancel_token: CancelToken
+) -> dict:
+    """
+    Retranscreve trechos de um resultado salvo (chamada dentro do pool de inferência)
+
+    O áudio vem do cache de áudio (`audio`, mapeado do disco) ou é
+    decodificado a partir do arquivo original (`path`). Só os trechos,
+    com `padding` segundos de contexto, passam pelo modelo; o custo
+    acompanha a duração editada, não a do arquivo.
+    """
+    timer.end("queue_wait")
+    cancel_token.check()
+    decoding_options = params.decoding_options()
+    if params.word_timestamps is None:
+        # Manter a transcrição uniforme: palavras só se a original também tiver
+        decoding_options["word_timestamps"] = bool(base["word_timestamps"])
+    language = params.language or base["detected_language"]
+    
+    spec = model_spec(model_name)
+    load_started = time.perf_counter()
+    with model_registry.acquire(spec) as whisper_model:
+        timer.add("model_load", time.perf_counter() - load_started)
+        start_time = time.monotonic()
         
-        end_time = asyncio.get_event_loop().time()
-        processing_time = end_time - start_time
+        if audio is None:
+            with timer.stage("audio_decode"):
+                audio = decode_source(path, base["audio_hash"])
         
-        logger.info(f"Transcrição concluída em {processing_time:.2f} segundos")
+        # Trechos estendidos até as bordas dos segmentos que tocam
+        spans = snap_to_segments(
+            merge_ranges(ranges, len(audio) / SAMPLING_RATE), base["segments"]
+        )
+        logger.info(
+            f"Retranscrevendo {len(spans)} trecho(s) com modelo {model_name}: "
+            + ", ".join(f"{start:.1f}-{end:.1f}s" for start, end in spans)
+        )
         
-        # Agendar limpeza do arquivo temporário
-        background_tasks.add_task(cleanup_temp_file, temp_file.name)
+        replacements = []
+        with timer.stage("encode_decode"):
+            for start, end in spans:
+                cancel_token.check()
+                replacements.append(((start, end), transcribe_range(
+                    whisper_model, audio, start, end, padding,
+                    language=language, **decoding_options
+                )))
+    model_warmer.mark_warm(spec)
+    
+    segments, word_timestamps = splice_transcript(
+        base["segments"], base["word_timestamps"] or [], replacements
+    )
+    processing_time = time.monotonic() - start_time
+    edited_duration = sum(end - start for start, end in spans)
+    logger.info(
+        f"{edited_duration:.1f}s retranscritos em {processing_time:.2f} segundos"
+    )
+    
+    if edited_duration:
+        real_time_factor.observe(processing_time / edited_duration, model=model_name)
+    result = {
+        **base,
+        "text": segments_text(segments),
+        "segments": segments,
+        "word_timestamps": word_timestamps,
+        "processing_time": processing_time,
+        "timings": record_timings(model_name, timer),
+        "model": model_name,
+        "profile": params.profile
+    }
+    result.pop("result_id", None)
+    if result_cache.enabled:
+        result["result_id"] = cache_key
+        result_cache.put(cache_key, result)
+    return result
+
+def run_two_pass(
+    source: AudioSource,
+    draft_model: str,
+    refine_model: str,
+    params: TranscriptionParameters,
+    on_event: Callable[[str, dict], None],
+    draft_key: Optional[str],
+    refine_key: Optional[str],
+    audio_hash: Optional[str],
+    timer: StageTimer,
+    cancel_token: CancelToken,
+    draft: Optional[dict] = None
+) -> dict:
+    """
+    Transcrição em duas passagens (chamada dentro do pool de inferência)
+
+    O modelo pequeno gera um rascunho, enviado segmento a segmento
+    (`on_event("segment", ...)`) e depois inteiro (`"draft"`); em seguida
+    o modelo maior transcreve o mesmo áudio e cada segmento refinado
+    (`"refined"`) informa em `replaces` quantos segmentos do início do
+    rascunho ele substitui. `draft` é o rascunho já salvo no cache, se
+    houver; os segmentos dele são reenviados como se tivessem sido decodificados.
+
+    Returns:
+        Resultado do modelo maior, salvo no cache com `refine_key`
+    """
+    if draft is None:
+        draft = run_transcription(
+            source, draft_model, params, partial(on_event, "segment"),
+            cache_key=draft_key, audio_hash=audio_hash, timer=timer, cancel_token=cancel_token
+        )
+    else:
+        # Rascunho do cache: reenviar os segmentos, aos quais `replaces` se refere
+        words = draft["word_timestamps"] or []
+        word_starts = [word["start"] for word in words]
+        duration = draft.get("audio_duration")
+        for segment in draft["segments"]:
+            on_event("segment", {
+                **segment,
+                "words": words[
+                    bisect.bisect_left(word_starts, segment["start"]):
+                    bisect.bisect_left(word_starts, segment["end"])
+                ],
+                "progress": min(1.0, segment["end"] / duration) if duration else None,
+                "detected_language": draft["detected_language"],
+                "language_probability": draft["language_probability"]
+            })
+    on_event("draft", draft)
+    
+    # Um segmento do rascunho é substituído quando o refinamento passa do seu
+    # ponto médio (o mesmo critério de splice_transcript)
+    midpoints = [(segment["start"] + segment["end"]) / 2 for segment in draft["segments"]]
+    
+    def on_refined(segment: dict):
+        on_event("refined", {**segment, "replaces": bisect.bisect_left(midpoints, segment["end"])})
+    
+    logger.info(f"Rascunho com modelo {draft_model} pronto; refinando com modelo {refine_model}")
+    return run_transcription(
+        source, refine_model, params, on_refined,
+        cache_key=refine_key, audio_hash=audio_hash, cancel_token=cancel_token
+    )
+
+def submit_to_pool(fn, *args, **kwargs) -> "asyncio.Future":
+    """Agenda uma função no pool de inferência, convertendo fila cheia em HTTP 503"""
+    try:
+        return inference_pool.submit(fn, *args, **kwargs)
+    except QueueFullError as e:
+        logger.warning(str(e))
+        raise HTTPException(
+            status_code=503,
+            detail="Servidor ocupado: fila de transcrição cheia. Tente novamente em instantes.",
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+
+async def run_in_pool(fn, *args, **kwargs):
+    """Executa uma função no pool de inferência e aguarda o resultado"""
+    return await submit_to_pool(fn, *args, **kwargs)
+
+def validate_audio_file(file: UploadFile) -> str:
+    """Valida a extensão do arquivo enviado e a retorna"""
+    file_extension = Path(file.filename).suffix.lower()
+    
+    if file_extension not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato de arquivo não suportado: {file_extension}. "
+                   f"Formatos aceitos: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+    return file_extension
+
+def validate_model(model: str, allow_auto: bool = False):
+    """Verifica se o modelo solicitado existe (`allow_auto` aceita também AUTO_MODEL)"""
+    valid_models = [m.name for m in AVAILABLE_MODELS] + ([AUTO_MODEL] if allow_auto else [])
+    if model not in valid_models:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Modelo inválido: {model}. Modelos disponíveis: {', '.join(valid_models)}"
+        )
+
+def source_duration(source: AudioSource, audio_hash: Optional[str] = None) -> Optional[float]:
+    """Duração do áudio sem decodificá-lo: cache de áudio ou cabeçalho do arquivo"""
+    if audio_hash is None and isinstance(source, UploadedAudio):
+        audio_hash = source.audio_hash
+    if audio_hash is not None:
+        audio = pcm_cache.get(audio_hash)
+        if audio is not None:
+            return len(audio) / SAMPLING_RATE
+    if not source:
+        # Transcrição retomada só do cache de áudio (sem o arquivo original)
+        return None
+    with open_audio_source(source) as audio_file:
+        return probe_duration(audio_file)
+
+def estimate_source_memory(
+    source: AudioSource,
+    model_name: str,
+    params: TranscriptionParameters,
+    audio_hash: Optional[str] = None,
+    duration: Optional[float] = None
+) -> int:
+    """
+    Memória estimada da transcrição (ver estimate_request_memory); lê o
+    cabeçalho do arquivo, então deve rodar fora do event loop
+    """
+    if duration is None:
+        duration = source_duration(source, audio_hash)
+    file_bytes = None
+    if isinstance(source, UploadedAudio):
+        file_bytes = source.size
+    elif source:
+        try:
+            file_bytes = Path(source).stat().st_size
+        except OSError:
+            # O erro aparece na decodificação
+            pass
+    return estimate_request_memory(
+        model_spec(model_name), duration, file_bytes, vad=params.vad_filter
+    )
+
+def admission_gate(
+    estimate: Callable[[], int],
+    cancel_token: CancelToken,
+    description: str,
+    timer: Optional[StageTimer] = None
+):
+    """
+    Etapa `admit` do pool de inferência: estima a memória (fora do event
+    loop) e aguarda a vez no orçamento sem ocupar um worker, para que as
+    transcrições que cabem passem à frente das que esperam memória
+    """
+    async def admit() -> Callable[[], None]:
+        started = time.perf_counter()
+        nbytes = await asyncio.get_running_loop().run_in_executor(None, estimate)
+        reservation = await memory_admission.admit(nbytes, cancel_token.check, description)
+        if timer is not None:
+            timer.add("memory_wait", time.perf_counter() - started)
+            # A espera na fila do pool começa depois da admissão
+            timer.begin("queue_wait")
+        return reservation.release
+    return admit
+
+def validate_deadline(deadline: Optional[float]):
+    if deadline is not None and deadline <= 0:
+        raise HTTPException(status_code=400, detail="O prazo deve ser positivo")
+
+async def choose_auto_model(
+    source: AudioSource,
+    params: TranscriptionParameters,
+    deadline: Optional[float],
+    audio_hash: Optional[str] = None
+) -> Tuple[str, TranscriptionParameters]:
+    """
+    Escolhe o modelo e o perfil mais precisos previstos para terminar a
+    transcrição em `deadline` segundos (sem prazo, em AUTO_MAX_RTF vezes a
+    duração do áudio), pela velocidade medida nesta máquina
+
+    Só concorrem os modelos já baixados ou carregados (todos, se nenhum
+    estiver). O carregamento entra na previsão quando o modelo não está
+    em memória.
+    """
+    duration = await asyncio.get_running_loop().run_in_executor(
+        None, source_duration, source, audio_hash
+    )
+    if duration is None:
+        # Sem a duração, só a velocidade relativa pode ser comparada
+        logger.warning("Duração do áudio desconhecida; modelo auto escolhido pelo fator de tempo real")
+        audio_seconds, deadline_seconds, include_load = 1.0, AUTO_MAX_RTF, False
+    else:
+        audio_seconds = duration
+        deadline_seconds = deadline if deadline is not None else AUTO_MAX_RTF * duration
+        include_load = True
+    
+    check_model_availability()
+    candidates = [
+        model.name for model in AVAILABLE_MODELS
+        if model.available or model_registry.is_loaded(model_spec(model.name))
+    ] or [model.name for model in AVAILABLE_MODELS]
+    
+    # Do mais preciso para o menos preciso: o tamanho do modelo pesa mais que o perfil
+    options = []
+    for name in reversed(candidates):
+        spec = model_spec(name)
+        load_seconds = 0.0
+        if include_load and not model_registry.is_loaded(spec):
+            load_seconds = speed_stats.load_seconds(name, spec.compute_type) or 0.0
+        for profile in ("accurate", "balanced", "fast"):
+            options.append((name, spec.compute_type, profile, load_seconds))
+    
+    (model, _, profile, _), predicted = speed_stats.choose(options, audio_seconds, deadline_seconds)
+    if duration is not None and predicted is not None:
+        logger.info(
+            f"Modelo auto: {model} (perfil {profile}), previsão de {predicted:.1f}s "
+            f"para {duration:.1f}s de áudio, prazo de {deadline_seconds:.1f}s"
+        )
+    else:
+        logger.info(f"Modelo auto: {model} (perfil {profile})")
+    return model, params.model_copy(update={"profile": profile})
+
+def validate_refine_model(model: str, refine_model: Optional[str]) -> Optional[str]:
+    """Modelo do refinamento (modo em duas passagens); None se for o mesmo do rascunho"""
+    if refine_model is None or refine_model == model:
+        return None
+    validate_model(refine_model)
+    return refine_model
+
+async def receive_upload(file: UploadFile, file_extension: str, in_memory: bool = False) -> UploadedAudio:
+    """
+    Recebe o upload calculando o hash do conteúdo
+
+    Com in_memory=True (só nos endpoints de um único arquivo), uploads de até
+    UPLOAD_SPILL_MB são decodificados da memória, sem gravar uma cópia em
+    TEMP_DIR: os de até 1 MB o Starlette já mantém em memória e os demais são
+    lidos de volta do arquivo temporário anônimo em que ele os guardou. Os
+    maiores, os uploads de jobs e lotes (que vão esperar na fila) e todos
+    quando o orçamento de memória está esgotado são copiados para TEMP_DIR e
+    lidos via mmap.
+    """
+    spill_bytes = UPLOAD_SPILL_MB * 1024 * 1024 if in_memory else 0
+    # O parser informa o tamanho: só reservar memória para o que cabe nela
+    if file.size is not None and file.size > spill_bytes:
+        spill_bytes = 0
+    if spill_bytes and not memory_admission.has_room(file.size or spill_bytes):
+        # Memória apertada: mesmo os uploads pequenos vão para o disco
+        spill_bytes = 0
+    return await ingest_upload(file, spill_bytes, TEMP_DIR, suffix=file_extension)
+
+def resolve_local_path(raw_path: str) -> Path:
+    """
+    Resolve um caminho local enviado pelo cliente, aceitando apenas
+    caminhos absolutos dentro de ALLOWED_LOCAL_DIRS (após seguir links)
+    """
+    if not ALLOWED_LOCAL_DIRS:
+        raise HTTPException(
+            status_code=403,
+            detail="Acesso a arquivos locais desativado (ECHO_TRANSCRIBE_ALLOWED_DIRS)"
+        )
+    
+    path = Path(raw_path).expanduser()
+    if not path.is_absolute():
+        raise HTTPException(status_code=400, detail=f"Caminho deve ser absoluto: {raw_path}")
+    
+    resolved = path.resolve()
+    if not any(resolved.is_relative_to(directory.resolve()) for directory in ALLOWED_LOCAL_DIRS):
+        raise HTTPException(
+            status_code=403,
+            detail=f"Caminho fora dos diretórios permitidos: {raw_path}"
+        )
+    return resolved
+
+def validate_local_file(raw_path: str) -> Path:
+    """Valida um arquivo de áudio local para transcrição sem upload"""
+    path = resolve_local_path(raw_path)
+    if not path.is_file():
+        raise HTTPException(status_code=404, detail=f"Arquivo não encontrado: {raw_path}")
+    if path.suffix.lower() not in ALLOWED_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Formato não suportado. Use: {', '.join(ALLOWED_EXTENSIONS)}"
+        )
+    return path
+
+@lru_cache(maxsize=256)
+def _local_file_hash(path: str, size: int, mtime_ns: int) -> str:
+    # Tamanho e data de modificação na chave: o hash é refeito se o arquivo mudar
+    return file_sha256(path)
+
+async def local_file_hash(path: Path, params: TranscriptionParameters) -> Optional[str]:
+    """
+    Hash do conteúdo de um arquivo local, ou None se nenhum cache for usado
+
+    Sem cache o arquivo não é lido para calcular o hash, e a transcrição
+    começa imediatamente.
+    """
+    if not params.use_cache and not pcm_cache.enabled:
+        return None
+    stat = path.stat()
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, _local_file_hash, str(path), stat.st_size, stat.st_mtime_ns
+    )
+
+def transcription_cache_key(audio_hash: str, model: str, params: TranscriptionParameters) -> str:
+    """Chave do cache de resultados para o áudio e os parâmetros da transcrição"""
+    return make_cache_key(
+        audio_hash,
+        model=model,
+        # A quantização altera o resultado; threads e workers não
+        compute_type=model_spec(model).compute_type,
+        params=params.model_dump(exclude={"use_cache"}),
+        decoding=params.decoding_options(),
+        chunking=[LONG_AUDIO_THRESHOLD_SECONDS, CHUNK_SECONDS, CHUNK_OVERLAP_SECONDS],
+        # Janelas em lote são cortadas de outra forma e podem gerar segmentos diferentes
+        batched=decode_batcher is not None
+    )
+
+def lookup_cached_result(
+    cache_key: str,
+    model: str,
+    timer: Optional[StageTimer] = None
+) -> Optional[dict]:
+    """Procura o resultado no cache, antes de qualquer carregamento de modelo"""
+    timer = timer or StageTimer()
+    start_time = time.monotonic()
+    with timer.stage("cache_lookup"):
+        result = result_cache.get(cache_key)
+    if result is None:
+        return None
+    
+    # O tempo reportado é o da consulta ao cache, não o da transcrição original
+    result["result_id"] = cache_key
+    result["processing_time"] = time.monotonic() - start_time
+    result["timings"] = record_timings(model, timer)
+    logger.info(f"Resultado servido do cache ({result['processing_time'] * 1000:.1f} ms)")
+    return result
+
+def build_response(
+    result: dict,
+    from_cache: bool = False,
+    columnar: bool = False
+) -> TranscriptionResponse:
+    """
+    Monta a resposta da API a partir do resultado da transcrição
+
+    Com `columnar`, as palavras vão em `words` (colunas com float32
+    empacotado) em vez de uma lista de objetos em `word_timestamps`.
+    """
+    return TranscriptionResponse(
+        text=result["text"],
+        confidence=None,  # faster-whisper não fornece confidence score diretamente
+        processing_time=result["processing_time"],
+        detected_language=result["detected_language"],
+        language_probability=result["language_probability"],
+        word_timestamps=None if columnar else result["word_timestamps"],
+        words=to_columns(result["word_timestamps"]) if columnar else None,
+        audio_duration=result.get("audio_duration"),
+        skipped_duration=result.get("skipped_duration"),
+        from_cache=from_cache,
+        timings=result.get("timings"),
+        result_id=result.get("result_id"),
+        model=result.get("model"),
+        profile=result.get("profile")
+    )
+
+def negotiated_response(content, columnar: bool):
+    """Resposta com o tipo de mídia do formato em colunas, quando pedido"""
+    if not columnar:
+        return content
+    if isinstance(content, BaseModel):
+        content = content.model_dump()
+    return JSONResponse(content, media_type=COLUMNAR_MEDIA_TYPE)
+
+def format_sse(event: str, data: dict) -> str:
+    """Formata uma mensagem Server-Sent Events"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+def register_transcription(request_id: Optional[str]) -> tuple:
+    """
+    Registra a transcrição para que possa ser cancelada
+
+    Returns:
+        (ID da requisição, gerado se o cliente não enviou X-Request-ID, token de cancelamento)
+    """
+    request_id = request_id or uuid.uuid4().hex
+    try:
+        return request_id, active_transcriptions.register(request_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+async def client_waits_for(request: Request, future: "asyncio.Future") -> bool:
+    """
+    Aguarda `future` verificando periodicamente se o cliente ainda está
+    conectado. Retorna False (sem esperar o fim) se ele desconectou antes.
+    """
+    while True:
+        done, _ = await asyncio.wait({future}, timeout=DISCONNECT_POLL_SECONDS)
+        if done:
+            return True
+        if await request.is_disconnected():
+            return False
+
+async def transcribe_source(
+    source: AudioSource,
+    model: str,
+    params: TranscriptionParameters,
+    cache_key: Optional[str],
+    audio_hash: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+    columnar: bool = False,
+    request: Optional[Request] = None,
+    request_id: Optional[str] = None
+):
+    """
+    Consulta o cache e, se necessário, executa a transcrição no pool
+
+    A transcrição é cancelada se o cliente (`request`) desconectar ou se
+    POST /transcriptions/{request_id}/cancel for chamado.
+    """
+    timer = timer or StageTimer()
+    request_id, cancel_token = register_transcription(request_id)
+    try:
+        if cache_key is not None and params.use_cache:
+            cached = lookup_cached_result(cache_key, model, timer)
+            if cached is not None:
+                return negotiated_response(
+                    build_response(cached, from_cache=True, columnar=columnar), columnar
+                )
         
-        return TranscriptionResponse(
-            text=transcription_text.strip(),
-            confidence=None,  # faster-whisper não fornece confidence score diretamente
-            processing_time=processing_time,
-            detected_language=detected_language,
-            word_timestamps=word_timestamps
+        # Executar a inferência no pool, sem bloquear o event loop
+        timer.begin("queue_wait")
+        future = submit_to_pool(
+            run_transcription, source, model, params,
+            cache_key=cache_key, audio_hash=audio_hash, timer=timer, cancel_token=cancel_token,
+            admit=admission_gate(
+                partial(estimate_source_memory, source, model, params, audio_hash),
+                cancel_token, model, timer
+            )
         )
+        if request is not None and not await client_waits_for(request, future):
+            logger.info(f"Cliente desconectou; cancelando a transcrição {request_id}")
+            cancel_token.cancel()
+        # Mesmo cancelada, aguardar o worker soltar a origem do áudio
+        result = await future
         
+        return negotiated_response(build_response(result, columnar=columnar), columnar)
+        
+    except TranscriptionCancelled:
+        raise HTTPException(status_code=409, detail=CANCELLED_DETAIL)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Erro durante transcrição: {str(e)}")
-        # Limpar arquivo temporário em caso de erro
-        if temp_file and os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
-        
         raise HTTPException(
             status_code=500,
             detail=f"Erro durante transcrição: {str(e)}"
         )
+    finally:
+        active_transcriptions.unregister(request_id)
 
-@app.post("/transcribe-batch", response_model=BatchTranscriptionResponse)
-async def transcribe_batch(
+def stream_transcription(
+    source: AudioSource,
+    model: str,
+    params: TranscriptionParameters,
+    cache_key: Optional[str],
+    release: Optional[Callable[[], None]] = None,
+    audio_hash: Optional[str] = None,
+    timer: Optional[StageTimer] = None,
+    columnar: bool = False,
+    request_id: Optional[str] = None,
+    refine_model: Optional[str] = None,
+    refine_cache_key: Optional[str] = None
+) -> StreamingResponse:
+    """
+    Consulta o cache e, se necessário, executa a transcrição no pool
+    enviando cada segmento via SSE. `release` é chamado quando a origem
+    do áudio não é mais necessária.
+
+    Com `refine_model`, `model` gera um rascunho e `refine_model` o
+    refina em seguida (ver run_two_pass); o resultado final é o do
+    refinamento, salvo com `refine_cache_key`.
+
+    A transcrição é cancelada se o cliente desconectar ou se
+    POST /transcriptions/{request_id}/cancel for chamado; o ID segue
+    no cabeçalho X-Request-ID da resposta.
+    """
+    release = release or (lambda: None)
+    timer = timer or StageTimer()
+    final_model, final_key = (
+        (refine_model, refine_cache_key) if refine_model is not None else (model, cache_key)
+    )
+    cached = None
+    if final_key is not None and params.use_cache:
+        cached = lookup_cached_result(final_key, final_model, timer)
+    if cached is not None:
+        release()
+        
+        async def cached_stream():
+            response = build_response(cached, from_cache=True, columnar=columnar)
+            yield format_sse("result", response.model_dump())
+        
+        return StreamingResponse(
+            cached_stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache"}
+        )
+    
+    # O rascunho salvo no cache pula a primeira passagem (se tiver os segmentos)
+    draft = None
+    if refine_model is not None and cache_key is not None and params.use_cache:
+        draft = lookup_cached_result(cache_key, model, timer)
+        if draft is not None and "segments" not in draft:
+            draft = None
+    
+    try:
+        request_id, cancel_token = register_transcription(request_id)
+    except HTTPException:
+        release()
+        raise
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    
+    def on_event(event: str, data: dict):
+        # Chamado na thread do pool; repassar o evento para o event loop
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+    
+    try:
+        timer.begin("queue_wait")
+        if refine_model is not None:
+            # Os dois modelos rodam um depois do outro: reservar o maior dos dois
+            def estimate() -> int:
+                models = [refine_model] if draft is not None else [model, refine_model]
+                return max(
+                    estimate_source_memory(source, name, params, audio_hash) for name in models
+                )
+            future = submit_to_pool(
+                run_two_pass, source, model, refine_model, params, on_event,
+                cache_key, refine_cache_key, audio_hash, timer, cancel_token, draft,
+                admit=admission_gate(estimate, cancel_token, refine_model, timer)
+            )
+        else:
+            future = submit_to_pool(
+                run_transcription, source, model, params, partial(on_event, "segment"),
+                cache_key=cache_key, audio_hash=audio_hash, timer=timer, cancel_token=cancel_token,
+                admit=admission_gate(
+                    partial(estimate_source_memory, source, model, params, audio_hash),
+                    cancel_token, model, timer
+                )
+            )
+    except HTTPException:
+        active_transcriptions.unregister(request_id)
+        release()
+        raise
+    
+    def on_done(_future):
+        # Marcar a exceção como lida: o cliente pode ter desconectado antes do fim
+        if not _future.cancelled():
+            _future.exception()
+        # A origem só é liberada quando o worker termina de usá-la
+        events.put_nowait(None)
+        active_transcriptions.unregister(request_id)
+        release()
+    
+    future.add_done_callback(on_done)
+    
+    async def event_stream():
+        try:
+            while True:
+                item = await events.get()
+                if item is None:
+                    break
+                event, data = item
+                if event == "draft":
+                    data = build_response(
+                        data, from_cache=draft is not None, columnar=columnar
+                    ).model_dump()
+                yield format_sse(event, data)
+        finally:
+            if not future.done():
+                # Cliente desconectou: parar antes do próximo segmento
+                logger.info(f"Cliente desconectou; cancelando a transcrição {request_id}")
+                cancel_token.cancel()
+        
+        try:
+            result = future.result()
+        except TranscriptionCancelled:
+            yield format_sse("error", {"detail": CANCELLED_DETAIL, "cancelled": True})
+            return
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else str(e)
+            logger.error(f"Erro durante transcrição: {detail}")
+            yield format_sse("error", {"detail": f"Erro durante transcrição: {detail}"})
+            return
+        
+        yield format_sse("result", build_response(result, columnar=columnar).model_dump())
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Request-ID": request_id}
+    )
+
+@app.post("/transcribe", response_model=TranscriptionResponse)
+async def transcribe_audio(
+    request: Request,
     background_tasks: BackgroundTasks,
-    files: List[UploadFile] = File(...),
+    file: UploadFile = File(...),
     model: str = "base",
-    language: Optional[str] = None,
-    auto_detect_language: bool = True
+    deadline: Optional[float] = None,
+    params: TranscriptionParameters = Depends(),
+    accept: Optional[str] = Header(None),
+    x_request_id: Optional[str] = Header(None)
 ):
     """
-    Transcreve múltiplos arquivos de áudio em lote
+    Transcreve um arquivo de áudio
     
     Args:
-        files: Lista de arquivos de áudio
-        model: Nome do modelo a ser usado
-        language: Código do idioma (opcional)
-        auto_detect_language: Se deve detectar automaticamente o idioma
+        file: Arquivo de áudio (MP3, WAV, FLAC, M4A)
+        model: Nome do modelo a ser usado (tiny, base, small, medium ou auto)
+        deadline: Com model=auto, prazo (segundos) para terminar a transcrição;
+            sem prazo, AUTO_MAX_RTF vezes a duração do áudio
+        params: Idioma, cache, VAD e divisão em blocos (ver TranscriptionParameters)
+        accept: Com COLUMNAR_MEDIA_TYPE, as palavras vêm em colunas (campo words)
+        x_request_id: ID para cancelar a transcrição (POST /transcriptions/{id}/cancel)
     """
     
-    if len(files) > 10:  # Limitar a 10 arquivos por vez
+    # Validar formato do arquivo e modelo
+    file_extension = validate_audio_file(file)
+    validate_model(model, allow_auto=True)
+    validate_deadline(deadline)
+    
+    upload = None
+    timer = StageTimer()
+    try:
+        # Receber o upload (em memória, se couber)
+        with timer.stage("upload"):
+            upload = await receive_upload(file, file_extension, in_memory=True)
+        
+        # Agendar a liberação do upload
+        background_tasks.add_task(upload.close)
+        
+        if model == AUTO_MODEL:
+            model, params = await choose_auto_model(upload, params, deadline)
+        cache_key = transcription_cache_key(upload.audio_hash, model, params)
+        return await transcribe_source(
+            upload, model, params, cache_key, timer=timer, columnar=wants_columnar(accept),
+            request=request, request_id=x_request_id
+        )
+        
+    except Exception:
+        # Liberar o upload em caso de erro
+        if upload is not None:
+            upload.close()
+        raise
+
+@app.post("/transcribe-path", response_model=TranscriptionResponse)
+async def transcribe_local_file(
+    request: LocalFileRequest,
+    http_request: Request,
+    model: str = "base",
+    deadline: Optional[float] = None,
+    params: TranscriptionParameters = Depends(),
+    accept: Optional[str] = Header(None),
+    x_request_id: Optional[str] = Header(None)
+):
+    """
+    Transcreve um arquivo local lendo-o diretamente do disco, sem upload
+    
+    O caminho deve estar dentro de um dos diretórios permitidos
+    (ECHO_TRANSCRIBE_ALLOWED_DIRS, por padrão o diretório do usuário).
+    Aceita model=auto e `deadline`, como /transcribe.
+    """
+    path = validate_local_file(request.path)
+    validate_model(model, allow_auto=True)
+    validate_deadline(deadline)
+    
+    timer = StageTimer()
+    with timer.stage("file_hash"):
+        audio_hash = await local_file_hash(path, params)
+    if model == AUTO_MODEL:
+        model, params = await choose_auto_model(str(path), params, deadline, audio_hash)
+    cache_key = transcription_cache_key(audio_hash, model, params) if audio_hash else None
+    return await transcribe_source(
+        str(path), model, params, cache_key, audio_hash, timer, columnar=wants_columnar(accept),
+        request=http_request, request_id=x_request_id
+    )
+
+@app.post("/transcribe-stream")
+async def transcribe_audio_stream(
+    file: UploadFile = File(...),
+    model: str = "base",
+    deadline: Optional[float] = None,
+    params: TranscriptionParameters = Depends(),
+    accept: Optional[str] = Header(None),
+    x_request_id: Optional[str] = Header(None),
+    refine_model: Optional[str] = None
+):
+    """
+    Transcreve um arquivo de áudio enviando os segmentos via Server-Sent Events
+    
+    Eventos emitidos:
+        segment: texto, início/fim, palavras e progresso (0-1) de cada segmento
+        draft: com refine_model, o rascunho completo de `model` (formato de /transcribe)
+        refined: com refine_model, cada segmento do refinamento; `replaces` é
+            quantos segmentos do início do rascunho ele substitui
+        result: resposta final, no mesmo formato de /transcribe
+        error: mensagem de erro, se a transcrição falhar (com cancelled=true se cancelada)
+    
+    Aceita model=auto e `deadline`, como /transcribe.
+    
+    Com `refine_model` (modo em duas passagens), `model` deve ser um modelo
+    pequeno: o texto chega com a latência dele e o resultado final tem a
+    qualidade de `refine_model`.
+    
+    Fechar a conexão cancela a transcrição.
+    """
+    file_extension = validate_audio_file(file)
+    validate_model(model, allow_auto=True)
+    validate_deadline(deadline)
+    refine_model = validate_refine_model(model, refine_model)
+    
+    timer = StageTimer()
+    with timer.stage("upload"):
+        upload = await receive_upload(file, file_extension, in_memory=True)
+    if model == AUTO_MODEL:
+        model, params = await choose_auto_model(upload, params, deadline)
+        refine_model = validate_refine_model(model, refine_model)
+    cache_key = transcription_cache_key(upload.audio_hash, model, params)
+    refine_cache_key = (
+        transcription_cache_key(upload.audio_hash, refine_model, params) if refine_model else None
+    )
+    return stream_transcription(
+        upload, model, params, cache_key, release=upload.close, timer=timer,
+        columnar=wants_columnar(accept), request_id=x_request_id,
+        refine_model=refine_model, refine_cache_key=refine_cache_key
+    )
+
+@app.post("/transcribe-path-stream")
+async def transcribe_local_file_stream(
+    request: LocalFileRequest,
+    model: str = "base",
+    deadline: Optional[float] = None,
+    params: TranscriptionParameters = Depends(),
+    accept: Optional[str] = Header(None),
+    x_request_id: Optional[str] = Header(None),
+    refine_model: Optional[str] = None
+):
+    """
+    Transcreve um arquivo local (como /transcribe-path) enviando os segmentos via SSE
+
+    Aceita `refine_model`, model=auto e `deadline` e emite os mesmos eventos
+    de /transcribe-stream.
+    """
+    path = validate_local_file(request.path)
+    validate_model(model, allow_auto=True)
+    validate_deadline(deadline)
+    refine_model = validate_refine_model(model, refine_model)
+    
+    timer = StageTimer()
+    with timer.stage("file_hash"):
+        audio_hash = await local_file_hash(path, params)
+    if model == AUTO_MODEL:
+        model, params = await choose_auto_model(str(path), params, deadline, audio_hash)
+        refine_model = validate_refine_model(model, refine_model)
+    cache_key = transcription_cache_key(audio_hash, model, params) if audio_hash else None
+    refine_cache_key = (
+        transcription_cache_key(audio_hash, refine_model, params)
+        if audio_hash and refine_model else None
+    )
+    return stream_transcription(
+        str(path), model, params, cache_key, audio_hash=audio_hash, timer=timer,
+        columnar=wants_columnar(accept), request_id=x_request_id,
+        refine_model=refine_model, refine_cache_key=refine_cache_key
+    )
+
+@app.post("/results/{result_id}/retranscribe", response_model=TranscriptionResponse)
+async def retranscribe_ranges(
+    result_id: str,
+    request: RetranscribeRequest,
+    http_request: Request,
+    model: str = "base",
+    params: TranscriptionParameters = Depends(),
+    accept: Optional[str] = Header(None),
+    x_request_id: Optional[str] = Header(None)
+):
+    """
+    Retranscreve apenas alguns trechos de uma transcrição anterior
+    
+    Os trechos (em segundos) são estendidos até as bordas dos segmentos que
+    tocam, decodificados com um pouco de contexto e encaixados no resultado
+    `result_id`. A resposta traz a transcrição completa, com um novo
+    `result_id` (o original continua válido).
+    
+    Args:
+        result_id: Identificador retornado por /transcribe e afins
+        request: Trechos e, se o áudio não estiver mais no cache, o caminho do arquivo original
+        model: Modelo usado nos trechos (normalmente maior que o original)
+        params: Perfil e idioma da nova decodificação (o idioma padrão é o do resultado)
+    """
+    validate_model(model)
+    if not request.ranges:
+        raise HTTPException(status_code=400, detail="Informe ao menos um trecho")
+    for time_range in request.ranges:
+        if time_range.end <= time_range.start or time_range.start < 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Trecho inválido: {time_range.start}-{time_range.end}s"
+            )
+    if request.padding is not None and request.padding < 0:
+        raise HTTPException(status_code=400, detail="O contexto não pode ser negativo")
+    
+    timer = StageTimer()
+    columnar = wants_columnar(accept)
+    with timer.stage("cache_lookup"):
+        base = result_cache.get(result_id)
+    if base is None:
         raise HTTPException(
-            status_code=400,
-            detail="Máximo de 10 arquivos por requisição"
+            status_code=404,
+            detail=f"Resultado não encontrado (removido do cache ou cache desativado): {result_id}"
+        )
+    if "segments" not in base or not base.get("audio_hash"):
+        raise HTTPException(
+            status_code=409,
+            detail="Resultado sem os dados necessários para retranscrição; transcreva o arquivo novamente"
         )
     
-    results = []
-    successful = 0
-    failed = 0
+    ranges = sorted((r.start, r.end) for r in request.ranges)
+    padding = RETRANSCRIBE_PADDING_SECONDS if request.padding is None else request.padding
+    cache_key = make_cache_key(
+        result_id,
+        model=model,
+        compute_type=model_spec(model).compute_type,
+        ranges=ranges,
+        padding=padding,
+        params=params.model_dump(exclude={"use_cache"})
+    )
+    if params.use_cache:
+        cached = lookup_cached_result(cache_key, model, timer)
+        if cached is not None:
+            return negotiated_response(
+                build_response(cached, from_cache=True, columnar=columnar), columnar
+            )
     
-    for file in files:
-        try:
-            # Validar formato do arquivo
-            allowed_extensions = {'.mp3', '.wav', '.flac', '.m4a', '.ogg', '.webm'}
-            file_extension = Path(file.filename).suffix.lower()
-            
-            if file_extension not in allowed_extensions:
-                results.append({
-                    "filename": file.filename,
-                    "status": "error",
-                    "error": f"Formato não suportado: {file_extension}",
-                    "text": "",
-                    "processing_time": 0
-                })
-                failed += 1
-                continue
-            
-            # Criar arquivo temporário
-            temp_file = tempfile.NamedTemporaryFile(
-                delete=False, 
-                suffix=file_extension,
-                dir=str(TEMP_DIR)
+    # Áudio decodificado do cache ou, se foi removido, o arquivo original
+    path = None
+    audio = pcm_cache.get(base["audio_hash"])
+    if audio is None:
+        if request.path is None:
+            raise HTTPException(
+                status_code=409,
+                detail="O áudio original não está mais no cache; informe o caminho do arquivo (path)"
             )
-            
-            # Copiar conteúdo do upload
-            shutil.copyfileobj(file.file, temp_file)
-            temp_file.close()
-            
-            # Carregar modelo
-            whisper_model = load_whisper_model(model)
-            
-            # Transcrever
-            start_time = asyncio.get_event_loop().time()
-            
-            # Detectar idioma se necessário
-            detected_language = None
-            if auto_detect_language and not language:
-                segments, info = whisper_model.transcribe(
-                    temp_file.name,
-                    language=None,
-                    beam_size=1,
-                    best_of=1,
-                    temperature=0.0,
-                    condition_on_previous_text=False,
-                    word_timestamps=False
+        local_path = validate_local_file(request.path)
+        stat = local_path.stat()
+        with timer.stage("file_hash"):
+            audio_hash = await asyncio.get_running_loop().run_in_executor(
+                None, _local_file_hash, str(local_path), stat.st_size, stat.st_mtime_ns
+            )
+        if audio_hash != base["audio_hash"]:
+            raise HTTPException(
+                status_code=409,
+                detail="O arquivo informado não é o mesmo da transcrição original"
+            )
+        path = str(local_path)
+    
+    # O áudio do cache é mapeado do disco; só o arquivo decodificado inteiro ocupa memória
+    audio_seconds = (
+        base["audio_duration"] if audio is None
+        else sum(end - start + 2 * padding for start, end in ranges)
+    )
+    request_id, cancel_token = register_transcription(x_request_id)
+    try:
+        timer.begin("queue_wait")
+        future = submit_to_pool(
+            run_retranscription, base, audio, path, model, params, ranges, padding,
+            cache_key, timer, cancel_token,
+            admit=admission_gate(
+                partial(estimate_request_memory, model_spec(model), audio_seconds, None),
+                cancel_token, model, timer
+            )
+        )
+        if not await client_waits_for(http_request, future):
+            logger.info(f"Cliente desconectou; cancelando a retranscrição {request_id}")
+            cancel_token.cancel()
+        result = await future
+    except TranscriptionCancelled:
+        raise HTTPException(status_code=409, detail=CANCELLED_DETAIL)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Erro durante retranscrição: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Erro durante retranscrição: {str(e)}"
+        )
+    finally:
+        active_transcriptions.unregister(request_id)
+    return negotiated_response(build_response(result, columnar=columnar), columnar)
+
+@app.post("/transcriptions/{request_id}/cancel")
+async def cancel_transcription(request_id: str):
+    """
+    Cancela uma transcrição em andamento pelo ID da requisição (cabeçalho
+    X-Request-ID enviado pelo cliente ou devolvido nas respostas SSE)
+    
+    A decodificação para antes do próximo segmento; a requisição original
+    recebe HTTP 409 (ou o evento error com cancelled=true, via SSE).
+    """
+    if not active_transcriptions.cancel(request_id):
+        raise HTTPException(status_code=404, detail=f"Transcrição não encontrada: {request_id}")
+    logger.info(f"Transcrição {request_id} cancelada pelo cliente")
+    return {"request_id": request_id, "status": "cancelling"}
+
+async def process_job_file(job: BatchJob, job_file: JobFile) -> dict:
+    """Transcreve um arquivo de um job (consultando o cache de resultados antes)"""
+    model = job.options["model"]
+    params = TranscriptionParameters.model_validate(job.options)
+    loop = asyncio.get_running_loop()
+    
+    if job_file.audio_hash is None:
+        job_file.audio_hash = await loop.run_in_executor(None, file_sha256, job_file.path)
+    
+    cache_key = transcription_cache_key(job_file.audio_hash, model, params)
+    if params.use_cache:
+        cached = lookup_cached_result(cache_key, model)
+        if cached is not None:
+            return {**public_result(cached), "from_cache": True}
+    
+    # Jobs não recebem 503: se a fila estiver cheia, aguardam uma vaga
+    while True:
+        job.cancel_token.check()
+        try:
+            future = inference_pool.submit(
+                run_transcription, job_file.path, model, params,
+                cache_key=cache_key, audio_hash=job_file.audio_hash,
+                cancel_token=job.cancel_token,
+                admit=admission_gate(
+                    partial(
+                        estimate_source_memory, job_file.path, model, params,
+                        job_file.audio_hash, job_file.duration
+                    ),
+                    job.cancel_token, model
                 )
-                detected_language = info.language
-            
-            # Transcrição completa
-            final_language = language or detected_language
-            segments, info = whisper_model.transcribe(
-                temp_file.name,
-                language=final_language,
-                beam_size=5,
-                best_of=5,
-                temperature=0.0,
-                word_timestamps=True,
-                condition_on_previous_text=False
             )
-            
-            # Processar resultado
-            transcription_text = ""
-            word_timestamps = []
-            
-            for segment in segments:
-                transcription_text += segment.text + " "
-                if hasattr(segment, 'words') and segment.words:
-                    for word in segment.words:
-                        word_timestamps.append({
-                            "word": word.word,
-                            "start": word.start,
-                            "end": word.end,
-                            "probability": getattr(word, 'probability', None)
-                        })
-            
-            end_time = asyncio.get_event_loop().time()
-            processing_time = end_time - start_time
-            
+            break
+        except QueueFullError:
+            await asyncio.sleep(1)
+    
+    result = await future
+    return {**public_result(result), "from_cache": False}
+
+# Jobs em lote: os arquivos são distribuídos entre os workers do pool de inferência
+job_manager = JobManager(process_job_file, workers=INFERENCE_WORKERS)
+
+async def create_upload_job(
+    files: List[UploadFile],
+    model: str,
+    params: TranscriptionParameters
+) -> BatchJob:
+    """Salva os uploads em arquivos temporários e cria o job correspondente"""
+    loop = asyncio.get_running_loop()
+    job_files = []
+    
+    for index, file in enumerate(files):
+        try:
+            file_extension = validate_audio_file(file)
+        except HTTPException:
+            job_file = JobFile(index, file.filename, "")
+            job_file.status = "error"
+            job_file.error = f"Formato não suportado: {Path(file.filename).suffix.lower()}"
+            job_files.append(job_file)
+            continue
+        
+        # Os arquivos podem esperar na fila do job: manter em disco, não em memória
+        upload = await receive_upload(file, file_extension)
+        duration = await loop.run_in_executor(None, probe_duration, upload.path)
+        job_files.append(JobFile(
+            index, file.filename, upload.path,
+            temporary=True, duration=duration, audio_hash=upload.audio_hash
+        ))
+    
+    return job_manager.create_job(job_files, {"model": model, **params.model_dump()})
+
+def get_job_or_404(job_id: str) -> BatchJob:
+    job = job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job não encontrado: {job_id}")
+    return job
+
+@app.post("/transcribe-batch", response_model=BatchTranscriptionResponse)
+async def transcribe_batch(
+    request: Request,
+    files: List[UploadFile] = File(...),
+    model: str = "base",
+    params: TranscriptionParameters = Depends(),
+    accept: Optional[str] = Header(None)
+):
+    """
+    Transcreve múltiplos arquivos de áudio em lote e aguarda todos terminarem
+    
+    Os arquivos são processados em paralelo, dos mais curtos para os mais
+    longos. Para lotes grandes, prefira POST /jobs, que retorna imediatamente.
+    
+    Args:
+        files: Lista de arquivos de áudio
+        model: Nome do modelo a ser usado
+        params: Idioma, cache, VAD e divisão em blocos (ver TranscriptionParameters)
+    """
+    validate_model(model)
+    columnar = wants_columnar(accept)
+    job = await create_upload_job(files, model, params)
+    if not await client_waits_for(request, asyncio.ensure_future(job.done.wait())):
+        logger.info(f"Cliente desconectou; cancelando o job {job.id}")
+        job_manager.cancel(job.id)
+        await job.done.wait()
+    
+    results = []
+    for job_file in job.files:
+        if job_file.status == "completed":
+            result = dict(job_file.result)
+            if columnar:
+                result["words"] = to_columns(result.pop("word_timestamps", None))
             results.append({
-                "filename": file.filename,
+                "filename": job_file.filename,
                 "status": "completed",
-                "text": transcription_text.strip(),
-                "processing_time": processing_time,
-                "detected_language": detected_language,
-                "word_timestamps": word_timestamps
+                **result
             })
-            
-            successful += 1
-            
-            # Agendar limpeza
-            background_tasks.add_task(cleanup_temp_file, temp_file.name)
-            
-        except Exception as e:
-            logger.error(f"Erro ao transcrever {file.filename}: {str(e)}")
+        else:
             results.append({
-                "filename": file.filename,
+                "filename": job_file.filename,
                 "status": "error",
-                "error": str(e),
+                "error": job_file.error or job_file.status,
                 "text": "",
                 "processing_time": 0
             })
-            failed += 1
-            
-            # Limpar arquivo temporário em caso de erro
-            if 'temp_file' in locals() and temp_file and os.path.exists(temp_file.name):
-                os.unlink(temp_file.name)
     
-    return BatchTranscriptionResponse(
+    successful = sum(1 for r in results if r["status"] == "completed")
+    return negotiated_response(BatchTranscriptionResponse(
         results=results,
         total_files=len(files),
         successful=successful,
-        failed=failed
+        failed=len(files) - successful
+    ), columnar)
+
+@app.post("/jobs")
+async def create_job(
+    files: List[UploadFile] = File(...),
+    model: str = "base",
+    params: TranscriptionParameters = Depends()
+):
+    """
+    Cria um job de transcrição em lote e retorna imediatamente o seu ID
+    
+    O andamento pode ser consultado em GET /jobs/{job_id} ou acompanhado
+    via Server-Sent Events em GET /jobs/{job_id}/events.
+    """
+    validate_model(model)
+    job = await create_upload_job(files, model, params)
+    return job.to_dict(include_results=False)
+
+@app.post("/jobs/directory")
+async def create_directory_job(request: DirectoryJobRequest):
+    """Cria um job com todos os arquivos de áudio de um diretório local"""
+    validate_model(request.model)
+    
+    directory = resolve_local_path(request.directory)
+    if not directory.is_dir():
+        raise HTTPException(
+            status_code=400,
+            detail=f"Diretório não encontrado: {request.directory}"
+        )
+    
+    pattern = "**/*" if request.recursive else "*"
+    paths = sorted(
+        path for path in directory.glob(pattern)
+        if path.is_file() and path.suffix.lower() in ALLOWED_EXTENSIONS
     )
+    if not paths:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Nenhum arquivo de áudio encontrado em {request.directory}"
+        )
+    
+    loop = asyncio.get_running_loop()
+    job_files = []
+    for index, path in enumerate(paths):
+        duration = await loop.run_in_executor(None, probe_duration, str(path))
+        job_files.append(JobFile(
+            index, str(path.relative_to(directory)), str(path), duration=duration
+        ))
+    
+    job = job_manager.create_job(job_files, request.model_dump(exclude={"directory", "recursive"}))
+    return job.to_dict(include_results=False)
+
+@app.get("/jobs")
+async def list_jobs():
+    """Lista os jobs conhecidos, sem os resultados"""
+    return [job.to_dict(include_results=False) for job in job_manager.list()]
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """Estado do job e resultados dos arquivos já concluídos"""
+    return get_job_or_404(job_id).to_dict()
 
-async def cleanup_temp_file(file_path: str):
-    """Remove arquivo temporário"""
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str):
+    """
+    Acompanha o job via Server-Sent Events
+    
+    Eventos emitidos:
+        job: estado geral do job (enviado no início e ao terminar)
+        file: mudança de estado de um arquivo, com o resultado quando concluído
+    """
+    job = get_job_or_404(job_id)
+    events = job.subscribe()
+    
+    async def event_stream():
+        try:
+            yield format_sse("job", job.to_dict(include_results=False))
+            if job.done.is_set():
+                return
+            while True:
+                event, data = await events.get()
+                yield format_sse(event, data)
+                if event == "job":
+                    break
+        finally:
+            job.unsubscribe(events)
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
+
+@app.post("/jobs/{job_id}/cancel")
+async def cancel_job(job_id: str):
+    """Cancela o job: os arquivos pendentes não começam e os em execução param no próximo segmento"""
+    get_job_or_404(job_id)
+    return job_manager.cancel(job_id).to_dict(include_results=False)
+
+def preload_specs() -> List[ModelSpec]:
+    """Modelos de PRELOAD_MODELS já baixados"""
+    available = {model.name: model.available for model in AVAILABLE_MODELS}
+    specs = []
+    for model_name in PRELOAD_MODELS:
+        if model_name not in available:
+            logger.warning(f"Modelo {model_name} desconhecido, pré-carregamento ignorado")
+        elif not available[model_name]:
+            logger.info(f"Modelo {model_name} não baixado, pré-carregamento ignorado")
+        else:
+            specs.append(model_spec(model_name))
+    if specs:
+        logger.info(f"Pré-carregando modelos: {', '.join(str(spec) for spec in specs)}")
+    return specs
+
+def interrupted_job_file(header: dict) -> Optional[tuple]:
+    """
+    Arquivo e opções do job que retoma uma transcrição interrompida, ou None
+    se ela não puder ser retomada (o checkpoint é então descartado)
+    """
+    key = header["key"]
+    audio_hash = header.get("audio_hash")
+    path = header.get("path")
     try:
-        if os.path.exists(file_path):
-            os.unlink(file_path)
-            logger.info(f"Arquivo temporário removido: {file_path}")
+        model = header["model"]
+        params = TranscriptionParameters.model_validate(header["params"])
+        validate_model(model)
     except Exception as e:
-        logger.warning(f"Erro ao remover arquivo temporário {file_path}: {str(e)}")
+        logger.warning(f"Checkpoint {key} inválido, descartando: {e}")
+        checkpoint_store.discard(key)
+        return None
+    
+    if result_cache.contains(key):
+        # Concluída, mas interrompida antes de apagar o checkpoint
+        checkpoint_store.discard(key)
+        return None
+    # Com outra configuração (quantização, blocos, lotes) a transcrição teria outra chave
+    if audio_hash is None or transcription_cache_key(audio_hash, model, params) != key:
+        logger.info(f"Checkpoint {key} de outra configuração, descartando")
+        checkpoint_store.discard(key)
+        return None
+    # O áudio vem do arquivo original ou, se ele não existir mais, do cache de áudio
+    if not (path and Path(path).is_file()):
+        path = None
+        if not pcm_cache.contains(audio_hash):
+            logger.warning(f"Áudio do checkpoint {key} não está mais disponível, descartando")
+            checkpoint_store.discard(key)
+            return None
+    
+    job_file = JobFile(
+        0, Path(path).name if path else f"{audio_hash[:12]}.pcm", path or "",
+        # Uploads de jobs ficam em TEMP_DIR e são removidos ao fim, como antes da interrupção
+        temporary=path is not None and Path(path).parent == TEMP_DIR,
+        duration=header.get("audio_duration"),
+        audio_hash=audio_hash
+    )
+    return job_file, {"model": model, **params.model_dump()}
+
+async def resume_interrupted_transcriptions():
+    """
+    Retoma em segundo plano, como jobs, as transcrições interrompidas por uma
+    queda ou reinício do backend; o resultado fica no cache de resultados
+    """
+    loop = asyncio.get_running_loop()
+    headers = await loop.run_in_executor(None, checkpoint_store.interrupted)
+    for header in headers:
+        resumable = interrupted_job_file(header)
+        if resumable is None:
+            continue
+        job_file, options = resumable
+        job = job_manager.create_job([job_file], options)
+        logger.info(
+            f"Retomando {job_file.filename} a partir de {header['resume_at']:.0f}s (job {job.id})"
+        )
 
 @app.on_event("startup")
 async def startup_event():
     """Evento executado na inicialização da API"""
     logger.info("EchoTranscribe API iniciada")
+    logger.info(
+        f"Pool de inferência: {INFERENCE_WORKERS} worker(s), fila de {INFERENCE_QUEUE_SIZE}"
+    )
     check_model_availability()
+    # Bibliotecas pesadas e modelos são carregados em segundo plano
+    model_warmer.start(preload_specs())
+    if CHECKPOINT_MIN_SECONDS > 0:
+        asyncio.ensure_future(resume_interrupted_transcriptions())
+    
+    global startup_time
+    startup_time = time.perf_counter() - STARTUP_BEGAN
+    logger.info(f"API pronta em {startup_time * 1000:.0f} ms")
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Evento executado no encerramento da API"""
     logger.info("EchoTranscribe API encerrada")
+    global shutting_down
+    shutting_down = True
+    model_warmer.stop()
+    job_manager.shutdown()
+    inference_pool.shutdown()
+    chunk_executor.shutdown(wait=False, cancel_futures=True)
+    pcm_cache_writer.shutdown(wait=True)
+    if decode_batcher is not None:
+        decode_batcher.close()
+    model_registry.clear()
     
     # Limpar arquivos temporários
     try:
@@ -479,24 +2308,22 @@ async def shutdown_event():
         logger.warning(f"Erro ao limpar arquivos temporários: {str(e)}")
 
 if __name__ == "__main__":
-    # Verificar se todas as dependências estão instaladas
-    try:
-        import faster_whisper
-        import torch
-        logger.info("✅ All dependencies are installed")
-    except ImportError as e:
-        logger.error(f"❌ Missing dependency: {e}")
+    # Verificar se todas as dependências estão instaladas, pelos metadados dos
+    # pacotes: importá-las aqui atrasaria a subida do servidor em segundos.
+    # A importação e a verificação de CUDA acontecem em segundo plano (warmup.py)
+    from importlib.metadata import PackageNotFoundError, version
+    
+    missing = []
+    for package in ("faster-whisper", "torch"):
+        try:
+            version(package)
+        except PackageNotFoundError:
+            missing.append(package)
+    if missing:
+        logger.error(f"❌ Missing dependency: {', '.join(missing)}")
         logger.error("Please install dependencies with: pip install -r requirements.txt")
         exit(1)
-    
-    # Verificar disponibilidade do PyTorch
-    try:
-        if torch.cuda.is_available():
-            logger.info("🚀 GPU (CUDA) available for acceleration")
-        else:
-            logger.info("⚠️ Using CPU only (no CUDA available)")
-    except Exception as e:
-        logger.warning(f"Could not check CUDA availability: {e}")
+    logger.info("✅ All dependencies are installed")
     
     # Criar diretório de modelos se não existir
     try:
@@ -531,8 +2358,9 @@ if __name__ == "__main__":
     
     try:
         # Configuração para produção e desenvolvimento
+        # Passar o app já importado: "main:app" importaria este módulo uma segunda vez
         uvicorn.run(
-            "main:app",
+            app,
             host="127.0.0.1",
             port=port,
             reload=False,  # Desabilitado para produção
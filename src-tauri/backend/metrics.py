@@ -0,0 +1,144 @@
+"""
+EchoTranscribe Backend - Métricas
+Histogramas no formato de texto do Prometheus e cronômetro das etapas de cada transcrição
+"""
+
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+# Limites (em segundos) dos histogramas de duração
+DURATION_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0
+)
+
+# Limites do fator de tempo real (tempo de processamento / duração do áudio)
+RTF_BUCKETS = (0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+
+# Tipo de conteúdo do formato de texto do Prometheus
+CONTENT_TYPE = "text/plain; version=0.0.4"
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Sequence[Tuple[str, object]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class Histogram:
+    """Histograma cumulativo com rótulos, seguro para uso entre threads"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = DURATION_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._lock = threading.Lock()
+        # rótulos -> (contagem por limite, soma, total)
+        self._series: Dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels[name]) for name in self.label_names)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += 1
+                    break
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = {
+                key: (list(counts), total, count)
+                for key, (counts, total, count) in self._series.items()
+            }
+
+        for key, (counts, total, count) in sorted(series.items()):
+            labels = list(zip(self.label_names, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                bucket_labels = _format_labels(labels + [("le", _format_value(bound))])
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(labels)} {count}")
+        return lines
+
+
+def render_samples(
+    name: str,
+    documentation: str,
+    metric_type: str,
+    samples: Iterable[Tuple[Dict[str, object], float]]
+) -> List[str]:
+    """Medidor ou contador cujos valores são lidos no momento da coleta"""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {metric_type}"]
+    for labels, value in samples:
+        lines.append(f"{name}{_format_labels(list(labels.items()))} {_format_value(value)}")
+    return lines
+
+
+class StageTimer:
+    """
+    Tempo gasto em cada etapa de uma transcrição.
+
+    Etapas aninhadas descontam seu tempo da etapa externa, de modo que a
+    soma dos tempos não conta nada duas vezes. `begin`/`end` medem esperas
+    que começam e terminam em threads diferentes (como a fila do pool).
+    """
+
+    def __init__(self):
+        self.timings: Dict[str, float] = {}
+        self._nested: List[float] = []
+        self._open: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start_time = time.perf_counter()
+        self._nested.append(0.0)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start_time
+            self.add(name, elapsed - self._nested.pop())
+            if self._nested:
+                self._nested[-1] += elapsed
+
+    def begin(self, name: str):
+        self._open[name] = time.perf_counter()
+
+    def end(self, name: str):
+        start_time = self._open.pop(name, None)
+        if start_time is not None:
+            self.add(name, time.perf_counter() - start_time)
@@ -0,0 +1,163 @@
+"""
+EchoTranscribe Backend - Registro de modelos carregados
+Mantém vários modelos Whisper em memória com despejo LRU dentro de um orçamento de memória
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Hashable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _CacheEntry:
+    def __init__(self, model: Any, memory_bytes: int, load_time: float, info: Optional[dict] = None):
+        self.model = model
+        self.memory_bytes = memory_bytes
+        self.info = info or {}
+        self.load_time = load_time
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+        self.refcount = 0
+
+
+class ModelRegistry:
+    """
+    Cache LRU de modelos carregados.
+
+    - `acquire` devolve o modelo e incrementa sua contagem de referências;
+      modelos em uso nunca são despejados.
+    - Quando a memória estimada passa de `memory_budget_bytes`, os modelos
+      ociosos menos usados recentemente são removidos.
+    - Requisições simultâneas pelo mesmo modelo aguardam um único carregamento.
+    - `describer`, se informado, gera informações extras de cada modelo para `stats`.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Hashable], Any],
+        memory_budget_bytes: int,
+        memory_estimator: Optional[Callable[[Hashable, Any], int]] = None,
+        describer: Optional[Callable[[Hashable, Any], dict]] = None
+    ):
+        self._loader = loader
+        self._memory_estimator = memory_estimator or (lambda key, model: 0)
+        self._describer = describer or (lambda key, model: {})
+        self.memory_budget_bytes = memory_budget_bytes
+        self._entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self._loading = set()
+        self._hits: Dict[Hashable, int] = {}
+        self._misses: Dict[Hashable, int] = {}
+        self._evictions = 0
+        self._condition = threading.Condition()
+
+    @contextmanager
+    def acquire(self, key: Hashable) -> Iterator[Any]:
+        """Obtém o modelo (carregando se necessário) enquanto o bloco estiver ativo"""
+        entry = self._checkout(key)
+        try:
+            yield entry.model
+        finally:
+            self._checkin(key, entry)
+
+    def _checkout(self, key: Hashable) -> _CacheEntry:
+        with self._condition:
+            while True:
+                entry = self._entries.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    self._hits[key] = self._hits.get(key, 0) + 1
+                    entry.last_used = time.time()
+                    self._entries.move_to_end(key)
+                    logger.info(f"Modelo {key} já carregado")
+                    return entry
+                if key not in self._loading:
+                    break
+                # Outra thread já está carregando este modelo
+                self._condition.wait()
+
+            self._loading.add(key)
+            self._misses[key] = self._misses.get(key, 0) + 1
+
+        try:
+            start_time = time.monotonic()
+            model = self._loader(key)
+            load_time = time.monotonic() - start_time
+            memory_bytes = self._memory_estimator(key, model)
+            info = self._describer(key, model)
+        except BaseException:
+            with self._condition:
+                self._loading.discard(key)
+                self._condition.notify_all()
+            raise
+
+        with self._condition:
+            entry = _CacheEntry(model, memory_bytes, load_time, info)
+            entry.refcount = 1
+            self._entries[key] = entry
+            self._loading.discard(key)
+            self._evict_locked()
+            self._condition.notify_all()
+        return entry
+
+    def _checkin(self, key: Hashable, entry: _CacheEntry):
+        with self._condition:
+            entry.refcount -= 1
+            entry.last_used = time.time()
+            self._evict_locked()
+
+    def _evict_locked(self):
+        """Remove modelos ociosos, do menos para o mais recente, até caber no orçamento"""
+        # O modelo usado mais recentemente sempre fica, mesmo acima do orçamento
+        for key in list(self._entries)[:-1]:
+            if self.memory_used() <= self.memory_budget_bytes:
+                return
+            entry = self._entries[key]
+            if entry.refcount > 0:
+                continue
+            del self._entries[key]
+            self._evictions += 1
+            logger.info(f"Modelo {key} removido da memória (LRU)")
+
+    def is_loaded(self, key: Hashable) -> bool:
+        with self._condition:
+            return key in self._entries
+
+    def memory_used(self) -> int:
+        return sum(entry.memory_bytes for entry in self._entries.values())
+
+    def clear(self):
+        """Remove todos os modelos que não estão em uso"""
+        with self._condition:
+            for key in [k for k, e in self._entries.items() if e.refcount == 0]:
+                del self._entries[key]
+
+    def stats(self) -> dict:
+        """Estado do cache: modelos carregados, memória e contadores"""
+        with self._condition:
+            models = []
+            for key, entry in self._entries.items():
+                models.append({
+                    "key": str(key),
+                    **entry.info,
+                    "memory_bytes": entry.memory_bytes,
+                    "in_use": entry.refcount,
+                    "hits": self._hits.get(key, 0),
+                    "misses": self._misses.get(key, 0),
+                    "load_time": entry.load_time,
+                    "loaded_at": entry.loaded_at,
+                    "last_used": entry.last_used,
+                })
+            return {
+                "memory_budget_bytes": self.memory_budget_bytes,
+                "memory_used_bytes": self.memory_used(),
+                "hits": sum(self._hits.values()),
+                "misses": sum(self._misses.values()),
+                "evictions": self._evictions,
+                "loading": [str(key) for key in self._loading],
+                # Do menos para o mais recentemente usado
+                "models": models,
+            }
@@ -0,0 +1,50 @@
+"""
+EchoTranscribe Backend - Cache de áudio decodificado
+PCM float32 a 16 kHz salvo em arquivos .npy, endereçados pelo hash do arquivo original e lidos via mmap
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+
+from result_cache import DiskCache
+
+logger = logging.getLogger(__name__)
+
+
+class PcmCache(DiskCache):
+    """
+    Cache do áudio decodificado, um arquivo .npy por hash de conteúdo.
+
+    Ao repetir a transcrição do mesmo arquivo (outro modelo, idioma ou
+    perfil), o áudio é mapeado do disco em vez de decodificado de novo.
+    """
+
+    suffix = ".npy"
+
+    def get(self, audio_hash: str) -> Optional[np.ndarray]:
+        """Áudio decodificado (somente leitura, mapeado em memória), ou None"""
+        if not self.enabled:
+            return None
+        path = self._path(audio_hash)
+        try:
+            audio = np.load(path, mmap_mode="r")
+        except FileNotFoundError:
+            self._record(hit=False)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada inválida no cache de áudio {path.name}: {e}")
+            self._remove(path)
+            self._record(hit=False)
+            return None
+
+        self._touch(path)
+        self._record(hit=True)
+        return audio
+
+    def put(self, audio_hash: str, audio: np.ndarray):
+        """Salva o áudio decodificado de forma atômica e aplica o limite de tamanho"""
+        if not self.enabled or audio.nbytes > self.max_bytes:
+            return
+        self._write_atomic(audio_hash, lambda f: np.save(f, audio, allow_pickle=False))
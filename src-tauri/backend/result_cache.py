@@ -0,0 +1,167 @@
+"""
+EchoTranscribe Backend - Cache de resultados de transcrição
+Resultados salvos em disco, endereçados pelo hash do áudio e pelos parâmetros de decodificação
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import BinaryIO, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def file_sha256(file_path: str) -> str:
+    """Hash SHA-256 do conteúdo de um arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def make_cache_key(audio_hash: str, **params) -> str:
+    """Gera a chave do cache a partir do hash do áudio e dos parâmetros da transcrição"""
+    payload = json.dumps({"audio": audio_hash, **params}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class DiskCache:
+    """
+    Base dos caches em disco: um arquivo por chave em `directory`.
+
+    O tamanho total é limitado a `max_bytes`; ao ultrapassar, os arquivos
+    acessados há mais tempo (mtime, atualizado a cada acerto) são removidos.
+    """
+
+    suffix = ""
+
+    def __init__(self, directory: Path, max_bytes: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if self.enabled:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}{self.suffix}"
+
+    def contains(self, key: str) -> bool:
+        """Se há uma entrada para a chave (sem contar como acerto nem renovar o acesso)"""
+        return self.enabled and self._path(key).exists()
+
+    def _record(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def _touch(self, path: Path):
+        """Marca como usado recentemente para o despejo LRU"""
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+    def _write_atomic(self, key: str, write: Callable[[BinaryIO], None]) -> bool:
+        """Grava em um arquivo temporário e o move para o lugar, aplicando o limite de tamanho"""
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=str(self.directory), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    write(f)
+                os.replace(temp_path, self._path(key))
+            except BaseException:
+                self._remove(Path(temp_path))
+                raise
+        except OSError as e:
+            logger.warning(f"Não foi possível salvar em {self.directory}: {e}")
+            return False
+        self._evict()
+        return True
+
+    def _remove(self, path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _entries(self):
+        entries = []
+        for path in self.directory.glob(f"*{self.suffix}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            # Remover do acesso mais antigo para o mais recente
+            for _, size, path in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                self._remove(path)
+                total -= size
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        entries = self._entries()
+        with self._lock:
+            return {
+                "enabled": True,
+                "entries": len(entries),
+                "size_bytes": sum(size for _, size, _ in entries),
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+class ResultCache(DiskCache):
+    """Cache de resultados de transcrição em arquivos JSON, um por chave"""
+
+    suffix = ".json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Retorna o resultado salvo para a chave, ou None"""
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            self._record(hit=False)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Entrada inválida no cache de resultados {path.name}: {e}")
+            self._remove(path)
+            self._record(hit=False)
+            return None
+
+        self._touch(path)
+        self._record(hit=True)
+        return result
+
+    def put(self, key: str, result: dict):
+        """Salva o resultado de forma atômica e aplica o limite de tamanho"""
+        if not self.enabled:
+            return
+        payload = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        self._write_atomic(key, lambda f: f.write(payload))
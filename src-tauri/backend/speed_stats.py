@@ -0,0 +1,196 @@
+"""
+EchoTranscribe Backend - Velocidade medida dos modelos
+Fator de tempo real por modelo, tipo de computação e perfil, medido nesta máquina e salvo em disco
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Versão do arquivo; arquivos de outra versão são ignorados
+SPEED_STATS_VERSION = 1
+
+# Fator de tempo real esperado (CPU, int8, perfil balanced) antes de qualquer
+# medição. As medições de qualquer modelo ajustam todas as estimativas pela
+# velocidade relativa desta máquina.
+PRIOR_RTF = {"tiny": 0.06, "base": 0.1, "small": 0.3, "medium": 0.8}
+
+# Custo de cada perfil de decodificação em relação ao balanced
+PROFILE_COST = {"fast": 0.5, "balanced": 1.0, "accurate": 1.8}
+
+# Peso de cada nova medição na média móvel exponencial
+SMOOTHING = 0.2
+
+# Áudios mais curtos são dominados pelo custo fixo e não entram na média
+MIN_OBSERVED_SECONDS = 5.0
+
+
+def _key(*parts: str) -> str:
+    return "/".join(parts)
+
+
+class SpeedStats:
+    """
+    Fator de tempo real (processamento / duração do áudio) medido em cada
+    transcrição, por modelo, tipo de computação e perfil, e o tempo de
+    carregamento de cada modelo.
+
+    As médias são móveis (as mais recentes pesam mais) e são gravadas em
+    `path` a cada medição, para sobreviver a reinicializações.
+    """
+
+    def __init__(self, path: Optional[Path]):
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self._rtf: Dict[str, dict] = {}
+        self._load: Dict[str, dict] = {}
+        self._read()
+
+    def _read(self):
+        if self.path is None:
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Estatísticas de velocidade ignoradas ({self.path}): {e}")
+            return
+        if data.get("version") != SPEED_STATS_VERSION:
+            return
+        self._rtf = data.get("real_time_factor", {})
+        self._load = data.get("load_seconds", {})
+
+    def _write_locked(self):
+        if self.path is None:
+            return
+        data = {
+            "version": SPEED_STATS_VERSION,
+            "real_time_factor": self._rtf,
+            "load_seconds": self._load
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = self.path.with_suffix(".tmp")
+            temporary.write_text(json.dumps(data, indent=2), encoding="utf-8")
+            os.replace(temporary, self.path)
+        except OSError as e:
+            logger.warning(f"Não foi possível gravar as estatísticas de velocidade: {e}")
+
+    @staticmethod
+    def _update(entries: Dict[str, dict], key: str, value: float):
+        entry = entries.get(key)
+        if entry is None:
+            entries[key] = {"value": value, "samples": 1, "updated_at": time.time()}
+            return
+        entry["value"] += SMOOTHING * (value - entry["value"])
+        entry["samples"] += 1
+        entry["updated_at"] = time.time()
+
+    def observe(
+        self,
+        model: str,
+        compute_type: str,
+        profile: str,
+        processing_seconds: float,
+        audio_seconds: float
+    ):
+        """Registra uma transcrição concluída"""
+        if audio_seconds < MIN_OBSERVED_SECONDS:
+            return
+        with self._lock:
+            self._update(
+                self._rtf, _key(model, compute_type, profile), processing_seconds / audio_seconds
+            )
+            self._write_locked()
+
+    def observe_load(self, model: str, compute_type: str, seconds: float):
+        """Registra o carregamento de um modelo"""
+        with self._lock:
+            self._update(self._load, _key(model, compute_type), seconds)
+            self._write_locked()
+
+    def measured(self, model: str, compute_type: str, profile: str) -> Optional[dict]:
+        """Média medida ({value, samples, updated_at}) ou None se nunca medido"""
+        with self._lock:
+            entry = self._rtf.get(_key(model, compute_type, profile))
+            return dict(entry) if entry is not None else None
+
+    def load_seconds(self, model: str, compute_type: str) -> Optional[float]:
+        with self._lock:
+            entry = self._load.get(_key(model, compute_type))
+            return entry["value"] if entry is not None else None
+
+    def _machine_factor_locked(self) -> float:
+        """Quanto esta máquina é mais lenta (>1) ou mais rápida (<1) que as estimativas iniciais"""
+        weighted = 0.0
+        samples = 0
+        for key, entry in self._rtf.items():
+            model, _, profile = key.split("/")
+            if model not in PRIOR_RTF or profile not in PROFILE_COST:
+                continue
+            weighted += entry["samples"] * entry["value"] / (PRIOR_RTF[model] * PROFILE_COST[profile])
+            samples += entry["samples"]
+        return weighted / samples if samples else 1.0
+
+    def estimate(self, model: str, compute_type: str, profile: str) -> Tuple[Optional[float], int]:
+        """
+        Fator de tempo real previsto: a média medida, se houver, ou a estimativa
+        inicial ajustada pelas medições dos outros modelos e perfis.
+
+        Returns:
+            (fator de tempo real ou None se o modelo não for conhecido, medições)
+        """
+        with self._lock:
+            entry = self._rtf.get(_key(model, compute_type, profile))
+            if entry is not None:
+                return entry["value"], entry["samples"]
+            if model not in PRIOR_RTF or profile not in PROFILE_COST:
+                return None, 0
+            return PRIOR_RTF[model] * PROFILE_COST[profile] * self._machine_factor_locked(), 0
+
+    def choose(
+        self,
+        options: List[Tuple[str, str, str, float]],
+        audio_seconds: float,
+        deadline_seconds: float
+    ) -> Tuple[Tuple[str, str, str, float], Optional[float]]:
+        """
+        Escolhe a primeira opção prevista para terminar dentro do prazo
+
+        Args:
+            options: (modelo, tipo de computação, perfil, segundos de carregamento),
+                da mais precisa para a menos precisa
+            audio_seconds: Duração do áudio
+            deadline_seconds: Prazo para terminar a transcrição
+
+        Returns:
+            (opção, segundos previstos); se nenhuma couber no prazo, a mais rápida
+        """
+        fastest = None
+        for option in options:
+            model, compute_type, profile, load_seconds = option
+            rtf, _ = self.estimate(model, compute_type, profile)
+            if rtf is None:
+                continue
+            predicted = load_seconds + rtf * audio_seconds
+            if predicted <= deadline_seconds:
+                return option, predicted
+            if fastest is None or predicted < fastest[1]:
+                fastest = (option, predicted)
+        if fastest is None:
+            return options[-1], None
+        return fastest
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "measurements": sum(entry["samples"] for entry in self._rtf.values()),
+                "machine_factor": self._machine_factor_locked()
+            }
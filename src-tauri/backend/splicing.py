@@ -0,0 +1,124 @@
+"""
+EchoTranscribe Backend - Retranscrição de trechos
+Decodifica apenas os intervalos editados (com um pouco de contexto) e os encaixa na transcrição salva
+"""
+
+import logging
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+from audio_processing import SAMPLING_RATE
+from chunking import owned_segments
+
+logger = logging.getLogger(__name__)
+
+
+def merge_ranges(
+    ranges: Iterable[Tuple[float, float]],
+    duration: float
+) -> List[Tuple[float, float]]:
+    """Limita os intervalos à duração do áudio, ordena e une os que se sobrepõem"""
+    merged: List[Tuple[float, float]] = []
+    for start, end in sorted((max(0.0, s), min(duration, e)) for s, e in ranges):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def snap_to_segments(
+    ranges: List[Tuple[float, float]],
+    segments: List[dict]
+) -> List[Tuple[float, float]]:
+    """
+    Estende cada intervalo até as bordas dos segmentos que ele toca, para
+    que a junção substitua segmentos inteiros e nenhum fique cortado ao meio
+    """
+    snapped = []
+    for start, end in ranges:
+        for segment in segments:
+            if segment["start"] < end and segment["end"] > start:
+                start = min(start, segment["start"])
+                end = max(end, segment["end"])
+        snapped.append((start, end))
+    # A extensão pode fazer intervalos vizinhos se encontrarem
+    return merge_ranges(snapped, float("inf"))
+
+
+def transcribe_range(
+    whisper_model,
+    audio: np.ndarray,
+    start: float,
+    end: float,
+    padding: float,
+    **transcribe_kwargs
+) -> List[dict]:
+    """
+    Decodifica [start - padding, end + padding) e retorna os segmentos (com
+    as palavras) que caem em [start, end), na linha do tempo do áudio inteiro
+    """
+    first = max(0, int((start - padding) * SAMPLING_RATE))
+    last = min(len(audio), int((end + padding) * SAMPLING_RATE))
+    own_start = int(start * SAMPLING_RATE)
+    own_end = min(len(audio), int(end * SAMPLING_RATE))
+
+    segments, _ = whisper_model.transcribe(audio[first:last], **transcribe_kwargs)
+    return [
+        {
+            "text": segment.text,
+            "start": segment.start,
+            "end": segment.end,
+            "words": [
+                {
+                    "word": word.word,
+                    "start": word.start,
+                    "end": word.end,
+                    "probability": getattr(word, "probability", None)
+                }
+                for word in segment.words or []
+            ]
+        }
+        for segment in owned_segments(
+            list(segments), first, own_start, own_end, is_last=own_end == len(audio)
+        )
+    ]
+
+
+def splice_transcript(
+    segments: List[dict],
+    word_timestamps: List[dict],
+    replacements: List[Tuple[Tuple[float, float], List[dict]]]
+) -> Tuple[List[dict], List[dict]]:
+    """
+    Substitui os segmentos e palavras de cada intervalo pelos da nova
+    decodificação. Um item pertence ao intervalo se o seu ponto médio
+    estiver dentro dele.
+
+    Returns:
+        (segmentos, palavras) em ordem cronológica
+    """
+    def replaced(item: dict) -> bool:
+        middle = (item["start"] + item["end"]) / 2
+        return any(start <= middle < end for (start, end), _ in replacements)
+
+    new_segments = [segment for segment in segments if not replaced(segment)]
+    new_words = [word for word in word_timestamps if not replaced(word)]
+    for _, decoded in replacements:
+        for segment in decoded:
+            new_segments.append({
+                "text": segment["text"], "start": segment["start"], "end": segment["end"]
+            })
+            new_words.extend(segment["words"])
+
+    new_segments.sort(key=lambda segment: segment["start"])
+    new_words.sort(key=lambda word: word["start"])
+    return new_segments, new_words
+
+
+def segments_text(segments: List[dict]) -> str:
+    """Texto da transcrição a partir dos segmentos (como na transcrição completa)"""
+    return "".join(segment["text"] + " " for segment in segments).strip()
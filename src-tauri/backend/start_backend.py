@@ -7,6 +7,7 @@ Este script verifica dependências e inicia o servidor backend
 import sys
 import subprocess
 import os
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
 
 def check_python():
@@ -43,20 +44,19 @@ def install_dependencies():
         return False
 
 def check_dependencies():
-    """Verifica se as dependências estão instaladas"""
+    """Verifica se as dependências estão instaladas (pelos metadados, sem importá-las)"""
     required_packages = [
         "fastapi",
         "uvicorn",
-        "faster_whisper",
+        "faster-whisper",
         "torch"
     ]
     
     missing = []
     for package in required_packages:
         try:
-            __import__(package.replace("-", "_"))
-            print(f"✅ {package} encontrado")
-        except ImportError:
+            print(f"✅ {package} {version(package)} encontrado")
+        except PackageNotFoundError:
             missing.append(package)
             print(f"❌ {package} não encontrado")
     
@@ -76,7 +76,6 @@ def start_backend():
         return False
     
     print("🚀 Iniciando servidor backend...")
-    print("⏳ Aguarde, carregando bibliotecas pesadas (torch, faster-whisper)...")
     
     try:
         # Executar o servidor
@@ -0,0 +1,22 @@
+"""
+Configuração dos testes do backend
+Os módulos do backend são importados pelo nome, como no start_backend.py
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# O main cria modelos, caches e checkpoints em ~/.echo-transcribe ao ser
+# importado: os testes usam uma pasta pessoal temporária, nunca a do usuário
+TEST_HOME = tempfile.mkdtemp(prefix="echo-transcribe-tests-")
+os.environ["HOME"] = TEST_HOME
+os.environ["USERPROFILE"] = TEST_HOME
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(TEST_HOME, ignore_errors=True)
@@ -0,0 +1,175 @@
+"""Admissão das transcrições pelo orçamento de memória"""
+
+import asyncio
+import threading
+
+import pytest
+
+import admission
+from admission import MemoryAdmission
+from cancellation import CancelToken, TranscriptionCancelled
+from inference_pool import InferencePool
+
+MB = 1024 * 1024
+
+
+@pytest.fixture(autouse=True)
+def fast_poll(monkeypatch):
+    monkeypatch.setattr(admission, "WAIT_POLL_SECONDS", 0.01)
+
+
+def fixed_rss(value: int = 100 * MB):
+    return lambda: value
+
+
+async def admitted_within(task: asyncio.Task, seconds: float) -> bool:
+    done, _ = await asyncio.wait({task}, timeout=seconds)
+    return bool(done)
+
+
+def test_disabled_budget_always_admits():
+    async def scenario():
+        controller = MemoryAdmission(None, rss=fixed_rss())
+        reservation = await controller.admit(10**12)
+        assert reservation.waited < 1
+        assert controller.has_room(10**12)
+        reservation.release()
+        assert controller.stats()["enabled"] is False
+
+    asyncio.run(scenario())
+
+
+def test_a_lone_request_is_admitted_even_above_the_budget():
+    async def scenario():
+        controller = MemoryAdmission(200 * MB, rss=fixed_rss())
+        reservation = await controller.admit(500 * MB)
+        assert controller.stats()["reserved_bytes"] == 500 * MB
+        reservation.release()
+        # Devolver de novo não muda nada
+        reservation.release()
+        assert controller.stats()["reserved_bytes"] == 0
+        assert controller.stats()["active"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_request_that_does_not_fit_waits_for_a_release():
+    async def scenario():
+        controller = MemoryAdmission(300 * MB, rss=fixed_rss())
+        first = await controller.admit(150 * MB)
+        assert not controller.has_room(100 * MB)
+
+        second = asyncio.ensure_future(controller.admit(100 * MB))
+        assert not await admitted_within(second, 0.1)
+        assert controller.stats()["waiting"] == 1
+
+        # Reservas são devolvidas nas threads do pool
+        threading.Thread(target=first.release).start()
+        assert await admitted_within(second, 1)
+        second.result().release()
+        stats = controller.stats()
+        assert (stats["admitted"], stats["delayed"], stats["waiting"]) == (2, 1, 0)
+
+    asyncio.run(scenario())
+
+
+def test_requests_that_fit_pass_ahead_of_a_waiting_one():
+    async def scenario():
+        controller = MemoryAdmission(300 * MB, rss=fixed_rss())
+        first = await controller.admit(150 * MB)
+        large = asyncio.ensure_future(controller.admit(150 * MB))
+        await asyncio.sleep(0.05)
+        # Chegou depois da maior, mas cabe
+        small = await asyncio.wait_for(controller.admit(10 * MB), 1)
+        assert not large.done()
+
+        first.release()
+        small.release()
+        assert await admitted_within(large, 1)
+        large.result().release()
+
+    asyncio.run(scenario())
+
+
+def test_nobody_passes_a_request_waiting_for_too_long(monkeypatch):
+    monkeypatch.setattr(admission, "MAX_OVERTAKEN_SECONDS", 0.05)
+
+    async def scenario():
+        controller = MemoryAdmission(300 * MB, rss=fixed_rss())
+        first = await controller.admit(150 * MB)
+        large = asyncio.ensure_future(controller.admit(150 * MB))
+        await asyncio.sleep(0.1)
+        small = asyncio.ensure_future(controller.admit(10 * MB))
+        assert not await admitted_within(small, 0.1)
+
+        first.release()
+        assert await admitted_within(large, 1)
+        assert await admitted_within(small, 1)
+        large.result().release()
+        small.result().release()
+
+    asyncio.run(scenario())
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    async def scenario():
+        controller = MemoryAdmission(300 * MB, rss=fixed_rss())
+        token = CancelToken()
+        first = await controller.admit(250 * MB)
+
+        waiting = asyncio.ensure_future(controller.admit(100 * MB, token.check))
+        await asyncio.sleep(0.05)
+        token.cancel()
+        with pytest.raises(TranscriptionCancelled):
+            await asyncio.wait_for(waiting, 1)
+        assert controller.stats()["waiting"] == 0
+        first.release()
+
+    asyncio.run(scenario())
+
+
+def test_waiting_for_memory_does_not_hold_a_worker():
+    async def scenario():
+        controller = MemoryAdmission(300 * MB, rss=fixed_rss())
+        pool = InferencePool(max_workers=1, max_queue=4)
+        running = await controller.admit(250 * MB)
+
+        def gate(nbytes: int):
+            async def admit():
+                return (await controller.admit(nbytes)).release
+            return admit
+
+        # Sem memória para a grande: ela espera fora do worker único
+        large = pool.submit(lambda: "grande", admit=gate(200 * MB))
+        small = pool.submit(lambda: "pequena")
+        assert await asyncio.wait_for(small, 1) == "pequena"
+        assert not large.done()
+        assert pool.stats()["queued"] == 1
+
+        running.release()
+        assert await asyncio.wait_for(large, 1) == "grande"
+        assert controller.stats()["reserved_bytes"] == 0
+        assert pool.stats() == {"workers": 1, "max_queue": 4, "running": 0, "queued": 0}
+        pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_admitted_task_releases_its_reservation_when_it_fails():
+    async def scenario():
+        controller = MemoryAdmission(300 * MB, rss=fixed_rss())
+        pool = InferencePool(max_workers=1, max_queue=4)
+
+        async def admit():
+            return (await controller.admit(100 * MB)).release
+
+        def fail():
+            raise RuntimeError("erro")
+
+        with pytest.raises(RuntimeError):
+            await pool.submit(fail, admit=admit)
+        assert controller.stats()["reserved_bytes"] == 0
+        assert pool.stats()["queued"] == 0
+        pool.shutdown()
+
+    asyncio.run(scenario())
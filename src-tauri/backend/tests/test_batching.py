@@ -0,0 +1,196 @@
+"""Decodificação em lote: montagem dos lotes, divisão em janelas e segmentos por timestamp"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from audio_processing import SAMPLING_RATE, WINDOW_SECONDS
+from batching import DecodeBatcher, _split_by_timestamps, plan_windows
+
+MODEL = object()
+OPTIONS = {"beam_size": 5, "suppress_tokens": [-1]}
+WAIT_MS = 50
+
+
+class RecordingBatcher(DecodeBatcher):
+    """Em vez do CTranslate2, devolve as próprias features e registra o tamanho de cada lote"""
+
+    def __init__(self, *args, fail: bool = False, **kwargs):
+        self.batch_sizes = []
+        self.fail = fail
+        super().__init__(*args, **kwargs)
+
+    def _decode_batch(self, group, windows):
+        self.batch_sizes.append(len(windows))
+        if self.fail:
+            raise RuntimeError("falha no encoder")
+        return [(window.features, None) for window in windows]
+
+
+@pytest.fixture
+def batcher():
+    batchers = []
+
+    def create(max_batch_size: int, max_wait_ms: float = WAIT_MS, **kwargs):
+        batchers.append(RecordingBatcher(max_batch_size, max_wait_ms, **kwargs))
+        return batchers[-1]
+
+    yield create
+    for created in batchers:
+        created.close()
+
+
+def decode(batcher, values, options=OPTIONS):
+    results = batcher.decode(MODEL, list(values), [1, 2], options)
+    return [features for features, _ in results]
+
+
+def test_results_return_to_each_caller_in_order(batcher):
+    decoder = batcher(4)
+    assert decode(decoder, [1, 2, 3]) == [1, 2, 3]
+
+
+def test_windows_of_concurrent_requests_share_a_batch(batcher):
+    # Espera longa: o lote só sai antes dela porque encheu
+    decoder = batcher(4, max_wait_ms=10_000)
+    barrier = threading.Barrier(4)
+
+    def request(value):
+        barrier.wait()
+        return decode(decoder, [value])
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(request, range(4)))
+
+    assert results == [[0], [1], [2], [3]]
+    assert decoder.batch_sizes == [4]
+    assert time.monotonic() - started < 5
+
+
+def test_batches_never_exceed_max_batch_size(batcher):
+    decoder = batcher(3)
+    assert decode(decoder, range(7)) == list(range(7))
+    assert decoder.batch_sizes == [3, 3, 1]
+
+
+def test_partial_batch_is_flushed_after_max_wait(batcher):
+    decoder = batcher(8)
+    started = time.monotonic()
+    assert decode(decoder, [1]) == [1]
+    assert time.monotonic() - started >= WAIT_MS / 1000 * 0.9
+    assert decoder.batch_sizes == [1]
+
+
+def test_different_options_are_not_batched_together(batcher):
+    decoder = batcher(2, max_wait_ms=200)
+    other_options = {**OPTIONS, "beam_size": 1}
+    with ThreadPoolExecutor(2) as executor:
+        first = executor.submit(decode, decoder, [1])
+        second = executor.submit(decode, decoder, [2], other_options)
+        assert (first.result(), second.result()) == ([1], [2])
+    assert decoder.batch_sizes == [1, 1]
+
+
+def test_decode_errors_reach_every_window_of_the_batch(batcher):
+    decoder = batcher(2, fail=True)
+    with pytest.raises(RuntimeError, match="falha no encoder"):
+        decode(decoder, [1, 2])
+
+
+def test_close_fails_pending_windows_and_rejects_new_ones(batcher):
+    decoder = batcher(8, max_wait_ms=10_000)
+    with ThreadPoolExecutor(1) as executor:
+        pending = executor.submit(decode, decoder, [1])
+        while decoder.stats()["pending_windows"] == 0:
+            time.sleep(0.01)
+        decoder.close()
+        with pytest.raises(RuntimeError, match="encerrada"):
+            pending.result(timeout=5)
+
+    with pytest.raises(RuntimeError, match="encerrada"):
+        decode(decoder, [2])
+    assert decoder.batch_sizes == []
+
+
+def test_stats_average_batch_size(batcher):
+    decoder = batcher(2)
+    decode(decoder, range(3))
+    stats = decoder.stats()
+    assert (stats["batches"], stats["windows"], stats["average_batch_size"]) == (2, 3, 1.5)
+
+
+def seconds(value: float) -> int:
+    return int(value * SAMPLING_RATE)
+
+
+def test_short_audio_is_a_single_window():
+    audio = np.ones(seconds(12), np.float32)
+    assert plan_windows(audio) == [(0, len(audio))]
+
+
+def test_windows_are_cut_at_silence_and_cover_the_audio():
+    rng = np.random.default_rng(0)
+    audio = rng.uniform(-0.5, 0.5, seconds(75)).astype(np.float32)
+    audio[seconds(22):seconds(22.5)] = 0.0
+
+    windows = plan_windows(audio)
+
+    assert seconds(22) <= windows[0][1] <= seconds(22.5)
+    assert windows[0][0] == 0 and windows[-1][1] == len(audio)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(windows, windows[1:]))
+    assert all(end - start <= seconds(WINDOW_SECONDS) for start, end in windows)
+
+
+TIMESTAMP_BEGIN = 1000
+
+
+class Tokenizer:
+    timestamp_begin = TIMESTAMP_BEGIN
+
+
+def ts(seconds: float) -> int:
+    """Token de timestamp (resolução de 20 ms)"""
+    return TIMESTAMP_BEGIN + int(round(seconds / 0.02))
+
+
+def split(tokens, offset=30.0, duration=30.0):
+    return [
+        (round(s["start"], 2), round(s["end"], 2), s["tokens"])
+        for s in _split_by_timestamps(tokens, Tokenizer, offset, duration)
+    ]
+
+
+def test_tokens_without_timestamps_span_the_window():
+    assert split([5, 6, 7]) == [(30.0, 60.0, [5, 6, 7])]
+
+
+def test_single_segment_ends_at_its_last_timestamp():
+    assert split([ts(0), 5, 6, ts(4)]) == [(30.0, 34.0, [ts(0), 5, 6, ts(4)])]
+
+
+def test_consecutive_timestamps_split_segments():
+    tokens = [ts(0), 5, 6, ts(2), ts(2), 7, ts(3.5)]
+    assert split(tokens) == [
+        (30.0, 32.0, [ts(0), 5, 6, ts(2)]),
+        (32.0, 33.5, [ts(2), 7, ts(3.5)]),
+    ]
+
+
+def test_segment_without_trailing_timestamp_runs_to_the_window_end():
+    tokens = [ts(0), 5, ts(2), ts(2), 7, 8]
+    assert split(tokens, duration=25.0) == [
+        (30.0, 32.0, [ts(0), 5, ts(2)]),
+        (32.0, 55.0, [ts(2), 7, 8]),
+    ]
+
+
+def test_trailing_timestamp_pair_adds_no_empty_segment():
+    tokens = [ts(0), 5, ts(2), ts(2), 7, ts(3), ts(3)]
+    assert split(tokens) == [
+        (30.0, 32.0, [ts(0), 5, ts(2)]),
+        (32.0, 33.0, [ts(2), 7, ts(3)]),
+    ]
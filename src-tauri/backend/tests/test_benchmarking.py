@@ -0,0 +1,108 @@
+"""Estatísticas, áudio sintético e modelo simulado do benchmark"""
+
+import io
+import json
+import threading
+import wave
+
+import numpy as np
+import pytest
+
+import benchmark
+from benchmarking import (
+    SAMPLING_RATE, StubWhisperModel, encode_audio, p50_changes, percentile, run_concurrently,
+    summarize, synthetic_speech
+)
+
+
+def test_percentile_interpolates_between_samples():
+    values = [4.0, 1.0, 3.0, 2.0]
+    assert percentile(values, 0.0) == 1.0
+    assert percentile(values, 0.5) == 2.5
+    assert percentile(values, 0.9) == pytest.approx(3.7)
+    assert percentile(values, 1.0) == 4.0
+    assert percentile([], 0.5) is None
+
+
+def test_summarize_latency_rtf_and_throughput():
+    summary = summarize([1.0, 2.0, 3.0], errors=1, audio_seconds=10.0, wall_time=2.0)
+    assert (summary["requests"], summary["errors"]) == (4, 1)
+    assert summary["latency_seconds"]["p50"] == 2.0
+    assert summary["real_time_factor"] == pytest.approx(0.2)
+    assert summary["throughput"] == {"requests_per_second": 1.5, "audio_seconds_per_second": 15.0}
+
+
+def test_summarize_without_completed_requests():
+    summary = summarize([], errors=2, audio_seconds=10.0, wall_time=1.0)
+    assert summary["latency_seconds"]["mean"] is None
+    assert summary["real_time_factor"] is None
+
+
+def test_run_concurrently_respects_the_concurrency_and_counts_errors():
+    running = 0
+    peak = 0
+    calls = 0
+    lock = threading.Lock()
+
+    def task():
+        nonlocal running, peak, calls
+        with lock:
+            running += 1
+            calls += 1
+            peak = max(peak, running)
+            failed = calls % 4 == 0
+        threading.Event().wait(0.02)
+        with lock:
+            running -= 1
+        if failed:
+            raise RuntimeError("falhou")
+
+    latencies, errors, wall_time = run_concurrently(task, requests=8, concurrency=2)
+    assert (len(latencies), len(errors)) == (6, 2)
+    assert peak == 2
+    assert wall_time >= 4 * 0.02
+
+
+def test_synthetic_speech_is_deterministic_with_pauses():
+    audio = synthetic_speech(5.0)
+    assert audio.dtype == np.float32 and len(audio) == 5 * SAMPLING_RATE
+    assert np.array_equal(audio, synthetic_speech(5.0))
+    assert np.abs(audio).max() <= 1.0
+    # Pausas entre as "sílabas": boa parte do sinal é só o ruído de fundo
+    assert np.mean(np.abs(audio) < 0.02) > 0.1
+
+
+def test_wav_encoding_keeps_the_samples():
+    audio = synthetic_speech(1.0)
+    with wave.open(io.BytesIO(encode_audio(audio, "wav"))) as wav:
+        assert (wav.getframerate(), wav.getnchannels(), wav.getnframes()) == (SAMPLING_RATE, 1, len(audio))
+
+
+def test_stub_model_segments_cover_the_audio():
+    segments, _ = StubWhisperModel(rtf=0.0).transcribe(np.zeros(12 * SAMPLING_RATE), word_timestamps=True)
+    segments = list(segments)
+    assert [(s.start, s.end) for s in segments] == [(0.0, 5.0), (5.0, 10.0), (10.0, 12.0)]
+    assert all(len(s.words) == 4 for s in segments)
+
+
+def result(p50, **fields):
+    return {"mode": "http", "model": "base", "concurrency": 1, "latency_seconds": {"p50": p50}, **fields}
+
+
+def test_p50_changes_match_scenarios_of_the_baseline():
+    current = [result(1.2), result(0.5, concurrency=4), result(2.0, model="tiny")]
+    baseline = [result(1.0), result(1.0, concurrency=4), {"model": "tiny", "error": "falhou"}]
+    changes = p50_changes(current, baseline)
+    assert [(r["concurrency"], round(change, 1)) for r, change in changes] == [(1, 20.0), (4, -50.0)]
+
+
+def test_baseline_comparison_flags_regressions(tmp_path, capsys):
+    baseline_path = tmp_path / "anterior.json"
+    baseline_path.write_text(json.dumps({"results": [
+        {**result(1.0), "compute_type": "int8", "audio_seconds": 10, "format": "wav",
+         "profile": "balanced", "real_time_factor": 0.1, "errors": 0}
+    ]}))
+    current = {**result(1.5), "compute_type": "int8", "audio_seconds": 10, "format": "wav",
+               "profile": "balanced", "real_time_factor": 0.15, "errors": 0}
+    benchmark.compare_with_baseline([current], baseline_path)
+    assert "⚠️" in capsys.readouterr().out
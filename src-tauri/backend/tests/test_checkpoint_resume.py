@@ -0,0 +1,115 @@
+"""Transcrições canceladas ou com erro não são retomadas na próxima inicialização"""
+
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+import pytest
+
+import main
+from audio_processing import SAMPLING_RATE
+from cancellation import CancelToken, TranscriptionCancelled
+from checkpoints import CheckpointStore
+from model_registry import ModelRegistry
+
+AUDIO_SECONDS = 10
+
+
+class Segment(NamedTuple):
+    start: float
+    end: float
+    text: str
+    words: Optional[List] = None
+
+
+class FakeModel:
+    """Um segmento por segundo; `fail_after` segmentos depois lança um erro de decodificação"""
+
+    def __init__(self, fail_after: Optional[int] = None):
+        self.fail_after = fail_after
+
+    def transcribe(self, audio, **kwargs):
+        def segments():
+            for second in range(len(audio) // SAMPLING_RATE):
+                if second == self.fail_after:
+                    raise RuntimeError("falha na decodificação")
+                yield Segment(float(second), second + 1.0, f" s{second}")
+        return segments(), None
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = CheckpointStore(tmp_path, max_age_seconds=3600)
+    monkeypatch.setattr(main, "checkpoint_store", store)
+    monkeypatch.setattr(main, "CHECKPOINT_MIN_SECONDS", 1)
+    monkeypatch.setattr(main, "decode_batcher", None)
+    monkeypatch.setattr(
+        main, "decode_source",
+        lambda source, audio_hash=None: np.zeros(AUDIO_SECONDS * SAMPLING_RATE, np.float32)
+    )
+    monkeypatch.setattr(main, "source_duration", lambda source, audio_hash=None: AUDIO_SECONDS)
+    return store
+
+
+def use_model(monkeypatch, model: FakeModel):
+    monkeypatch.setattr(main, "model_registry", ModelRegistry(lambda spec: model, 0))
+
+
+def transcribe(**kwargs) -> dict:
+    params = main.TranscriptionParameters(language="pt", use_cache=False)
+    return main.run_transcription(
+        "/audio/inexistente.wav", "base", params, cache_key="chave", **kwargs
+    )
+
+
+def test_cancelled_transcription_is_not_resumed(store, monkeypatch):
+    use_model(monkeypatch, FakeModel())
+    token = CancelToken()
+
+    with pytest.raises(TranscriptionCancelled):
+        transcribe(on_segment=lambda segment: token.cancel(), cancel_token=token)
+
+    assert store.interrupted() == []
+
+
+def test_failed_transcription_is_not_resumed(store, monkeypatch):
+    use_model(monkeypatch, FakeModel(fail_after=3))
+
+    with pytest.raises(RuntimeError):
+        transcribe()
+
+    assert store.interrupted() == []
+
+
+def test_transcription_interrupted_by_shutdown_is_resumed(store, monkeypatch):
+    use_model(monkeypatch, FakeModel(fail_after=3))
+    monkeypatch.setattr(main, "shutting_down", True)
+
+    with pytest.raises(RuntimeError):
+        transcribe()
+
+    assert [(header["key"], header["resume_at"]) for header in store.interrupted()] == [
+        ("chave", 3.0)
+    ]
+
+
+def test_completed_transcription_discards_the_checkpoint(store, monkeypatch):
+    use_model(monkeypatch, FakeModel())
+
+    result = transcribe()
+
+    assert len(result["segments"]) == AUDIO_SECONDS
+    assert store.interrupted() == []
+
+
+def test_memory_estimate_of_a_job_resumed_from_the_audio_cache(monkeypatch):
+    # Sem o arquivo original o job tem caminho vazio: nada de stat no diretório atual
+    monkeypatch.setattr(main, "source_duration", lambda source, audio_hash=None: None)
+    params = main.TranscriptionParameters()
+    spec = main.model_spec("base")
+
+    assert main.estimate_source_memory("", "base", params, "hash", duration=60.0) == (
+        main.estimate_request_memory(spec, 60.0, None)
+    )
+    assert main.estimate_source_memory("", "base", params, "hash") == (
+        main.estimate_request_memory(spec, None, None)
+    )
@@ -0,0 +1,97 @@
+"""Checkpoints de transcrições longas: recuperação após uma queda no meio da gravação"""
+
+import json
+import os
+import time
+
+from checkpoints import CHECKPOINT_VERSION, CheckpointStore
+
+HEADER = {"model": "base", "audio_hash": "abc", "path": None, "audio_duration": 120.0}
+
+
+def segment(index: int) -> dict:
+    return {"text": f" s{index}", "start": float(index), "end": index + 1.0, "words": []}
+
+
+def write_checkpoint(store: CheckpointStore, key: str, segments, tail: bytes = b"") -> bytes:
+    lines = [{"version": CHECKPOINT_VERSION, **HEADER}, *segments]
+    data = b"".join(json.dumps(line).encode() + b"\n" for line in lines)
+    store._path(key).write_bytes(data + tail)
+    return data
+
+
+def test_new_checkpoint_writes_header(tmp_path):
+    store = CheckpointStore(tmp_path, max_age_seconds=3600)
+
+    checkpoint = store.open("k", HEADER)
+    checkpoint.append(segment(0))
+    checkpoint.close()
+
+    reopened = store.open("k", {"model": "outro"})
+    # O cabeçalho original é mantido
+    assert reopened.header["model"] == "base"
+    assert reopened.segments == [segment(0)]
+    assert reopened.resume_at == 1.0
+    reopened.close()
+
+
+def test_truncated_last_line_is_dropped_and_removed_from_the_file(tmp_path):
+    store = CheckpointStore(tmp_path, max_age_seconds=3600)
+    valid = write_checkpoint(store, "k", [segment(0), segment(1)], tail=b'{"text": " s2", "sta')
+
+    checkpoint = store.open("k", HEADER)
+
+    assert checkpoint.segments == [segment(0), segment(1)]
+    assert checkpoint.resume_at == 2.0
+    assert store._path("k").read_bytes() == valid
+
+    # Os novos segmentos continuam em linhas válidas
+    checkpoint.append(segment(2))
+    checkpoint.close()
+    reopened = store.open("k", HEADER)
+    assert reopened.segments == [segment(0), segment(1), segment(2)]
+    reopened.close()
+
+
+def test_truncated_header_starts_a_new_checkpoint(tmp_path):
+    store = CheckpointStore(tmp_path, max_age_seconds=3600)
+    store._path("k").write_bytes(b'{"version": 1, "mod')
+
+    checkpoint = store.open("k", HEADER)
+
+    assert checkpoint.segments == []
+    assert checkpoint.resume_at == 0.0
+    checkpoint.close()
+    assert json.loads(store._path("k").read_text().splitlines()[0])["model"] == "base"
+
+
+def test_other_version_is_not_resumed(tmp_path):
+    store = CheckpointStore(tmp_path, max_age_seconds=3600)
+    store._path("k").write_text(json.dumps({"version": CHECKPOINT_VERSION + 1}) + "\n")
+
+    assert store.interrupted() == []
+    assert not store._path("k").exists()
+
+
+def test_open_checkpoint_cannot_be_opened_twice(tmp_path):
+    store = CheckpointStore(tmp_path, max_age_seconds=3600)
+
+    checkpoint = store.open("k", HEADER)
+
+    assert store.open("k", HEADER) is None
+    assert store.interrupted() == []
+    checkpoint.close()
+    assert [header["key"] for header in store.interrupted()] == ["k"]
+
+
+def test_interrupted_reports_resume_point_and_drops_expired(tmp_path):
+    store = CheckpointStore(tmp_path, max_age_seconds=3600)
+    write_checkpoint(store, "recente", [segment(0), segment(1)])
+    write_checkpoint(store, "antigo", [segment(0)])
+    old = time.time() - 7200
+    os.utime(store._path("antigo"), (old, old))
+
+    interrupted = store.interrupted()
+
+    assert [(header["key"], header["resume_at"]) for header in interrupted] == [("recente", 2.0)]
+    assert not store._path("antigo").exists()
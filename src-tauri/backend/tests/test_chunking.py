@@ -0,0 +1,108 @@
+"""Junção dos blocos de áudios longos: cada palavra pertence a um único bloco"""
+
+from typing import List, NamedTuple, Optional
+
+import numpy as np
+
+from audio_processing import SAMPLING_RATE
+from chunking import owned_segments, plan_chunks
+
+
+class Word(NamedTuple):
+    start: float
+    end: float
+    word: str
+    probability: float = 0.9
+
+
+class Segment(NamedTuple):
+    start: float
+    end: float
+    text: str
+    words: Optional[List[Word]]
+
+
+def samples(seconds: float) -> int:
+    return int(seconds * SAMPLING_RATE)
+
+
+def test_words_are_shifted_to_the_audio_timeline():
+    segments = [Segment(0.0, 1.0, " a b", [Word(0.0, 0.4, " a"), Word(0.5, 1.0, " b")])]
+
+    owned = list(owned_segments(segments, samples(10), samples(10), samples(20), is_last=False))
+
+    assert [(w.start, w.end) for w in owned[0].words] == [(10.0, 10.4), (10.5, 11.0)]
+    assert (owned[0].start, owned[0].end) == (10.0, 11.0)
+    assert owned[0].text == " a b"
+
+
+def test_overlap_words_belong_to_the_chunk_owning_their_midpoint():
+    # Bloco decodificado em [8, 22), responsável por [10, 20)
+    segment = Segment(0.0, 14.0, " x y z w", [
+        Word(1.0, 2.5, " x"),    # 9.0-10.5: ponto médio 9.75, do bloco anterior
+        Word(2.0, 3.0, " y"),    # 10.0-11.0: ponto médio 10.5
+        Word(11.0, 12.0, " z"),  # 19.0-20.0: ponto médio 19.5
+        Word(11.5, 12.5, " w"),  # 19.5-20.5: ponto médio 20.0, do próximo bloco
+    ])
+
+    owned = list(owned_segments([segment], samples(8), samples(10), samples(20), is_last=False))
+
+    assert len(owned) == 1
+    assert [w.word for w in owned[0].words] == [" y", " z"]
+    # Texto refeito a partir das palavras mantidas
+    assert owned[0].text == " y z"
+    assert (owned[0].start, owned[0].end) == (10.0, 20.0)
+
+
+def test_midpoint_on_the_boundary_is_owned_by_exactly_one_chunk():
+    # A mesma palavra (9.5-10.5, ponto médio no corte em 10s) decodificada pelos dois blocos
+    left = list(owned_segments(
+        [Segment(9.5, 10.5, " corte", [Word(9.5, 10.5, " corte")])],
+        0, 0, samples(10), is_last=False
+    ))
+    right = list(owned_segments(
+        [Segment(1.5, 2.5, " corte", [Word(1.5, 2.5, " corte")])],
+        samples(8), samples(10), samples(20), is_last=False
+    ))
+
+    assert left == []
+    assert [(w.word, w.start, w.end) for w in right[0].words] == [(" corte", 9.5, 10.5)]
+
+
+def test_last_chunk_keeps_words_ending_at_the_audio_end():
+    segment = Segment(0.0, 2.0, " fim", [Word(1.0, 3.0, " fim")])  # ponto médio em 12.0s
+
+    kept = list(owned_segments([segment], samples(10), samples(10), samples(12), is_last=True))
+    dropped = list(owned_segments([segment], samples(10), samples(10), samples(12), is_last=False))
+
+    assert len(kept) == 1
+    assert dropped == []
+
+
+def test_segments_without_words_use_the_segment_midpoint():
+    segments = [Segment(0.0, 3.0, " antes", None), Segment(3.0, 6.0, " depois", None)]
+
+    owned = list(owned_segments(segments, samples(8), samples(10), samples(20), is_last=False))
+
+    # " antes" (8-11, ponto médio 9.5) fica com o bloco anterior
+    assert [(s.text, s.start, s.end) for s in owned] == [(" depois", 11.0, 14.0)]
+
+
+def test_segments_with_no_owned_words_are_dropped():
+    segment = Segment(0.0, 1.0, " eco", [Word(0.0, 1.0, " eco")])
+
+    assert list(owned_segments([segment], samples(8), samples(10), samples(20), is_last=False)) == []
+
+
+def test_planned_chunks_own_contiguous_ranges():
+    audio = np.random.default_rng(0).normal(size=samples(100)).astype(np.float32)
+
+    chunks = plan_chunks(audio, chunk_seconds=30, overlap_seconds=2)
+
+    assert chunks[0][2] == 0
+    assert chunks[-1][3] == len(audio)
+    for (_, _, _, own_end), (_, _, next_own_start, _) in zip(chunks, chunks[1:]):
+        assert own_end == next_own_start
+    for start, end, own_start, own_end in chunks:
+        assert start <= own_start < own_end <= end
+        assert own_start - start <= samples(2) and end - own_end <= samples(2)
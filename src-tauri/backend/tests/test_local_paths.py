@@ -0,0 +1,63 @@
+"""Caminhos locais aceitos por /transcribe-path: só dentro dos diretórios permitidos"""
+
+import pytest
+from fastapi import HTTPException
+
+import config
+import main
+
+
+@pytest.fixture
+def allowed(tmp_path, monkeypatch):
+    allowed = tmp_path / "Music"
+    allowed.mkdir()
+    (tmp_path / "secret").mkdir()
+    monkeypatch.setattr(main, "ALLOWED_LOCAL_DIRS", [allowed])
+    return allowed
+
+
+def status_of(raw_path: str) -> int:
+    with pytest.raises(HTTPException) as error:
+        main.resolve_local_path(raw_path)
+    return error.value.status_code
+
+
+def test_path_inside_allowed_dir(allowed):
+    (allowed / "a.wav").write_bytes(b"")
+    assert main.resolve_local_path(str(allowed / "a.wav")) == (allowed / "a.wav").resolve()
+
+
+def test_relative_path_is_rejected(allowed):
+    assert status_of("Music/a.wav") == 400
+
+
+def test_parent_segments_cannot_escape(allowed):
+    assert status_of(str(allowed / ".." / "secret" / "a.wav")) == 403
+
+
+def test_symlinks_are_resolved_before_the_prefix_check(allowed, tmp_path):
+    (tmp_path / "secret" / "id_rsa").write_text("chave")
+    (allowed / "link.wav").symlink_to(tmp_path / "secret" / "id_rsa")
+    (allowed / "pasta").symlink_to(tmp_path / "secret", target_is_directory=True)
+    assert status_of(str(allowed / "link.wav")) == 403
+    assert status_of(str(allowed / "pasta" / "id_rsa")) == 403
+
+
+def test_empty_allow_list_disables_local_files(monkeypatch):
+    monkeypatch.setattr(main, "ALLOWED_LOCAL_DIRS", [])
+    assert status_of("/tmp/a.wav") == 403
+
+
+def test_default_is_media_folders_not_home(tmp_path, monkeypatch):
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("XDG_CONFIG_HOME", str(tmp_path / ".config"))
+    for key in ("XDG_MUSIC_DIR", "XDG_DOWNLOAD_DIR", "XDG_DESKTOP_DIR"):
+        monkeypatch.delenv(key, raising=False)
+    (tmp_path / "Downloads").mkdir()
+    (tmp_path / "Músicas").mkdir()
+    (tmp_path / ".config").mkdir()
+    # Pasta localizada do XDG; a área de trabalho apontando para a pasta pessoal é ignorada
+    (tmp_path / ".config" / "user-dirs.dirs").write_text(
+        'XDG_MUSIC_DIR="$HOME/Músicas"\nXDG_DESKTOP_DIR="$HOME/"\n', encoding="utf-8"
+    )
+    assert config._user_media_dirs() == [tmp_path / "Músicas", tmp_path / "Downloads"]
@@ -0,0 +1,48 @@
+"""Retranscrição de trechos: intervalos e junção com a transcrição salva"""
+
+from splicing import merge_ranges, segments_text, snap_to_segments, splice_transcript
+
+
+def test_merge_ranges_clamps_sorts_and_merges():
+    ranges = [(8.0, 12.0), (-1.0, 2.0), (1.5, 3.0), (5.0, 5.0), (30.0, 40.0)]
+
+    assert merge_ranges(ranges, duration=20.0) == [(0.0, 3.0), (8.0, 12.0)]
+
+
+def test_snap_extends_to_touched_segments_and_merges_neighbours():
+    segments = [
+        {"start": 0.0, "end": 4.0},
+        {"start": 4.0, "end": 9.0},
+        {"start": 9.0, "end": 12.0},
+    ]
+
+    assert snap_to_segments([(1.0, 2.0)], segments) == [(0.0, 4.0)]
+    assert snap_to_segments([(3.0, 3.5), (8.0, 8.5)], segments) == [(0.0, 9.0)]
+
+
+def test_splice_replaces_items_by_midpoint():
+    segments = [
+        {"text": " a", "start": 0.0, "end": 2.0},
+        {"text": " b", "start": 2.0, "end": 4.0},
+        {"text": " c", "start": 4.0, "end": 6.0},
+    ]
+    words = [
+        {"word": " a", "start": 0.0, "end": 2.0},
+        {"word": " b", "start": 2.0, "end": 4.0},
+        {"word": " c", "start": 4.0, "end": 6.0},
+    ]
+    decoded = [{"text": " B", "start": 2.1, "end": 3.9, "words": [
+        {"word": " B", "start": 2.1, "end": 3.9}
+    ]}]
+
+    new_segments, new_words = splice_transcript(segments, words, [((2.0, 4.0), decoded)])
+
+    assert [segment["text"] for segment in new_segments] == [" a", " B", " c"]
+    assert [word["word"] for word in new_words] == [" a", " B", " c"]
+
+
+def test_segments_text_matches_the_full_transcription():
+    # Como na transcrição completa: cada segmento seguido de um espaço
+    segments = [{"text": " Olá."}, {"text": " Tudo bem?"}]
+
+    assert segments_text(segments) == "Olá.  Tudo bem?"
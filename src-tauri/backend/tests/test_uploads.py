@@ -0,0 +1,58 @@
+"""Uploads decodificados da memória só nos endpoints de um único arquivo"""
+
+import asyncio
+import os
+from tempfile import SpooledTemporaryFile
+
+import pytest
+from fastapi import UploadFile
+
+import main
+
+MB = 1024 * 1024
+
+
+def spooled_upload(size: int) -> UploadFile:
+    # Como o parser multipart do Starlette: em disco acima de 1 MB
+    file = SpooledTemporaryFile(max_size=MB)
+    file.write(b"\0" * size)
+    file.seek(0)
+    return UploadFile(file, size=size, filename="audio.wav")
+
+
+@pytest.fixture(autouse=True)
+def spill_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "UPLOAD_SPILL_MB", 4)
+    monkeypatch.setattr(main, "TEMP_DIR", tmp_path)
+
+
+def receive(size: int, **kwargs):
+    return asyncio.run(main.receive_upload(spooled_upload(size), ".wav", **kwargs))
+
+
+@pytest.mark.parametrize("size", [MB // 2, 3 * MB])
+def test_single_file_upload_within_limit_stays_in_memory(size, tmp_path):
+    # Mesmo o que o Starlette já guardou em disco é lido de volta, sem cópia em TEMP_DIR
+    upload = receive(size, in_memory=True)
+    assert upload.in_memory and upload.size == size
+    assert os.listdir(tmp_path) == []
+
+
+def test_single_file_upload_over_limit_goes_to_disk(tmp_path):
+    upload = receive(5 * MB, in_memory=True)
+    assert not upload.in_memory
+    assert os.path.getsize(upload.path) == 5 * MB
+    upload.close()
+
+
+def test_queued_uploads_go_to_disk():
+    upload = receive(MB // 2)
+    assert not upload.in_memory
+    upload.close()
+
+
+def test_memory_pressure_sends_uploads_to_disk(monkeypatch):
+    monkeypatch.setattr(main.memory_admission, "has_room", lambda nbytes: False)
+    upload = receive(MB // 2, in_memory=True)
+    assert not upload.in_memory
+    upload.close()
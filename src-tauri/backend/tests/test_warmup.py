@@ -0,0 +1,126 @@
+"""Pré-carregamento dos modelos na inicialização: no pool de inferência e dentro do orçamento de memória"""
+
+import asyncio
+import threading
+
+import pytest
+
+import admission
+import main
+import warmup
+from admission import MemoryAdmission
+from inference_pool import InferencePool
+from model_registry import ModelRegistry
+
+MB = 1024 * 1024
+BUDGET = 300 * MB
+
+
+class BlockingModel:
+    """Modelo cujo aquecimento só termina quando `release` é sinalizado"""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def transcribe(self, audio, **kwargs):
+        self.started.set()
+        self.release.wait(5)
+        return iter([]), None
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = BlockingModel()
+    monkeypatch.setattr(admission, "WAIT_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(warmup, "load_inference_libraries", lambda: {"import_time": 0.0, "cuda_devices": 0})
+    monkeypatch.setattr(main, "model_registry", ModelRegistry(lambda spec: model, 0))
+    monkeypatch.setattr(main, "memory_admission", MemoryAdmission(BUDGET, rss=lambda: 0))
+    monkeypatch.setattr(main, "estimate_request_memory", lambda *args, **kwargs: 200 * MB)
+    yield model
+    model.release.set()
+
+
+def use_pool(monkeypatch, max_queue: int = 4) -> InferencePool:
+    pool = InferencePool(max_workers=1, max_queue=max_queue)
+    monkeypatch.setattr(main, "inference_pool", pool)
+    return pool
+
+
+def start_warmer() -> warmup.ModelWarmer:
+    warmer = warmup.ModelWarmer(main.model_registry, main.warm_up_model, main.run_warmup_job)
+    warmer.start(["tiny"])
+    return warmer
+
+
+def state(warmer: warmup.ModelWarmer) -> str:
+    return warmer.stats()["models"]["tiny"]["state"]
+
+
+async def until(condition, seconds: float = 2.0):
+    for _ in range(int(seconds / 0.01)):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condição não atingida")
+
+
+def test_preload_takes_a_pool_worker_and_reserves_memory(model, monkeypatch):
+    pool = use_pool(monkeypatch)
+
+    async def scenario():
+        warmer = start_warmer()
+        await until(model.started.is_set)
+        assert pool.stats()["running"] == 1
+        assert main.memory_admission.stats()["reserved_bytes"] == 200 * MB
+
+        # Com o único worker aquecendo o modelo, a transcrição espera na fila
+        transcription = pool.submit(lambda: "transcrição")
+        await asyncio.sleep(0.1)
+        assert not transcription.done()
+
+        model.release.set()
+        assert await asyncio.wait_for(transcription, 2) == "transcrição"
+        await until(lambda: not warmer.preloading)
+        assert state(warmer) == "ready"
+        assert main.memory_admission.stats()["reserved_bytes"] == 0
+        pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_preload_waits_for_memory_without_holding_a_worker(model, monkeypatch):
+    pool = use_pool(monkeypatch)
+
+    async def scenario():
+        running = await main.memory_admission.admit(250 * MB)
+        warmer = start_warmer()
+        await until(lambda: main.memory_admission.stats()["waiting"] == 1)
+        assert state(warmer) == "queued"
+        assert await asyncio.wait_for(pool.submit(lambda: "transcrição"), 2) == "transcrição"
+        assert not model.started.is_set()
+
+        running.release()
+        model.release.set()
+        await until(lambda: not warmer.preloading)
+        assert state(warmer) == "ready"
+        pool.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_preload_is_skipped_when_the_queue_is_full(model, monkeypatch):
+    pool = use_pool(monkeypatch, max_queue=0)
+
+    async def scenario():
+        busy = threading.Event()
+        transcription = pool.submit(busy.wait, 5)
+        warmer = start_warmer()
+        await until(lambda: not warmer.preloading)
+        assert state(warmer) == "failed"
+        assert not model.started.is_set()
+        busy.set()
+        await transcription
+        pool.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,65 @@
+"""Negociação (cabeçalho Accept) e codificação do formato de palavras em colunas"""
+
+import base64
+import math
+
+import numpy as np
+import pytest
+
+from word_columns import COLUMNAR_ENCODING, COLUMNAR_MEDIA_TYPE, to_columns, wants_columnar
+
+
+@pytest.mark.parametrize("accept", [
+    COLUMNAR_MEDIA_TYPE,
+    f"application/json, {COLUMNAR_MEDIA_TYPE}",
+    f"text/event-stream, {COLUMNAR_MEDIA_TYPE};q=0.5",
+    f"{COLUMNAR_MEDIA_TYPE.upper()}",
+    f" {COLUMNAR_MEDIA_TYPE} ; charset=utf-8",
+])
+def test_accepts_columnar(accept):
+    assert wants_columnar(accept)
+
+
+@pytest.mark.parametrize("accept", [
+    None,
+    "",
+    "*/*",
+    "application/json",
+    "text/event-stream",
+    f"{COLUMNAR_MEDIA_TYPE};q=0",
+    f"{COLUMNAR_MEDIA_TYPE}; q=0.0",
+    f"{COLUMNAR_MEDIA_TYPE};q=abc",
+    f"{COLUMNAR_MEDIA_TYPE}-v2",
+])
+def test_does_not_accept_columnar(accept):
+    assert not wants_columnar(accept)
+
+
+def unpack(value: str) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(value), dtype="<f4")
+
+
+def test_columns_round_trip():
+    words = [
+        {"word": " olá", "start": 0.0, "end": 0.5, "probability": 0.9},
+        {"word": " mundo", "start": 0.5, "end": 1.25, "probability": None},
+    ]
+
+    columns = to_columns(words)
+
+    assert columns["count"] == 2
+    assert columns["encoding"] == COLUMNAR_ENCODING
+    assert columns["word"] == [" olá", " mundo"]
+    assert unpack(columns["start"]).tolist() == [0.0, 0.5]
+    assert unpack(columns["end"]).tolist() == [0.5, 1.25]
+    probabilities = unpack(columns["probability"])
+    assert probabilities[0] == pytest.approx(0.9)
+    assert math.isnan(probabilities[1])
+
+
+def test_no_words():
+    columns = to_columns(None)
+
+    assert columns["count"] == 0
+    assert columns["word"] == []
+    assert columns["start"] == columns["end"] == columns["probability"] == ""
@@ -0,0 +1,152 @@
+"""
+EchoTranscribe Backend - Pré-carregamento e aquecimento de modelos
+Importa as bibliotecas de inferência e carrega os modelos configurados em segundo plano,
+decodificando um clipe sintético em cada um
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+import numpy as np
+
+from audio_processing import SAMPLING_RATE
+from model_registry import ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+# Duração do clipe sintético usado no aquecimento
+WARMUP_SECONDS = 2.0
+
+
+def synthetic_clip(seconds: float = WARMUP_SECONDS) -> np.ndarray:
+    """Ruído de baixa amplitude: exercita o encoder e o decoder sem depender de um arquivo"""
+    rng = np.random.default_rng(0)
+    return (rng.standard_normal(int(seconds * SAMPLING_RATE)) * 0.01).astype(np.float32)
+
+
+def load_inference_libraries() -> dict:
+    """
+    Importa o faster-whisper (e com ele CTranslate2, PyAV e ONNX Runtime) e
+    conta as GPUs CUDA visíveis ao CTranslate2, sem importar o PyTorch.
+    """
+    start_time = time.monotonic()
+    import faster_whisper  # noqa: F401
+    import ctranslate2
+    info = {"import_time": time.monotonic() - start_time}
+
+    try:
+        info["cuda_devices"] = ctranslate2.get_cuda_device_count()
+    except Exception as e:
+        logger.warning(f"Não foi possível verificar a disponibilidade de CUDA: {e}")
+        info["cuda_devices"] = None
+    return info
+
+
+class ModelWarmer:
+    """
+    Estado de aquecimento dos modelos.
+
+    `start` importa as bibliotecas de inferência fora do event loop (o
+    servidor responde antes disso) e em seguida entrega o carregamento e o
+    aquecimento de cada modelo a `run_job(key, job)`, que executa `job` como
+    qualquer transcrição (no pool de inferência e dentro do orçamento de
+    memória) e aguarda o fim. Um modelo também fica aquecido ao concluir
+    uma transcrição (`mark_warm`). Um modelo despejado do registro volta a
+    ser considerado frio.
+    """
+
+    def __init__(
+        self,
+        registry: ModelRegistry,
+        warm_up: Callable[[Any], None],
+        run_job: Callable[[Hashable, Callable[[], None]], Awaitable[None]]
+    ):
+        self._registry = registry
+        self._warm_up = warm_up
+        self._run_job = run_job
+        self._lock = threading.Lock()
+        self._states: Dict[Hashable, dict] = {}
+        self._libraries = {"state": "pending"}
+        self._task: Optional[asyncio.Future] = None
+
+    def _set(self, key: Hashable, **fields):
+        with self._lock:
+            self._states.setdefault(key, {}).update(fields)
+
+    def mark_warm(self, key: Hashable):
+        with self._lock:
+            state = self._states.setdefault(key, {})
+            if state.get("state") != "ready":
+                state.update(state="ready", ready_at=time.time())
+
+    def start(self, keys: List[Hashable]):
+        """Inicia o carregamento em segundo plano (não bloqueia; chamado no event loop)"""
+        for key in keys:
+            self._set(key, state="pending")
+        self._task = asyncio.ensure_future(self._preload(keys))
+
+    def stop(self):
+        """Interrompe o pré-carregamento dos modelos que ainda não começaram"""
+        if self._task is not None:
+            self._task.cancel()
+
+    def _load_and_warm(self, key: Hashable):
+        self._set(key, state="loading")
+        with self._registry.acquire(key) as model:
+            self._set(key, state="warming")
+            start_time = time.monotonic()
+            self._warm_up(model)
+            self._set(key, warmup_time=time.monotonic() - start_time)
+        self.mark_warm(key)
+
+    async def _preload(self, keys: List[Hashable]):
+        self._libraries["state"] = "loading"
+        try:
+            info = await asyncio.get_running_loop().run_in_executor(None, load_inference_libraries)
+            self._libraries.update(info, state="ready")
+        except Exception as e:
+            logger.error(f"Falha ao importar as bibliotecas de inferência: {e}")
+            self._libraries.update(state="failed", error=str(e))
+            return
+        logger.info(
+            f"Bibliotecas de inferência importadas em {self._libraries['import_time'] * 1000:.0f} ms"
+        )
+        if self._libraries["cuda_devices"]:
+            logger.info(f"{self._libraries['cuda_devices']} GPU(s) CUDA disponível(is)")
+
+        for key in keys:
+            try:
+                self._set(key, state="queued")
+                await self._run_job(key, functools.partial(self._load_and_warm, key))
+                logger.info(f"Modelo {key} pré-carregado e aquecido")
+            except Exception as e:
+                logger.warning(f"Falha ao pré-carregar o modelo {key}: {e}")
+                self._set(key, state="failed", error=str(e))
+
+    @property
+    def preloading(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def warm_keys(self) -> List[Hashable]:
+        """Modelos aquecidos que continuam carregados"""
+        with self._lock:
+            keys = [key for key, state in self._states.items() if state.get("state") == "ready"]
+        return [key for key in keys if self._registry.is_loaded(key)]
+
+    def stats(self) -> dict:
+        with self._lock:
+            states = {key: dict(state) for key, state in self._states.items()}
+        models = {}
+        for key, state in states.items():
+            if state.get("state") == "ready" and not self._registry.is_loaded(key):
+                state["state"] = "cold"
+            models[str(key)] = state
+        return {
+            "preloading": self.preloading,
+            "libraries": dict(self._libraries),
+            "models": models,
+        }
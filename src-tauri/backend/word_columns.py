@@ -0,0 +1,66 @@
+"""
+EchoTranscribe Backend - Timestamps por palavra em colunas
+Representação compacta das palavras: arrays paralelos, com os números em float32 empacotado
+"""
+
+import base64
+from typing import List, Optional
+
+import numpy as np
+
+# Tipo de mídia (cabeçalho Accept) que pede as palavras em colunas
+COLUMNAR_MEDIA_TYPE = "application/vnd.echo-transcribe.columnar+json"
+
+# Números em float32 little-endian, codificados em base64
+COLUMNAR_ENCODING = "float32-le-base64"
+
+
+def wants_columnar(accept: Optional[str]) -> bool:
+    """Se o cabeçalho Accept aceita o formato em colunas (q=0 recusa)"""
+    if not accept:
+        return False
+    for media_range in accept.split(","):
+        media_type, *parameters = [part.strip() for part in media_range.split(";")]
+        if media_type.lower() != COLUMNAR_MEDIA_TYPE:
+            continue
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    return float(value) > 0
+                except ValueError:
+                    return False
+        return True
+    return False
+
+
+def _pack(values: np.ndarray) -> str:
+    return base64.b64encode(values.astype("<f4").tobytes()).decode("ascii")
+
+
+def to_columns(word_timestamps: Optional[List[dict]]) -> dict:
+    """
+    Converte a lista de palavras ({word, start, end, probability}) em colunas:
+    `word` continua uma lista de strings e `start`, `end` e `probability`
+    viram float32 empacotado (probabilidade ausente vira NaN).
+    """
+    word_timestamps = word_timestamps or []
+    count = len(word_timestamps)
+    starts = np.fromiter((w["start"] for w in word_timestamps), dtype=np.float64, count=count)
+    ends = np.fromiter((w["end"] for w in word_timestamps), dtype=np.float64, count=count)
+    probabilities = np.fromiter(
+        (
+            np.nan if w.get("probability") is None else w["probability"]
+            for w in word_timestamps
+        ),
+        dtype=np.float64,
+        count=count
+    )
+    return {
+        "count": count,
+        "encoding": COLUMNAR_ENCODING,
+        "word": [w["word"] for w in word_timestamps],
+        "start": _pack(starts),
+        "end": _pack(ends),
+        "probability": _pack(probabilities),
+    }
@@ -1,20 +1,29 @@
-import React, { useState, useCallback } from 'react';
+import React, { useState, useCallback, useEffect, useMemo, useRef } from 'react';
 import { Mic, Download, FileText, Settings as SettingsIcon, Copy, Check, FolderOpen } from 'lucide-react';
-import { invoke } from '@tauri-apps/api/core';
-import { FileDropZone } from './components/FileDropZone';
+import { AudioInput, FileDropZone, isLocalAudioFile } from './components/FileDropZone';
 import { ModelSelector } from './components/ModelSelector';
 import { ProgressBar } from './components/ProgressBar';
 import { Button } from './components/ui/button';
 import { DetailedAnalysis } from './components/DetailedAnalysis';
 import { Settings } from './components/Settings';
 import { SettingsProvider, useSettings } from './contexts/SettingsContext';
+import { AppSettings, DecodingProfile, defaultSettings } from './lib/settings';
 import { cn } from './lib/utils';
+import {
+  COLUMNAR_MEDIA_TYPE,
+  WordColumns,
+  decodeWordColumns,
+  wordColumnsToList,
+  wordColumnsToSrt,
+  wordCount,
+} from './lib/wordColumns';
 
 interface ModelInfo {
   name: string;
   size: string;
   description: string;
   available: boolean;
+  warm?: boolean;
 }
 
 interface BatchTranscriptionResult {
@@ -23,13 +32,12 @@ interface BatchTranscriptionResult {
   confidence?: number;
   processing_time?: number;
   detected_language?: string;
-  word_timestamps?: Array<{
-    word: string;
-    start: number;
-    end: number;
-    probability?: number;
-  }>;
+  language_probability?: number;
+  // Palavras em colunas (formato compacto enviado pelo backend)
+  words?: WordColumns;
   status: 'pending' | 'processing' | 'completed' | 'error';
+  // Rascunho pronto, sendo refinado pelo modelo selecionado (modo em duas passagens)
+  refining?: boolean;
   error?: string;
 }
 
@@ -114,20 +122,255 @@ const waitForBackend = async (maxRetries: number = 20, delay: number = 1000): Pr
   return false;
 };
 
+// Modelos já carregados e aquecidos pelo backend (campo readiness de /health)
+interface BackendReadiness {
+  preloading: boolean;
+  warmModels: string[];
+}
+
+const fetchReadiness = async (): Promise<BackendReadiness | null> => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/health`, { method: 'GET' });
+    if (!response.ok) return null;
+    const data = await response.json();
+    return {
+      preloading: Boolean(data.readiness?.preloading),
+      warmModels: data.readiness?.warm_models ?? [],
+    };
+  } catch (error) {
+    return null;
+  }
+};
+
+// Acesso do backend a arquivos locais (campo local_files de /health)
+interface LocalFilesAccess {
+  enabled: boolean;
+  allowedDirs: string[];
+}
+
+let localFilesAccess: Promise<LocalFilesAccess> | null = null;
+
+const fetchLocalFilesAccess = (): Promise<LocalFilesAccess> => {
+  if (!localFilesAccess) {
+    localFilesAccess = fetch(`${API_BASE_URL}/health`, { method: 'GET' })
+      .then((response) => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.json();
+      })
+      .then((data) => ({
+        enabled: Boolean(data.local_files?.enabled),
+        allowedDirs: data.local_files?.allowed_dirs ?? [],
+      }))
+      .catch(() => {
+        // Consultar de novo no próximo arquivo solto; desta vez, recusar o caminho
+        localFilesAccess = null;
+        return { enabled: false, allowedDirs: [] };
+      });
+  }
+  return localFilesAccess;
+};
+
+// Barras unificadas e, em caminhos do Windows, sem diferença entre maiúsculas e minúsculas
+const normalizePath = (path: string) => {
+  const normalized = path.replace(/\\/g, '/').replace(/\/+$/, '');
+  return /^[a-zA-Z]:/.test(normalized) ? normalized.toLowerCase() : normalized;
+};
+
+const isPathAllowed = (path: string, access: LocalFilesAccess) => {
+  if (!access.enabled) return false;
+  const target = normalizePath(path);
+  return access.allowedDirs.some((directory) => {
+    const base = normalizePath(directory);
+    return target === base || target.startsWith(`${base}/`);
+  });
+};
+
+// Arquivos soltos fora dos diretórios permitidos são recusados pela área de upload
+const canBackendReadPath = async (path: string) =>
+  isPathAllowed(path, await fetchLocalFilesAccess());
+
+// O backend recusou o caminho: o arquivo precisa ser selecionado e enviado como upload
+const LOCAL_FILE_REFUSED =
+  'O backend não pode ler este arquivo pelo caminho. Clique na área de upload e selecione-o para enviá-lo.';
+
+interface StreamSegment {
+  text: string;
+  start: number;
+  end: number;
+  progress: number | null;
+  words: Array<{
+    word: string;
+    start: number;
+    end: number;
+    probability?: number;
+  }>;
+}
+
+// Texto parcial e progresso (0-1) da transcrição em andamento
+interface StreamUpdate {
+  text: string;
+  progress: number | null;
+  refining: boolean;
+}
+
+// Modo em duas passagens: modelo do rascunho e parte do progresso reservada a ele
+const DRAFT_MODEL = 'tiny';
+const DRAFT_PROGRESS_SHARE = 0.2;
+
+// Opções de decodificação escolhidas nas configurações
+interface DecodingOptions {
+  profile: DecodingProfile;
+  wordTimestamps: boolean;
+}
+
+// Eventos SSE, com as palavras do resultado final em colunas
+const STREAM_ACCEPT = `text/event-stream, ${COLUMNAR_MEDIA_TYPE}`;
+
+// Transcrição em andamento, identificada pelo cabeçalho X-Request-ID
+interface ActiveTranscription {
+  requestId: string;
+  controller: AbortController;
+}
+
+// Pede ao backend que pare de decodificar (keepalive: funciona ao fechar a janela)
+const cancelTranscription = (requestId: string) => {
+  fetch(`${API_BASE_URL}/transcriptions/${requestId}/cancel`, {
+    method: 'POST',
+    keepalive: true,
+  }).catch(() => {
+    // A transcrição pode já ter terminado
+  });
+};
+
+// Função para transcrever um arquivo recebendo os segmentos via Server-Sent Events.
+// Arquivos locais (soltos na janela do app) são lidos pelo backend direto do disco;
+// só os de diretórios permitidos chegam aqui, os demais são selecionados e enviados.
+const transcribeFileStream = async (
+  file: AudioInput,
+  model: string,
+  decoding: DecodingOptions,
+  onUpdate: (update: StreamUpdate) => void,
+  active: ActiveTranscription,
+  refineModel?: string
+): Promise<any> => {
+  const params = new URLSearchParams({
+    model,
+    auto_detect_language: 'true',
+    profile: decoding.profile,
+    word_timestamps: String(decoding.wordTimestamps),
+  });
+  if (refineModel) params.set('refine_model', refineModel);
+
+  // Texto parcial: segmentos refinados seguidos dos que ainda restam do rascunho
+  const draftSegments: string[] = [];
+  const refinedSegments: string[] = [];
+  let replaced = 0;
+  let refining = false;
+  const update = (progress: number | null) => onUpdate({
+    text: [...refinedSegments, ...draftSegments.slice(replaced)].join('').trim(),
+    progress,
+    refining,
+  });
+
+  let response: Response;
+  if (isLocalAudioFile(file)) {
+    // Só os arquivos dentro de local_files.allowed_dirs são lidos pelo backend direto do disco
+    if (!(await canBackendReadPath(file.path))) throw new Error(LOCAL_FILE_REFUSED);
+    response = await fetch(`${API_BASE_URL}/transcribe-path-stream?${params}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        Accept: STREAM_ACCEPT,
+        'X-Request-ID': active.requestId,
+      },
+      body: JSON.stringify({ path: file.path }),
+      signal: active.controller.signal,
+    });
+    // Recusado mesmo assim (por exemplo, um link para fora dos diretórios permitidos)
+    if (response.status === 403) throw new Error(LOCAL_FILE_REFUSED);
+  } else {
+    const formData = new FormData();
+    formData.append('file', file);
+    response = await fetch(`${API_BASE_URL}/transcribe-stream?${params}`, {
+      method: 'POST',
+      headers: { Accept: STREAM_ACCEPT, 'X-Request-ID': active.requestId },
+      body: formData,
+      signal: active.controller.signal,
+    });
+  }
+
+  if (!response.ok || !response.body) {
+    const errorData = await response.json().catch(() => ({ detail: 'Erro desconhecido' }));
+    throw new Error(errorData.detail || `HTTP ${response.status}`);
+  }
+
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+
+  while (true) {
+    const { done, value } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    // Cada mensagem SSE termina com uma linha em branco
+    let boundary = buffer.indexOf('\n\n');
+    while (boundary !== -1) {
+      const message = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      boundary = buffer.indexOf('\n\n');
+
+      let event = 'message';
+      let data = '';
+      for (const line of message.split('\n')) {
+        if (line.startsWith('event: ')) event = line.slice(7);
+        else if (line.startsWith('data: ')) data += line.slice(6);
+      }
+      if (!data) continue;
+
+      const payload = JSON.parse(data);
+      if (event === 'segment') {
+        const segment = payload as StreamSegment;
+        draftSegments.push(segment.text);
+        const share = refineModel ? DRAFT_PROGRESS_SHARE : 1;
+        update(segment.progress === null ? null : segment.progress * share);
+      } else if (event === 'draft') {
+        refining = true;
+        update(DRAFT_PROGRESS_SHARE);
+      } else if (event === 'refined') {
+        const segment = payload as StreamSegment & { replaces: number };
+        refinedSegments.push(segment.text);
+        replaced = Math.max(replaced, segment.replaces);
+        update(segment.progress === null
+          ? null
+          : DRAFT_PROGRESS_SHARE + segment.progress * (1 - DRAFT_PROGRESS_SHARE));
+      } else if (event === 'result') {
+        return payload;
+      } else if (event === 'error') {
+        throw new Error(payload.detail || 'Erro durante a transcrição');
+      }
+    }
+  }
+
+  throw new Error('Conexão encerrada antes do fim da transcrição');
+};
+
 // Componente principal que usa as configurações
 function AppContent() {
   // Usar try-catch para capturar erros do useSettings
   let t: (key: string) => string;
+  let settings: AppSettings = defaultSettings;
   try {
-    const { t: translateFn } = useSettings();
+    const { t: translateFn, settings: currentSettings } = useSettings();
     t = translateFn;
+    settings = currentSettings;
   } catch (error) {
     console.error('Error accessing settings context:', error);
     // Fallback para inglês
     t = (key: string) => key;
   }
 
-  const [selectedFiles, setSelectedFiles] = useState<File[]>([]);
+  const [selectedFiles, setSelectedFiles] = useState<AudioInput[]>([]);
   const [selectedModel, setSelectedModel] = useState('base');
   const [batchResults, setBatchResults] = useState<BatchTranscriptionResult[]>([]);
   const [isTranscribing, setIsTranscribing] = useState(false);
@@ -146,7 +389,13 @@ function AppContent() {
   const [copyWithTimestamps, setCopyWithTimestamps] = useState(false);
   const [currentView, setCurrentView] = useState<'main' | 'settings'>('main');
 
-  const [models] = useState<ModelInfo[]>([
+  const [warmModels, setWarmModels] = useState<string[]>([]);
+  // Enquanto o usuário não escolher um modelo, preferir um que já esteja aquecido
+  const userSelectedModel = useRef(false);
+  // Transcrição em andamento, para cancelá-la quando o usuário a abandona
+  const activeTranscription = useRef<ActiveTranscription | null>(null);
+
+  const [baseModels] = useState<ModelInfo[]>([
     {
       name: 'tiny',
       size: '39 MB',
@@ -173,7 +422,62 @@ function AppContent() {
     }
   ]);
 
-  const handleFilesSelect = useCallback((files: File[]) => {
+  // Um modelo aquecido no backend já está baixado
+  const models = useMemo(() => baseModels.map(model => ({
+    ...model,
+    available: model.available || warmModels.includes(model.name),
+    warm: warmModels.includes(model.name),
+  })), [baseModels, warmModels]);
+
+  // Acompanhar o pré-carregamento dos modelos até o backend terminar
+  useEffect(() => {
+    let cancelled = false;
+    let timer: ReturnType<typeof setTimeout> | undefined;
+
+    const poll = async (attempt: number) => {
+      const readiness = await fetchReadiness();
+      if (cancelled) return;
+      if (readiness) {
+        setWarmModels(readiness.warmModels);
+        if (!userSelectedModel.current && readiness.warmModels.length > 0) {
+          setSelectedModel(current =>
+            readiness.warmModels.includes(current) ? current : readiness.warmModels[0]
+          );
+        }
+      }
+      if ((!readiness || readiness.preloading) && attempt < 60) {
+        timer = setTimeout(() => poll(attempt + 1), 2000);
+      }
+    };
+
+    poll(0);
+    return () => {
+      cancelled = true;
+      if (timer) clearTimeout(timer);
+    };
+  }, []);
+
+  // Cancela a transcrição em andamento no backend e interrompe a leitura do stream
+  const abandonTranscription = useCallback(() => {
+    const active = activeTranscription.current;
+    if (!active) return;
+    activeTranscription.current = null;
+    cancelTranscription(active.requestId);
+    active.controller.abort();
+  }, []);
+
+  // Fechar a janela não deve deixar o backend decodificando
+  useEffect(() => {
+    window.addEventListener('beforeunload', abandonTranscription);
+    return () => {
+      window.removeEventListener('beforeunload', abandonTranscription);
+      abandonTranscription();
+    };
+  }, [abandonTranscription]);
+
+  const handleFilesSelect = useCallback((files: AudioInput[]) => {
+    // Novos arquivos substituem os atuais: a transcrição em andamento é abandonada
+    abandonTranscription();
     setSelectedFiles(files);
     setBatchResults(files.map(file => ({
       filename: file.name,
@@ -182,9 +486,10 @@ function AppContent() {
     })));
     setError(null);
     setProgress(0);
-  }, []);
+  }, [abandonTranscription]);
 
   const handleModelSelect = useCallback((model: string) => {
+    userSelectedModel.current = true;
     setSelectedModel(model);
   }, []);
 
@@ -208,6 +513,28 @@ function AppContent() {
     setProgress(0);
     setCurrentFileIndex(0);
 
+    const decoding: DecodingOptions = {
+      profile: settings.decodingProfile,
+      wordTimestamps: settings.wordTimestamps,
+    };
+    // Duas passagens: rascunho do tiny, refinado pelo modelo selecionado
+    const [model, refineModel] = settings.twoPass && selectedModel !== DRAFT_MODEL
+      ? [DRAFT_MODEL, selectedModel]
+      : [selectedModel, undefined];
+
+    // Cada arquivo é uma requisição própria, que pode ser cancelada
+    const startRequest = (): ActiveTranscription => {
+      const active = { requestId: crypto.randomUUID(), controller: new AbortController() };
+      activeTranscription.current = active;
+      return active;
+    };
+    const finishRequest = (active: ActiveTranscription) => {
+      if (activeTranscription.current === active) activeTranscription.current = null;
+    };
+    let lastRequest: ActiveTranscription | null = null;
+    // Abandonada pelo usuário (novos arquivos ou janela fechada)
+    const wasAbandoned = () => lastRequest !== null && lastRequest.controller.signal.aborted;
+
     // Função auxiliar para simular progresso durante upload e processamento
     const simulateProgress = (targetProgress: number, duration: number) => {
       return new Promise<void>((resolve) => {
@@ -259,33 +586,22 @@ function AppContent() {
         const file = selectedFiles[0];
         setCurrentFileIndex(0);
         
-        // Simular progresso de upload (5-25%)
-        await simulateProgress(25, 1000);
-        
-        const formData = new FormData();
-        formData.append('file', file);
-        formData.append('model', selectedModel);
-        formData.append('auto_detect_language', 'true');
-
-        // Simular progresso de início do processamento (25-35%)
-        await simulateProgress(35, 500);
-
-        const response = await fetch(`${API_BASE_URL}/transcribe`, {
-          method: 'POST',
-          body: formData,
-        });
-
-        // Simular progresso durante a espera da resposta (35-90%)
-        const progressPromise = simulateProgress(90, 3000);
-        
-        if (!response.ok) {
-          const errorData = await response.json().catch(() => ({ detail: 'Erro desconhecido' }));
-          throw new Error(errorData.detail || `HTTP ${response.status}`);
-        }
-
-        await progressPromise; // Aguardar o progresso simulado
+        setProgress(10);
         
-        const result = await response.json();
+        // Receber os segmentos conforme são decodificados (progresso real: 10-95%)
+        const active = lastRequest = startRequest();
+        const result = await transcribeFileStream(file, model, decoding, (update) => {
+          if (update.progress !== null) {
+            setProgress(Math.round(10 + update.progress * 85));
+          }
+          setBatchResults([{
+            filename: file.name,
+            text: update.text,
+            status: 'processing' as const,
+            refining: update.refining
+          }]);
+        }, active, refineModel);
+        finishRequest(active);
         
         setBatchResults([{
           filename: file.name,
@@ -293,7 +609,8 @@ function AppContent() {
           confidence: result.confidence,
           processing_time: result.processing_time,
           detected_language: result.detected_language,
-          word_timestamps: result.word_timestamps,
+          language_probability: result.language_probability,
+          words: result.words ? decodeWordColumns(result.words) : undefined,
           status: 'completed' as const
         }]);
         
@@ -315,33 +632,27 @@ function AppContent() {
           };
           
           try {
-            // Simular upload do arquivo atual
-            await simulateProgress(fileProgress.start + 5, 300);
+            setProgress(Math.round(fileProgress.start));
             
-            const formData = new FormData();
-            formData.append('file', file);
-            formData.append('model', selectedModel);
-            formData.append('auto_detect_language', 'true');
-
-            // Simular início do processamento
-            await simulateProgress(fileProgress.start + 10, 200);
-
-            const response = await fetch(`${API_BASE_URL}/transcribe`, {
-              method: 'POST',
-              body: formData,
-            });
-
-            // Simular progresso durante processamento
-            const processingProgress = simulateProgress(fileProgress.end - 5, 2000);
-
-            if (!response.ok) {
-              const errorData = await response.json().catch(() => ({ detail: 'Erro desconhecido' }));
-              throw new Error(errorData.detail || `HTTP ${response.status}`);
-            }
-
-            await processingProgress;
-            
-            const result = await response.json();
+            // Progresso real do arquivo atual, a partir dos segmentos recebidos
+            const active = lastRequest = startRequest();
+            const result = await transcribeFileStream(file, model, decoding, (update) => {
+              if (update.progress !== null) {
+                setProgress(Math.round(
+                  fileProgress.start + update.progress * (fileProgress.end - fileProgress.start - 2)
+                ));
+              }
+              setBatchResults([
+                ...results,
+                {
+                  filename: file.name,
+                  text: update.text,
+                  status: 'processing' as const,
+                  refining: update.refining
+                }
+              ]);
+            }, active, refineModel);
+            finishRequest(active);
             
             results.push({
               filename: file.name,
@@ -349,7 +660,8 @@ function AppContent() {
               confidence: result.confidence,
               processing_time: result.processing_time,
               detected_language: result.detected_language,
-              word_timestamps: result.word_timestamps,
+              language_probability: result.language_probability,
+              words: result.words ? decodeWordColumns(result.words) : undefined,
               status: 'completed' as const
             });
             
@@ -357,6 +669,8 @@ function AppContent() {
             await simulateProgress(fileProgress.end, 200);
             
           } catch (error) {
+            // Lote abandonado: não continuar com os próximos arquivos
+            if (wasAbandoned()) return;
             results.push({
               filename: file.name,
               text: '',
@@ -374,6 +688,7 @@ function AppContent() {
       }
       
     } catch (error) {
+      if (wasAbandoned()) return;
       console.error('Transcription error:', error);
       const errorMessage = error instanceof Error ? error.message : 'Erro durante a transcrição';
       setError(errorMessage);
@@ -385,35 +700,16 @@ function AppContent() {
         setCurrentFileIndex(0);
       }, 2000);
     }
-  }, [selectedFiles, selectedModel]);
+  }, [selectedFiles, selectedModel, settings.decodingProfile, settings.wordTimestamps, settings.twoPass]);
 
   const copyToClipboard = useCallback(async (result: BatchTranscriptionResult, index: number, withTimestamps: boolean = false) => {
     try {
       let textToCopy = result.text;
       
       // Se solicitado timestamps e eles existem, formatar como SRT
-      if (withTimestamps && result.word_timestamps && result.word_timestamps.length > 0) {
-        let srtContent = '';
-        let segmentIndex = 1;
-        let currentSubtitle = '';
-        let startTime = 0;
-        let endTime = 0;
+      if (withTimestamps && result.words && wordCount(result.words) > 0) {
         const wordsPerSegment = 8; // Palavras por linha de legenda
-        
-        for (let i = 0; i < result.word_timestamps.length; i += wordsPerSegment) {
-          const segment = result.word_timestamps.slice(i, i + wordsPerSegment);
-          startTime = segment[0].start;
-          endTime = segment[segment.length - 1].end;
-          currentSubtitle = segment.map(w => w.word).join(' ');
-          
-          const startSRT = formatTimeForSRT(startTime);
-          const endSRT = formatTimeForSRT(endTime);
-          
-          srtContent += `${segmentIndex}\n${startSRT} --> ${endSRT}\n${currentSubtitle}\n\n`;
-          segmentIndex++;
-        }
-        
-        textToCopy = srtContent.trim();
+        textToCopy = wordColumnsToSrt(result.words, wordsPerSegment, formatTimeForSRT).trim();
       }
       
       if (navigator.clipboard && window.isSecureContext) {
@@ -538,24 +834,9 @@ function AppContent() {
           break;
         case 'srt':
           // Implementação básica de SRT com timestamps se disponíveis
-          if (result.word_timestamps && result.word_timestamps.length > 0) {
-            let srtContent = '';
-            let segmentIndex = 1;
+          if (result.words && wordCount(result.words) > 0) {
             const wordsPerSegment = 10;
-            
-            for (let i = 0; i < result.word_timestamps.length; i += wordsPerSegment) {
-              const segment = result.word_timestamps.slice(i, i + wordsPerSegment);
-              const startTime = segment[0].start;
-              const endTime = segment[segment.length - 1].end;
-              const text = segment.map(w => w.word).join(' ');
-              
-              const startSRT = formatTimeForSRT(startTime);
-              const endSRT = formatTimeForSRT(endTime);
-              
-              srtContent += `${segmentIndex}\n${startSRT} --> ${endSRT}\n${text}\n\n`;
-              segmentIndex++;
-            }
-            content = srtContent;
+            content = wordColumnsToSrt(result.words, wordsPerSegment, formatTimeForSRT);
           } else {
             content = `1\n00:00:00,000 --> 00:00:10,000\n${result.text}\n`;
           }
@@ -563,7 +844,12 @@ function AppContent() {
           mimeType = 'text/plain';
           break;
         case 'json':
-          content = JSON.stringify(result, null, 2);
+          // Exportar as palavras no formato de lista, um objeto por palavra
+          content = JSON.stringify({
+            ...result,
+            words: undefined,
+            word_timestamps: result.words ? wordColumnsToList(result.words) : undefined,
+          }, null, 2);
           filename = `${baseFilename}_transcription_${timestamp}.json`;
           mimeType = 'application/json';
           break;
@@ -763,7 +1049,7 @@ function AppContent() {
                 <FileText className="w-5 h-5 text-primary" />
                 {t('selectFiles')}
               </h2>
-              <FileDropZone onFilesSelect={handleFilesSelect} />
+              <FileDropZone onFilesSelect={handleFilesSelect} canReadLocalPath={canBackendReadPath} />
             </div>
 
             <div className="bg-card border border-border rounded-lg p-6 shadow-sm">
@@ -855,7 +1141,7 @@ function AppContent() {
                             result.status === 'error' && "bg-red-100 text-red-800 dark:bg-red-900 dark:text-red-200"
                           )}>
                             {result.status === 'completed' && t('statusCompleted')}
-                            {result.status === 'processing' && t('statusProcessing')}
+                            {result.status === 'processing' && (result.refining ? t('refining') : t('statusProcessing'))}
                             {result.status === 'pending' && t('statusPending')}
                             {result.status === 'error' && t('statusError')}
                           </span>
@@ -966,17 +1252,27 @@ function AppContent() {
                                 <span>Tempo: {result.processing_time.toFixed(2)}s</span>
                               )}
                               {result.detected_language && (
-                                <span>Idioma: {result.detected_language}</span>
+                                <span>
+                                  Idioma: {result.detected_language}
+                                  {result.language_probability != null &&
+                                    ` (${Math.round(result.language_probability * 100)}%)`}
+                                </span>
                               )}
                             </div>
                           </div>
                           
-                          {result.word_timestamps && result.word_timestamps.length > 0 && (
-                            <DetailedAnalysis timestamps={result.word_timestamps} />
+                          {result.words && wordCount(result.words) > 0 && (
+                            <DetailedAnalysis words={result.words} />
                           )}
                         </div>
                       )}
                       
+                      {result.status === 'processing' && result.text && (
+                        <div className="bg-muted/50 rounded p-3 text-sm text-muted-foreground">
+                          <p className="whitespace-pre-wrap leading-relaxed">{result.text}</p>
+                        </div>
+                      )}
+
                       {result.status === 'error' && result.error && (
                         <div className="bg-destructive/10 rounded p-3 text-sm text-destructive">
                           {result.error}
@@ -1,17 +1,13 @@
 import React, { useState } from 'react';
 import { WordTimestamps } from './WordTimestamps';
 import { Button } from './ui/button';
+import { WordColumns } from '@/lib/wordColumns';
 
 interface DetailedAnalysisProps {
-  timestamps: Array<{
-    word: string;
-    start: number;
-    end: number;
-    probability?: number;
-  }>;
+  words: WordColumns;
 }
 
-export const DetailedAnalysis: React.FC<DetailedAnalysisProps> = ({ timestamps }) => {
+export const DetailedAnalysis: React.FC<DetailedAnalysisProps> = ({ words }) => {
   const [show, setShow] = useState(false);
   return (
     <div className="mt-2">
@@ -20,7 +16,7 @@ export const DetailedAnalysis: React.FC<DetailedAnalysisProps> = ({ timestamps }
       </Button>
       {show && (
         <div className="mt-3">
-          <WordTimestamps timestamps={timestamps} />
+          <WordTimestamps words={words} />
         </div>
       )}
     </div>
@@ -1,10 +1,28 @@
-import React, { useState, useCallback, useRef } from 'react';
+import React, { useState, useCallback, useEffect, useRef } from 'react';
 import { Upload, FileAudio, X, AlertCircle } from 'lucide-react';
 import { cn } from '@/lib/utils';
 import { useSettings } from '../contexts/SettingsContext';
 
+// Arquivo solto na janela do app: o backend lê direto do disco, sem upload.
+// Só são aceitos os de diretórios permitidos; os demais precisam ser
+// selecionados pelo seletor de arquivos e enviados como upload.
+export interface LocalAudioFile {
+  name: string;
+  path: string;
+}
+
+export type AudioInput = File | LocalAudioFile;
+
+export const isLocalAudioFile = (file: AudioInput): file is LocalAudioFile =>
+  !(file instanceof File) && 'path' in file;
+
+// O app roda dentro do Tauri (e não no navegador, durante o desenvolvimento)
+const isTauri = () => typeof window !== 'undefined' && '__TAURI_INTERNALS__' in window;
+
 interface FileDropZoneProps {
-  onFilesSelect: (files: File[]) => void;
+  onFilesSelect: (files: AudioInput[]) => void;
+  // Se o backend pode ler o arquivo solto pelo caminho (por padrão, sempre)
+  canReadLocalPath?: (path: string) => Promise<boolean>;
   accept?: string;
   maxSize?: number; // em bytes
   className?: string;
@@ -27,19 +45,20 @@ const MAX_FILES = 10;
 
 export const FileDropZone: React.FC<FileDropZoneProps> = ({
   onFilesSelect,
+  canReadLocalPath,
   accept = Object.keys(ACCEPTED_FORMATS).join(','),
   maxSize = MAX_FILE_SIZE,
   className
 }) => {
   const [isDragOver, setIsDragOver] = useState(false);
   const [error, setError] = useState<string | null>(null);
-  const [selectedFiles, setSelectedFiles] = useState<File[]>([]);
+  const [selectedFiles, setSelectedFiles] = useState<AudioInput[]>([]);
   const fileInputRef = useRef<HTMLInputElement>(null);
   const { t } = useSettings();
 
-  const validateFile = useCallback((file: File): string | null => {
+  const validateFile = useCallback((file: AudioInput): string | null => {
     // Verificar tipo de arquivo
-    const isValidType = Object.keys(ACCEPTED_FORMATS).includes(file.type) ||
+    const isValidType = (!isLocalAudioFile(file) && Object.keys(ACCEPTED_FORMATS).includes(file.type)) ||
       Object.values(ACCEPTED_FORMATS).flat().some(ext => 
         file.name.toLowerCase().endsWith(ext)
       );
@@ -48,16 +67,16 @@ export const FileDropZone: React.FC<FileDropZoneProps> = ({
       return `Formato de arquivo não suportado. Formatos aceitos: ${Object.values(ACCEPTED_FORMATS).flat().join(', ')}`;
     }
 
-    // Verificar tamanho
-    if (file.size > maxSize) {
+    // Verificar tamanho (arquivos locais não são enviados, então não há limite)
+    if (!isLocalAudioFile(file) && file.size > maxSize) {
       return `Arquivo muito grande. Tamanho máximo: ${(maxSize / (1024 * 1024)).toFixed(0)}MB`;
     }
 
     return null;
   }, [maxSize]);
 
-  const handleFiles = useCallback((files: File[]) => {
-    const validFiles: File[] = [];
+  const handleFiles = useCallback((files: AudioInput[]) => {
+    const validFiles: AudioInput[] = [];
     for (const file of files) {
       const validationError = validateFile(file);
       if (validationError) {
@@ -75,6 +94,51 @@ export const FileDropZone: React.FC<FileDropZoneProps> = ({
     onFilesSelect(validFiles.slice(0, MAX_FILES));
   }, [validateFile, onFilesSelect]);
 
+  // No Tauri, a janela recebe os arquivos soltos com o caminho no disco
+  useEffect(() => {
+    if (!isTauri()) return;
+
+    let unlisten: (() => void) | undefined;
+    let disposed = false;
+
+    import('@tauri-apps/api/webview').then(({ getCurrentWebview }) =>
+      getCurrentWebview().onDragDropEvent(async (event) => {
+        if (event.payload.type === 'enter' || event.payload.type === 'over') {
+          setIsDragOver(true);
+        } else if (event.payload.type === 'leave') {
+          setIsDragOver(false);
+        } else if (event.payload.type === 'drop') {
+          setIsDragOver(false);
+          const files = event.payload.paths.map(path => ({
+            name: path.split(/[\\/]/).pop() || path,
+            path,
+          }));
+          if (files.length === 0) return;
+
+          const readable = canReadLocalPath
+            ? await Promise.all(files.map(file => canReadLocalPath(file.path)))
+            : files.map(() => true);
+          const refused = files.filter((_, idx) => !readable[idx]);
+          const accepted = files.filter((_, idx) => readable[idx]);
+          if (accepted.length > 0) handleFiles(accepted);
+          if (refused.length > 0) {
+            setError(`O backend não pode ler ${refused.map(file => file.name).join(', ')} pelo caminho. Clique aqui e selecione o arquivo para enviá-lo.`);
+          }
+        }
+      })
+    ).then((fn) => {
+      if (disposed) fn();
+      else unlisten = fn;
+    }).catch((error) => {
+      console.warn('Native drag and drop unavailable:', error);
+    });
+
+    return () => {
+      disposed = true;
+      unlisten?.();
+    };
+  }, [handleFiles, canReadLocalPath]);
+
   const handleDragOver = useCallback((e: React.DragEvent) => {
     e.preventDefault();
     setIsDragOver(true);
@@ -170,7 +234,9 @@ export const FileDropZone: React.FC<FileDropZoneProps> = ({
                   <li key={file.name + idx} className="flex items-center justify-between px-3 py-2 rounded bg-green-50 dark:bg-green-950 min-h-[40px]">
                     <div className="flex-1 flex flex-col min-w-0">
                       <span className="text-sm font-medium text-foreground break-words leading-tight">{file.name}</span>
-                      <span className="text-xs text-muted-foreground">{formatFileSize(file.size)}</span>
+                      <span className="text-xs text-muted-foreground">
+                        {isLocalAudioFile(file) ? file.path : formatFileSize(file.size)}
+                      </span>
                     </div>
                     <button
                       onClick={(e) => {
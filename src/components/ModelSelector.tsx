@@ -1,5 +1,5 @@
 import React, { useState } from 'react';
-import { Settings, Download, Cpu, HardDrive, Info } from 'lucide-react';
+import { Settings, Download, Cpu, HardDrive, Info, Zap } from 'lucide-react';
 import { Button } from '@/components/ui/button';
 import { cn } from '@/lib/utils';
 import { useSettings } from '../contexts/SettingsContext';
@@ -9,6 +9,7 @@ interface ModelInfo {
   size: string;
   description: string;
   available: boolean;
+  warm?: boolean;
 }
 
 interface ModelSelectorProps {
@@ -29,7 +30,7 @@ export const ModelSelector: React.FC<ModelSelectorProps> = ({
   className
 }) => {
   const [isExpanded, setIsExpanded] = useState(false);
-  const { t } = useSettings();
+  const { t, settings, setTwoPass } = useSettings();
 
   const selectedModelInfo = models.find(m => m.name === selectedModel);
 
@@ -71,6 +72,12 @@ export const ModelSelector: React.FC<ModelSelectorProps> = ({
                     {t('notDownloaded')}
                   </span>
                 )}
+                {selectedModelInfo.warm && (
+                  <span className="flex items-center gap-1 text-xs bg-yellow-100 text-yellow-700 dark:bg-yellow-900 dark:text-yellow-300 px-2 py-1 rounded-full">
+                    <Zap className="w-3 h-3" />
+                    {t('modelWarm')}
+                  </span>
+                )}
               </div>
               <p className="text-sm text-muted-foreground">
                 {selectedModelInfo.description}
@@ -92,6 +99,29 @@ export const ModelSelector: React.FC<ModelSelectorProps> = ({
         </div>
       )}
 
+      {/* Duas passagens: rascunho do Tiny refinado pelo modelo selecionado */}
+      <label
+        className={cn(
+          "flex items-start gap-3",
+          selectedModel === 'tiny' ? "opacity-60 cursor-not-allowed" : "cursor-pointer"
+        )}
+      >
+        <input
+          type="checkbox"
+          checked={settings.twoPass && selectedModel !== 'tiny'}
+          onChange={(e) => setTwoPass(e.target.checked)}
+          disabled={selectedModel === 'tiny'}
+          className="mt-1"
+        />
+        <div>
+          <div className="flex items-center gap-1 font-medium">
+            <Zap className="w-4 h-4 text-primary" />
+            {t('twoPass')}
+          </div>
+          <div className="text-sm text-muted-foreground">{t('twoPassDescription')}</div>
+        </div>
+      </label>
+
       {/* Lista expandida de modelos */}
       {isExpanded && (
         <div className="space-y-3 animate-fade-in">
@@ -132,6 +162,11 @@ export const ModelSelector: React.FC<ModelSelectorProps> = ({
                           </span>
                         </div>
                       )}
+                      {model.warm && (
+                        <div className="flex items-center gap-1" title={t('modelWarm')}>
+                          <Zap className="w-3 h-3 text-yellow-600 dark:text-yellow-400" />
+                        </div>
+                      )}
                     </div>
                     <p className="text-sm text-muted-foreground">
                       {model.description}
@@ -1,7 +1,7 @@
-import { ArrowLeft, Monitor, Moon, Sun, Globe } from 'lucide-react';
+import { ArrowLeft, Monitor, Moon, Sun, Globe, Gauge } from 'lucide-react';
 import { Button } from './ui/button';
 import { useSettings } from '../contexts/SettingsContext';
-import { Theme } from '../lib/settings';
+import { DecodingProfile, Theme } from '../lib/settings';
 import { Language } from '../lib/i18n';
 
 interface SettingsProps {
@@ -9,7 +9,7 @@ interface SettingsProps {
 }
 
 export function Settings({ onBack }: SettingsProps) {
-  const { settings, setTheme, setLanguage, t } = useSettings();
+  const { settings, setTheme, setLanguage, setDecodingProfile, setWordTimestamps, t } = useSettings();
 
   const handleThemeChange = (theme: Theme) => {
     setTheme(theme);
@@ -19,6 +19,12 @@ export function Settings({ onBack }: SettingsProps) {
     setLanguage(language);
   };
 
+  const decodingProfiles: { value: DecodingProfile; label: string; description: string }[] = [
+    { value: 'fast', label: t('profileFast'), description: t('profileFastDescription') },
+    { value: 'balanced', label: t('profileBalanced'), description: t('profileBalancedDescription') },
+    { value: 'accurate', label: t('profileAccurate'), description: t('profileAccurateDescription') },
+  ];
+
   return (
     <div className="min-h-screen bg-background text-foreground">
       <div className="container mx-auto px-4 py-8 max-w-2xl">
@@ -127,6 +133,45 @@ export function Settings({ onBack }: SettingsProps) {
             </div>
           </div>
 
+          {/* Transcription Settings */}
+          <div className="bg-card rounded-lg p-6 border">
+            <div className="flex items-center gap-3 mb-4">
+              <Gauge className="w-5 h-5 text-primary" />
+              <h2 className="text-lg font-semibold">{t('decodingProfile')}</h2>
+            </div>
+            
+            <div className="grid grid-cols-1 gap-3 sm:grid-cols-3">
+              {decodingProfiles.map(profile => (
+                <Button
+                  key={profile.value}
+                  variant={settings.decodingProfile === profile.value ? 'default' : 'outline'}
+                  onClick={() => setDecodingProfile(profile.value)}
+                  className="flex items-center gap-2 justify-start p-4 h-auto whitespace-normal"
+                >
+                  <div className="text-left">
+                    <div className="font-medium">{profile.label}</div>
+                    <div className={`text-sm ${settings.decodingProfile === profile.value ? 'text-primary-foreground/80' : 'text-muted-foreground'}`}>
+                      {profile.description}
+                    </div>
+                  </div>
+                </Button>
+              ))}
+            </div>
+
+            <label className="flex items-start gap-3 mt-4 cursor-pointer">
+              <input
+                type="checkbox"
+                checked={settings.wordTimestamps}
+                onChange={(e) => setWordTimestamps(e.target.checked)}
+                className="mt-1"
+              />
+              <div>
+                <div className="font-medium">{t('wordTimestamps')}</div>
+                <div className="text-sm text-muted-foreground">{t('wordTimestampsDescription')}</div>
+              </div>
+            </label>
+          </div>
+
           {/* Info Section */}
           <div className="bg-muted/50 rounded-lg p-6">
             <h3 className="font-medium mb-2">ℹ️ Informações</h3>
@@ -2,25 +2,26 @@ import React, { useState } from 'react';
 import { Clock, Play, Pause } from 'lucide-react';
 import { Button } from './ui/button';
 import { cn } from '@/lib/utils';
-
-interface WordTimestamp {
-  word: string;
-  start: number;
-  end: number;
-  probability?: number;
-}
+import { WordColumns, wordAt, wordCount } from '@/lib/wordColumns';
+import { useSettings } from '../contexts/SettingsContext';
 
 interface WordTimestampsProps {
-  timestamps: WordTimestamp[];
+  words: WordColumns;
   className?: string;
 }
 
+// Palavras renderizadas por vez; transcrições longas têm dezenas de milhares
+const WORDS_PER_PAGE = 500;
+
 export const WordTimestamps: React.FC<WordTimestampsProps> = ({
-  timestamps,
+  words,
   className
 }) => {
   const [selectedWord, setSelectedWord] = useState<number | null>(null);
   const [isPlaying, setIsPlaying] = useState(false);
+  const [visibleCount, setVisibleCount] = useState(WORDS_PER_PAGE);
+  const total = wordCount(words);
+  const { t } = useSettings();
 
   const formatTime = (seconds: number): string => {
     const minutes = Math.floor(seconds / 60);
@@ -31,7 +32,7 @@ export const WordTimestamps: React.FC<WordTimestampsProps> = ({
   const handleWordClick = (index: number) => {
     setSelectedWord(index);
     // Aqui seria implementada a funcionalidade de reproduzir o áudio no timestamp específico
-    console.log(`Reproduzir áudio a partir de ${timestamps[index].start}s`);
+    console.log(`Reproduzir áudio a partir de ${words.start[index]}s`);
   };
 
   const togglePlayback = () => {
@@ -39,10 +40,12 @@ export const WordTimestamps: React.FC<WordTimestampsProps> = ({
     // Implementar controle de reprodução
   };
 
-  if (!timestamps || timestamps.length === 0) {
+  if (total === 0) {
     return null;
   }
 
+  const selected = selectedWord !== null ? wordAt(words, selectedWord) : null;
+
   return (
     <div className={cn("space-y-4", className)}>
       <div className="flex items-center justify-between">
@@ -66,7 +69,7 @@ export const WordTimestamps: React.FC<WordTimestampsProps> = ({
 
       <div className="max-h-40 overflow-y-auto border rounded-lg p-3 bg-muted/30">
         <div className="flex flex-wrap gap-1">
-          {timestamps.map((timestamp, index) => (
+          {words.word.slice(0, visibleCount).map((word, index) => (
             <button
               key={index}
               onClick={() => handleWordClick(index)}
@@ -77,26 +80,36 @@ export const WordTimestamps: React.FC<WordTimestampsProps> = ({
                   ? "bg-primary text-primary-foreground"
                   : "bg-background border border-border"
               )}
-              title={`${timestamp.word} (${formatTime(timestamp.start)} - ${formatTime(timestamp.end)})`}
+              title={`${word} (${formatTime(words.start[index])} - ${formatTime(words.end[index])})`}
             >
-              <span className="font-medium">{timestamp.word}</span>
+              <span className="font-medium">{word}</span>
               <span className="text-xs opacity-70 ml-1">
-                {formatTime(timestamp.start)}
+                {formatTime(words.start[index])}
               </span>
             </button>
           ))}
         </div>
+        {visibleCount < total && (
+          <Button
+            variant="ghost"
+            size="sm"
+            className="mt-2"
+            onClick={() => setVisibleCount(count => count + WORDS_PER_PAGE)}
+          >
+            {t('showMoreWords')} ({total - visibleCount} {t('wordsRemaining')})
+          </Button>
+        )}
       </div>
 
-      {selectedWord !== null && (
+      {selected !== null && (
         <div className="text-xs text-muted-foreground bg-muted/50 p-2 rounded">
-          <strong>Palavra selecionada:</strong> "{timestamps[selectedWord].word}" 
+          <strong>Palavra selecionada:</strong> "{selected.word}" 
           <br />
-          <strong>Intervalo:</strong> {formatTime(timestamps[selectedWord].start)} - {formatTime(timestamps[selectedWord].end)}
-          {timestamps[selectedWord].probability && (
+          <strong>Intervalo:</strong> {formatTime(selected.start)} - {formatTime(selected.end)}
+          {selected.probability && (
             <>
               <br />
-              <strong>Confiança:</strong> {(timestamps[selectedWord].probability! * 100).toFixed(1)}%
+              <strong>Confiança:</strong> {(selected.probability! * 100).toFixed(1)}%
             </>
           )}
         </div>
@@ -1,11 +1,14 @@
 import { createContext, useContext, useState, useEffect, ReactNode } from 'react';
-import { AppSettings, settingsManager, Theme } from '../lib/settings';
+import { AppSettings, DecodingProfile, defaultSettings, settingsManager, Theme } from '../lib/settings';
 import { Language, useTranslation } from '../lib/i18n';
 
 interface SettingsContextType {
   settings: AppSettings;
   setTheme: (theme: Theme) => void;
   setLanguage: (language: Language) => void;
+  setDecodingProfile: (profile: DecodingProfile) => void;
+  setWordTimestamps: (enabled: boolean) => void;
+  setTwoPass: (enabled: boolean) => void;
   updateSettings: (newSettings: Partial<AppSettings>) => void;
   t: (key: string) => string;
 }
@@ -22,7 +25,7 @@ export function SettingsProvider({ children }: SettingsProviderProps) {
       return settingsManager.getSettings();
     } catch (error) {
       console.error('Error loading settings:', error);
-      return { theme: 'light', language: 'en' };
+      return { ...defaultSettings };
     }
   });
   
@@ -47,6 +50,21 @@ export function SettingsProvider({ children }: SettingsProviderProps) {
     setSettings(prev => ({ ...prev, language }));
   };
 
+  const handleSetDecodingProfile = (decodingProfile: DecodingProfile) => {
+    settingsManager.setDecodingProfile(decodingProfile);
+    setSettings(prev => ({ ...prev, decodingProfile }));
+  };
+
+  const handleSetWordTimestamps = (wordTimestamps: boolean) => {
+    settingsManager.setWordTimestamps(wordTimestamps);
+    setSettings(prev => ({ ...prev, wordTimestamps }));
+  };
+
+  const handleSetTwoPass = (twoPass: boolean) => {
+    settingsManager.setTwoPass(twoPass);
+    setSettings(prev => ({ ...prev, twoPass }));
+  };
+
   const handleUpdateSettings = (newSettings: Partial<AppSettings>) => {
     settingsManager.updateSettings(newSettings);
     setSettings(prev => ({ ...prev, ...newSettings }));
@@ -56,6 +74,9 @@ export function SettingsProvider({ children }: SettingsProviderProps) {
     settings,
     setTheme: handleSetTheme,
     setLanguage: handleSetLanguage,
+    setDecodingProfile: handleSetDecodingProfile,
+    setWordTimestamps: handleSetWordTimestamps,
+    setTwoPass: handleSetTwoPass,
     updateSettings: handleUpdateSettings,
     t,
   };
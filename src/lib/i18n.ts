@@ -21,6 +21,17 @@ export const translations: Record<Language, Translation> = {
     languageEn: 'English',
     languagePt: 'Portuguese',
     languageEs: 'Spanish',
+    decodingProfile: 'Transcription quality',
+    profileFast: 'Fast',
+    profileFastDescription: 'Greedy decoding, several times faster. Good for previews',
+    profileBalanced: 'Balanced',
+    profileBalancedDescription: 'Default quality and speed',
+    profileAccurate: 'Accurate',
+    profileAccurateDescription: 'Wider search, slower but more precise',
+    wordTimestamps: 'Word timestamps',
+    wordTimestampsDescription: 'Align each word with the audio. Disable to transcribe faster',
+    showMoreWords: 'Show more',
+    wordsRemaining: 'remaining',
     
     // Main app
     appTitle: 'EchoTranscribe',
@@ -33,6 +44,7 @@ export const translations: Record<Language, Translation> = {
     aiModel: 'AI Model',
     configure: 'Configure',
     available: 'Available',
+    modelWarm: 'Loaded and ready',
     notDownloaded: 'Not Downloaded',
     download: 'Download',
     hide: 'Hide',
@@ -40,6 +52,9 @@ export const translations: Record<Language, Translation> = {
     modelStatusTiny: 'Fast, ideal for testing',
     modelStatusSmall: 'Better quality, medium speed',
     modelStatusMedium: 'High quality, slower',
+    twoPass: 'Instant draft',
+    twoPassDescription: 'Show a quick draft from the Tiny model while the selected model refines it',
+    refining: 'Refining...',
     localModels: 'Local models',
     status: 'Status',
     processing: 'Processing...',
@@ -131,6 +146,17 @@ export const translations: Record<Language, Translation> = {
     languageEn: 'English',
     languagePt: 'Português',
     languageEs: 'Español',
+    decodingProfile: 'Qualidade da transcrição',
+    profileFast: 'Rápido',
+    profileFastDescription: 'Decodificação gulosa, várias vezes mais rápida. Ideal para prévias',
+    profileBalanced: 'Balanceado',
+    profileBalancedDescription: 'Qualidade e velocidade padrão',
+    profileAccurate: 'Preciso',
+    profileAccurateDescription: 'Busca mais ampla, mais lento porém mais preciso',
+    wordTimestamps: 'Timestamps por palavra',
+    wordTimestampsDescription: 'Alinha cada palavra com o áudio. Desative para transcrever mais rápido',
+    showMoreWords: 'Mostrar mais',
+    wordsRemaining: 'restantes',
     
     // Main app
     appTitle: 'EchoTranscribe',
@@ -143,6 +169,7 @@ export const translations: Record<Language, Translation> = {
     aiModel: 'Modelo de IA',
     configure: 'Configurar',
     available: 'Disponível',
+    modelWarm: 'Carregado e pronto',
     notDownloaded: 'Não baixado',
     download: 'Baixar',
     hide: 'Ocultar',
@@ -150,6 +177,9 @@ export const translations: Record<Language, Translation> = {
     modelStatusTiny: 'Rápido, ideal para testes',
     modelStatusSmall: 'Melhor qualidade, velocidade média',
     modelStatusMedium: 'Alta qualidade, mais lento',
+    twoPass: 'Rascunho instantâneo',
+    twoPassDescription: 'Mostra um rascunho rápido do modelo Tiny enquanto o modelo selecionado o refina',
+    refining: 'Refinando...',
     localModels: 'Modelos locais',
     status: 'Status',
     processing: 'Processando...',
@@ -241,6 +271,17 @@ export const translations: Record<Language, Translation> = {
     languageEn: 'English',
     languagePt: 'Português',
     languageEs: 'Español',
+    decodingProfile: 'Calidad de la transcripción',
+    profileFast: 'Rápido',
+    profileFastDescription: 'Decodificación voraz, varias veces más rápida. Ideal para vistas previas',
+    profileBalanced: 'Equilibrado',
+    profileBalancedDescription: 'Calidad y velocidad predeterminadas',
+    profileAccurate: 'Preciso',
+    profileAccurateDescription: 'Búsqueda más amplia, más lento pero más preciso',
+    wordTimestamps: 'Marcas de tiempo por palabra',
+    wordTimestampsDescription: 'Alinea cada palabra con el audio. Desactívalo para transcribir más rápido',
+    showMoreWords: 'Mostrar más',
+    wordsRemaining: 'restantes',
     
     // Main app
     appTitle: 'EchoTranscribe',
@@ -253,6 +294,7 @@ export const translations: Record<Language, Translation> = {
     aiModel: 'Modelo de IA',
     configure: 'Configurar',
     available: 'Disponible',
+    modelWarm: 'Cargado y listo',
     notDownloaded: 'No descargado',
     download: 'Descargar',
     hide: 'Ocultar',
@@ -260,6 +302,9 @@ export const translations: Record<Language, Translation> = {
     modelStatusTiny: 'Rápido, ideal para pruebas',
     modelStatusSmall: 'Mejor calidad, velocidad media',
     modelStatusMedium: 'Alta calidad, más lento',
+    twoPass: 'Borrador instantáneo',
+    twoPassDescription: 'Muestra un borrador rápido del modelo Tiny mientras el modelo seleccionado lo refina',
+    refining: 'Refinando...',
     localModels: 'Modelos locales',
     status: 'Estado',
     processing: 'Procesando...',
@@ -2,14 +2,24 @@ import { Language } from './i18n';
 
 export type Theme = 'light' | 'dark';
 
+// Perfis de decodificação do backend: trocam precisão por velocidade
+export type DecodingProfile = 'fast' | 'balanced' | 'accurate';
+
 export interface AppSettings {
   theme: Theme;
   language: Language;
+  decodingProfile: DecodingProfile;
+  wordTimestamps: boolean;
+  // Rascunho rápido com o modelo tiny, refinado pelo modelo selecionado
+  twoPass: boolean;
 }
 
 export const defaultSettings: AppSettings = {
   theme: 'light',
   language: 'en',
+  decodingProfile: 'balanced',
+  wordTimestamps: true,
+  twoPass: false,
 };
 
 const SETTINGS_KEY = 'echo-transcribe-settings';
@@ -30,6 +40,15 @@ export class SettingsManager {
         return {
           theme: this.isValidTheme(parsed.theme) ? parsed.theme : defaultSettings.theme,
           language: this.isValidLanguage(parsed.language) ? parsed.language : defaultSettings.language,
+          decodingProfile: this.isValidDecodingProfile(parsed.decodingProfile)
+            ? parsed.decodingProfile
+            : defaultSettings.decodingProfile,
+          wordTimestamps: typeof parsed.wordTimestamps === 'boolean'
+            ? parsed.wordTimestamps
+            : defaultSettings.wordTimestamps,
+          twoPass: typeof parsed.twoPass === 'boolean'
+            ? parsed.twoPass
+            : defaultSettings.twoPass,
         };
       }
     } catch (error) {
@@ -55,6 +74,10 @@ export class SettingsManager {
     return language === 'en' || language === 'pt' || language === 'es';
   }
 
+  private isValidDecodingProfile(profile: any): profile is DecodingProfile {
+    return profile === 'fast' || profile === 'balanced' || profile === 'accurate';
+  }
+
   getSettings(): AppSettings {
     return { ...this.settings };
   }
@@ -70,6 +93,21 @@ export class SettingsManager {
     this.saveSettings();
   }
 
+  setDecodingProfile(profile: DecodingProfile): void {
+    this.settings.decodingProfile = profile;
+    this.saveSettings();
+  }
+
+  setWordTimestamps(enabled: boolean): void {
+    this.settings.wordTimestamps = enabled;
+    this.saveSettings();
+  }
+
+  setTwoPass(enabled: boolean): void {
+    this.settings.twoPass = enabled;
+    this.saveSettings();
+  }
+
   updateSettings(newSettings: Partial<AppSettings>): void {
     if (newSettings.theme && this.isValidTheme(newSettings.theme)) {
       this.settings.theme = newSettings.theme;
@@ -79,6 +117,18 @@ export class SettingsManager {
     if (newSettings.language && this.isValidLanguage(newSettings.language)) {
       this.settings.language = newSettings.language;
     }
+
+    if (newSettings.decodingProfile && this.isValidDecodingProfile(newSettings.decodingProfile)) {
+      this.settings.decodingProfile = newSettings.decodingProfile;
+    }
+
+    if (typeof newSettings.wordTimestamps === 'boolean') {
+      this.settings.wordTimestamps = newSettings.wordTimestamps;
+    }
+
+    if (typeof newSettings.twoPass === 'boolean') {
+      this.settings.twoPass = newSettings.twoPass;
+    }
     
     this.saveSettings();
   }
@@ -0,0 +1,83 @@
+// Timestamps por palavra em colunas: arrays paralelos em vez de um objeto por palavra.
+// O backend envia este formato quando o cabeçalho Accept inclui COLUMNAR_MEDIA_TYPE.
+
+export const COLUMNAR_MEDIA_TYPE = 'application/vnd.echo-transcribe.columnar+json';
+
+export interface WordTimestamp {
+  word: string;
+  start: number;
+  end: number;
+  probability?: number;
+}
+
+// Formato recebido: números em float32 little-endian codificados em base64
+export interface EncodedWordColumns {
+  count: number;
+  encoding: 'float32-le-base64';
+  word: string[];
+  start: string;
+  end: string;
+  probability: string;
+}
+
+export interface WordColumns {
+  word: string[];
+  start: Float32Array;
+  end: Float32Array;
+  // NaN quando o backend não informa a probabilidade
+  probability: Float32Array;
+}
+
+const decodeFloat32 = (encoded: string, count: number): Float32Array => {
+  const binary = atob(encoded);
+  const view = new DataView(new ArrayBuffer(binary.length));
+  for (let i = 0; i < binary.length; i++) {
+    view.setUint8(i, binary.charCodeAt(i));
+  }
+  const values = new Float32Array(count);
+  for (let i = 0; i < count; i++) {
+    values[i] = view.getFloat32(i * 4, true);
+  }
+  return values;
+};
+
+export const decodeWordColumns = (encoded: EncodedWordColumns): WordColumns => ({
+  word: encoded.word,
+  start: decodeFloat32(encoded.start, encoded.count),
+  end: decodeFloat32(encoded.end, encoded.count),
+  probability: decodeFloat32(encoded.probability, encoded.count),
+});
+
+export const wordCount = (columns?: WordColumns): number => columns?.word.length ?? 0;
+
+export const wordAt = (columns: WordColumns, index: number): WordTimestamp => {
+  const probability = columns.probability[index];
+  return {
+    word: columns.word[index],
+    start: columns.start[index],
+    end: columns.end[index],
+    probability: Number.isNaN(probability) ? undefined : probability,
+  };
+};
+
+// Uma palavra por objeto, para exportação em JSON
+export const wordColumnsToList = (columns: WordColumns): WordTimestamp[] =>
+  columns.word.map((_, index) => wordAt(columns, index));
+
+// Legendas SRT agrupando `wordsPerCue` palavras por legenda
+export const wordColumnsToSrt = (
+  columns: WordColumns,
+  wordsPerCue: number,
+  formatTime: (seconds: number) => string
+): string => {
+  const count = wordCount(columns);
+  let srt = '';
+  let cueIndex = 1;
+  for (let i = 0; i < count; i += wordsPerCue) {
+    const last = Math.min(i + wordsPerCue, count) - 1;
+    const text = columns.word.slice(i, last + 1).join(' ');
+    srt += `${cueIndex}\n${formatTime(columns.start[i])} --> ${formatTime(columns.end[last])}\n${text}\n\n`;
+    cueIndex++;
+  }
+  return srt;
+};